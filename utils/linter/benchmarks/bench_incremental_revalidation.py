@@ -0,0 +1,88 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import json
+import math
+import os
+import tempfile
+import time
+
+from benchmarks.bench_placeholder_grammar import build_appsettings
+from src.validator.subtree_cache import SubtreeCache
+from src.validator.validator import Validator
+from src.validator.validator_report import ValidatorReport
+from src.validator.verdict_cache import verdict_cache
+
+def validate(appsettings_file, cache_file=None):
+    """
+    Validates a base appsettings file like the linter does, with or without the subtree cache.
+
+    Returns:
+        float: The duration in seconds, including the load and save of the cache.
+    """
+    # Every run of the CLI starts with an empty verdict memo
+    verdict_cache.clear()
+
+    started = time.perf_counter()
+    subtree_cache = SubtreeCache.load(cache_file) if cache_file else None
+    validator = Validator(appsettings_file, ValidatorReport(), subtree_cache=subtree_cache)
+    validator.validate_base_appsettings_placeholders()
+    validator.validate_vault_object()
+    if subtree_cache is not None:
+        subtree_cache.save(cache_file)
+    return time.perf_counter() - started
+
+def main():
+    """
+    Runs the benchmark and prints the results, and after how many runs the cold one is paid back.
+    """
+    appsettings = build_appsettings(sections=5000)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        appsettings_file = os.path.join(work_dir, "appsettings.json")
+        cache_file = os.path.join(work_dir, "subtrees.json")
+        with open(appsettings_file, "w") as file:
+            json.dump(appsettings, file, indent=2)
+
+        print("=== Incremental revalidation benchmark ===\n")
+        print(f"appsettings file: {os.path.getsize(appsettings_file) / 1e6:.1f} MB\n")
+
+        full = min(validate(appsettings_file) for _ in range(5))
+        cold = min(validate(appsettings_file, f"{cache_file}.{index}") for index in range(5))
+        validate(appsettings_file, cache_file)
+
+        # A one line edit in the middle of the file
+        edits = []
+        for index in range(5):
+            appsettings["Section2500"]["Nested"]["Path"] = f"/var/data/edit-{index}"
+            with open(appsettings_file, "w") as file:
+                json.dump(appsettings, file, indent=2)
+            edits.append(validate(appsettings_file, cache_file))
+
+        print(f"{'without cache':>24}: {full * 1000:.1f} ms")
+        print(f"{'cold cache':>24}: {cold * 1000:.1f} ms (cache file: {os.path.getsize(cache_file) / 1e6:.1f} MB)")
+        print(f"{'after a one line edit':>24}: {min(edits) * 1000:.1f} ms")
+        print(f"\nspeed-up after an edit: {full / min(edits):.2f}x")
+
+        # The first run pays for building the cache, each of the next ones wins some of it back
+        if min(edits) < full:
+            print(f"break-even: the cache pays off from run {1 + math.ceil((cold - full) / (full - min(edits)))} " +
+                  "on, the cold one included")
+
+if __name__ == "__main__":
+    main()
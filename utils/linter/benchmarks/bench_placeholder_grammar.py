@@ -0,0 +1,76 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import copy
+import json
+import re
+import timeit
+
+from src.validator import grammar
+
+def build_appsettings(sections=500):
+    """
+    Builds a large appsettings document, with a placeholder in about a third of the values.
+    """
+    appsettings = {"Vault": {"vaultAddress": "https://my-vault.my-org.com:8200", "mountPoint": "env/prod"}}
+    for index in range(sections):
+        appsettings[f"Section{index}"] = {
+            "Name": f"service-{index}",
+            "Enabled": True,
+            "Retries": index % 7,
+            "ConnectionString": f"Server=db{index};User={{% vault_secret app/db{index}:username %}};" +
+                                f"Password={{% vault_secret app/db{index}:password %}};Timeout=30",
+            "Clients": f"{{% vault_dict app/clients/{index} %}}",
+            "Nested": {"Hosts": [f"host-{index}-a", f"host-{index}-b"], "Path": "/var/data/" + "x" * 40},
+        }
+    return appsettings
+
+def previous_pass(appsettings):
+    """
+    The placeholder pass used before the grammar module: a deep copy, a JSON dump and a regular expression.
+    """
+    clean = copy.deepcopy(appsettings)
+    del clean["Vault"]
+    return re.findall(r'{% (.+?) %}', json.dumps(clean))
+
+def grammar_pass(appsettings):
+    """
+    The placeholder pass of the grammar module: the flattened values and the linear scanner.
+    """
+    clean = {key: value for key, value in appsettings.items() if key != "Vault"}
+    return grammar.scan_document(clean)
+
+def main():
+    """
+    Runs the benchmark and prints the results. The scanner is there to match the grammar of the
+    library and to stay linear on any input, it is only about 1.1-1.2x faster than the previous pass.
+    """
+    appsettings = build_appsettings()
+    assert len(previous_pass(appsettings)) == len(grammar_pass(appsettings))
+
+    print("=== Placeholder grammar benchmark ===\n")
+    results = {}
+    for name, function in [("previous regex pass", previous_pass), ("grammar scanner", grammar_pass)]:
+        runs = timeit.repeat(lambda function=function: function(appsettings), number=20, repeat=5)
+        results[name] = min(runs) / 20
+        print(f"{name:>20}: {results[name] * 1000:.2f} ms per file")
+
+    print(f"\nspeed-up: {results['previous regex pass'] / results['grammar scanner']:.2f}x")
+
+if __name__ == "__main__":
+    main()
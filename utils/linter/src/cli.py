@@ -0,0 +1,552 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+# File that contains helping methods
+from .utils import helper
+
+# Discovery of the appsettings files to be validated
+from .discovery.discovery import (
+    BASE_APPSETTINGS_FILE,
+    ProjectAppsettings,
+    discover,
+    discover_in_background,
+)
+
+# Vault prefetch manifest
+from .manifest.manifest import Manifest, project_digest
+
+# Drift between the environments of each service
+from .drift.drift import print_drift_report, service_drift
+
+# Statistics of the run
+from .metrics import metrics
+
+# Warm linter process serving the CLI over a Unix socket
+from .daemon import daemon
+
+# Sharding of the projects across several linter runs
+from .sharding.sharding import (
+    PartialReport,
+    ShardError,
+    incomplete_shards,
+    merge,
+    parse_shard,
+    project_key,
+    shard_of
+)
+
+# Class that stores the Validator report
+from .validator.validator_report import ValidatorReport
+from .validator.report_renderer import StreamingReportRenderer
+from .validator.validator import StopValidation, Validator
+from .validator.subtree_cache import SubtreeCache
+from .validator import rules
+
+# Exit code of a run without failures that didn't validate every file, e.g. because its time budget was spent
+EXIT_INCOMPLETE = 3
+
+class SingletonValidatorReport(ValidatorReport):
+    """
+    A Singleton class that inherits from ValidatorReport to ensure a single instance exists.
+
+    This class uses the Singleton pattern to ensure there's only one instance of the
+    ValidatorReport object throughout the script.
+
+    Attributes:
+        _instance: The single instance of the class.
+
+    Methods:
+        __new__(): Creates and returns the single instance of the class if it doesn't exist.
+
+    Usage:
+        validator_report = SingletonValidatorReport()
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+validator_report = SingletonValidatorReport()
+
+def process_base_appsettings_file(appsettings_file, enabled_rules=None, fail_fast=False, subtree_cache=None):
+    """
+    Processes the base appsettings.json file.
+    This method will validate the syntax of all occurrences of the placeholders supported by the Stratio Vault Library.
+
+    Parameters:
+        - appsettings_file (str): The path to the base appsettings.json file.
+        - enabled_rules (frozenset|None): The rules that run, None for all of them.
+        - fail_fast (bool): Whether to stop at the first failure.
+        - subtree_cache (SubtreeCache|None): The findings of the previous run, to only revalidate what changed.
+
+    Returns:
+        - Validator: The validator holding the parsed file.
+    """
+    with metrics.registry.timer(metrics.PHASE_DURATION, phase="validation"):
+        metrics.registry.inc(metrics.FILES_SCANNED, kind="base")
+        validator = Validator(appsettings_file, validator_report, enabled_rules, fail_fast, subtree_cache)
+        validator.validate_base_appsettings_placeholders()
+        validator.validate_vault_object()
+    return validator
+
+def process_environment_appsettings_file(appsettings_file, enabled_rules=None, fail_fast=False, subtree_cache=None):
+    """
+    Processes the environment appsettings file.
+    This method will validate an environment specific appsettings file.
+
+    Parameters:
+        - appsettings_file (str): The path to the environment appsettings file.
+        - enabled_rules (frozenset|None): The rules that run, None for all of them.
+        - fail_fast (bool): Whether to stop at the first failure.
+        - subtree_cache (SubtreeCache|None): The findings of the previous run, to only revalidate what changed.
+
+    Returns:
+        - Validator: The validator holding the parsed file.
+    """
+    with metrics.registry.timer(metrics.PHASE_DURATION, phase="validation"):
+        metrics.registry.inc(metrics.FILES_SCANNED, kind="environment")
+        validator = Validator(appsettings_file, validator_report, enabled_rules, fail_fast, subtree_cache)
+        validator.validate_environment_appsettings_placeholders()
+        validator.validate_vault_object()
+    return validator
+
+def positive_int(value):
+    """
+    Parses an argument that must be a whole number of at least 1, e.g. a page.
+
+    Raises:
+        - ArgumentTypeError: If it isn't one.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"should be at least 1, got {number}")
+    return number
+
+def non_negative_int(value):
+    """
+    Parses an argument that must be a whole number of at least 0, e.g. a cap.
+
+    Raises:
+        - ArgumentTypeError: If it isn't one.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"should be at least 0, got {number}")
+    return number
+
+def add_render_arguments(parser):
+    """
+    Adds the arguments that control how the report is rendered.
+
+    Parameters:
+        - parser (ArgumentParser): The parser of the command.
+    """
+    parser.add_argument('--stream', action='store_true',
+                        help='Render the report line by line instead of one table per file. ' +
+                             'Implied by the options below.')
+    parser.add_argument('--max-findings-per-file', type=non_negative_int, metavar='N',
+                        help='Render at most N findings for each file.')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Render only the number of successes, warnings and failures of each file.')
+    parser.add_argument('--page-size', type=positive_int, metavar='N', help='Render the findings in pages of N findings.')
+    parser.add_argument('--page', type=positive_int, default=1, metavar='P', help='The page to render, starting at 1.')
+
+def render_report(args):
+    """
+    Renders the report and its exit summary.
+
+    Parameters:
+        - args (Namespace): The parsed arguments, see add_render_arguments.
+
+    Returns:
+        - int: The number of files with failures.
+    """
+    if args.stream or args.max_findings_per_file is not None or args.summary_only or args.page_size:
+        StreamingReportRenderer(
+            max_findings_per_file=args.max_findings_per_file,
+            summary_only=args.summary_only,
+            page_size=args.page_size,
+            page=args.page
+        ).render(validator_report)
+
+        # The findings were already rendered, within the page or the cap. The exit summary keeps to the
+        # same cap, and only tells the status and the number of findings of each file otherwise.
+        capped = not args.summary_only and not args.page_size and args.max_findings_per_file is not None
+        return validator_report.print_exit_summary(args.max_findings_per_file if capped else 0)
+
+    validator_report.print_report_table()
+
+    # Print the exit summary and find the exit status
+    return validator_report.print_exit_summary()
+
+def print_header(work_dir):
+    """
+    Prints the linter header.
+
+    Parameters:
+        - work_dir (str): The directory the appsettings files are looked for in.
+    """
+    print("=== Appsettings Linter ===")
+    print("\nThe current script will validate the appsettings files found in: " + work_dir)
+
+def merge_main(argv):
+    """
+    The merge subcommand, which combines the partial reports of a sharded run into the final report.
+
+    Parameters:
+        - argv (list): The arguments after 'merge'.
+    """
+
+    parser = argparse.ArgumentParser(prog="vault-appsettings-linter merge",
+                                     description="Combines the partial reports written with --shard.")
+    parser.add_argument('partial_reports', nargs='+', metavar='PARTIAL_REPORT',
+                        help='The partial report of every shard.')
+    add_render_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    try:
+        partial_reports = [PartialReport.load(partial_report) for partial_report in args.partial_reports]
+        work_dir = merge(partial_reports, validator_report)
+    except ShardError as ex:
+        print(helper.color_text(f"\n{ex}", "red"))
+        exit(1)
+
+    # The output is the same as the one of an unsharded run
+    print_header(work_dir)
+    failures = render_report(args)
+
+    # The shards that stopped early didn't cover every project, the merged report isn't complete either
+    incomplete = incomplete_shards(partial_reports)
+    for partial_report in incomplete:
+        skipped = f", these projects weren't validated: {', '.join(partial_report.skipped)}" if partial_report.skipped else ""
+        print(helper.color_text(f"\nThe shard {partial_report.shard}/{partial_report.count} stopped early{skipped}",
+                                "yellow"))
+
+    # Exit code is conditioned on the existence of failures, and then on the coverage
+    exit(1 if failures > 0 else EXIT_INCOMPLETE if incomplete else 0)
+
+def drift_main(argv):
+    """
+    The drift subcommand, which compares the Vault settings of the environments of each service.
+
+    Parameters:
+        - argv (list): The arguments after 'drift'.
+    """
+
+    parser = argparse.ArgumentParser(prog="vault-appsettings-linter drift",
+                                     description="Shows which environments of each service disagree on the Vault " +
+                                                 "mount point, the authentication method and the keys with placeholders.")
+    parser.add_argument('--work-dir', required=True,help='The directory where the appsettings files should be located.')
+    parser.add_argument('--recursive', action='store_true',
+                        help='Look for appsettings files in every project directory below the work dir.')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='Skip the files and directories matching the glob. Can be repeated.')
+    parser.add_argument('--no-gitignore', action='store_true',
+                        help="Don't skip the files and directories matched by .gitignore files on recursive runs.")
+
+    args = parser.parse_args(argv)
+
+    work_dir = args.work_dir
+
+    print("=== Appsettings Drift ===")
+    print("\nThe current script will compare the environments of the appsettings files found in: " + work_dir)
+
+    if not os.path.isdir(work_dir):
+        print (helper.color_text(f"\nThe provided directory '{work_dir}' does not exist!", "red"))
+        exit(1)
+
+    projects = discover(work_dir, args.recursive, args.exclude, args.recursive and not args.no_gitignore)
+    print_drift_report([service_drift(project_key(work_dir, project), project) for project in projects])
+
+    exit(0)
+
+def daemon_main(argv):
+    """
+    Keeps a warm linter process serving the lints of the CLI until interrupted.
+
+    Parameters:
+        - argv (list): The command line arguments.
+    """
+
+    parser = argparse.ArgumentParser(description="Serves the lints of the CLI from a warm process.")
+    parser.add_argument('--daemon', action='store_true', required=True, help='Start the daemon.')
+    parser.add_argument('--socket', metavar='PATH',
+                        help=f'The path of the Unix socket, {daemon.SOCKET_ENV} or a per user default when omitted.')
+
+    args = parser.parse_args(argv)
+
+    lint_daemon = daemon.LintDaemon(run, args.socket)
+    try:
+        lint_daemon.start()
+    except OSError as ex:
+        print(helper.color_text(str(ex), "red"))
+        exit(1)
+
+    print(f"=== Appsettings Linter Daemon ===\n\nListening on: {lint_daemon.path}", flush=True)
+
+    # Stopping the daemon with a plain kill removes its socket as well
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        lint_daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+    exit(0)
+
+def lint_main(argv):
+    """
+    The lint of the appsettings files, the default command.
+
+    Parameters:
+        - argv (list): The command line arguments.
+    """
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--work-dir', required=True,help='The directory where the appsettings files should be located.')
+    parser.add_argument('--recursive', action='store_true',
+                        help='Look for appsettings files in every project directory below the work dir.')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='Skip the files and directories matching the glob. Can be repeated.')
+    parser.add_argument('--no-gitignore', action='store_true',
+                        help="Don't skip the files and directories matched by .gitignore files on recursive runs.")
+    parser.add_argument('--emit-manifest', metavar='FILE',
+                        help='Write the Vault reads of each service and environment to a JSON manifest. ' +
+                             'An existing manifest is updated incrementally.')
+    parser.add_argument('--shard', metavar='I/N',
+                        help='Validate only the projects of the I-th of N shards. The projects are partitioned ' +
+                             'by a stable hash of their directory.')
+    parser.add_argument('--partial-report', metavar='FILE',
+                        help="Write the findings to a partial report, to be combined with the 'merge' subcommand.")
+    parser.add_argument('--select', action='append', default=[], metavar='RULES',
+                        help="Run only these comma separated rule IDs or globs, e.g. 'vault-secret-syntax,mount-point'. " +
+                             "Can be repeated.")
+    parser.add_argument('--ignore', action='append', default=[], metavar='RULES',
+                        help="Don't run these comma separated rule IDs or globs, e.g. 'vault-section-missing'. " +
+                             "Can be repeated.")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Stop at the first failure, and only keep track of the failures and warnings.')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        help='Stop validating once the time budget is spent, and report what was covered.')
+    parser.add_argument('--incremental-cache', metavar='FILE',
+                        help='Keep the findings of each section and nested object of the appsettings files in a ' +
+                             'cache file, and only validate again the ones that changed since the previous run.')
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Write the statistics of the run to a file in the OpenMetrics text format, ' +
+                             'e.g. for the node_exporter textfile collector.')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep a warm linter process that serves the next runs over a Unix socket.')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Lint in this process even when a daemon is running.')
+    add_render_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    try:
+        shard, shard_count = parse_shard(args.shard) if args.shard else (1, 1)
+    except ShardError as ex:
+        parser.error(str(ex))
+
+    try:
+        enabled_rules = rules.select_rules(
+            [rule.strip() for value in args.select for rule in value.split(",") if rule.strip()],
+            [rule.strip() for value in args.ignore for rule in value.split(",") if rule.strip()]
+        )
+    except ValueError as ex:
+        parser.error(str(ex))
+    deadline = time.perf_counter() + args.time_budget if args.time_budget is not None else None
+
+    work_dir = args.work_dir
+
+    print_header(work_dir)
+
+    # Before anything lets validate if the work dir exist
+    if not os.path.isdir(work_dir):
+        print (helper.color_text(f"\nThe provided directory '{work_dir}' does not exist!", "red"))
+        exit(1)
+
+    if args.recursive:
+        # Discovery runs on a producer thread while the projects already found are validated
+        projects = discover_in_background(work_dir, True, args.exclude, not args.no_gitignore)
+    else:
+        # A single directory is linted as it is, .gitignore files only apply to recursive runs
+        projects = list(discover(work_dir, False, args.exclude, False)) or [ProjectAppsettings(work_dir, None, [])]
+
+    manifest = Manifest.load(work_dir, args.emit_manifest) if args.emit_manifest else None
+    partial_report = PartialReport(work_dir, shard, shard_count) if args.partial_report else None
+    subtree_cache = SubtreeCache.load(args.incremental_cache, enabled_rules, args.fail_fast) \
+        if args.incremental_cache else None
+
+    # Why the run stopped before validating every project, if it did
+    stopped = None
+    validated_files = 0
+    validated_projects = 0
+
+    # The time spent waiting for each project is the discovery phase
+    projects = metrics.registry.timed(projects, metrics.PHASE_DURATION, phase="discovery")
+    for position, project in enumerate(projects):
+
+        # Every shard discovers all the projects, and skips the ones that belong to the others
+        if shard_count > 1 and shard_of(project_key(work_dir, project), shard_count) != shard:
+            continue
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            stopped = f"The time budget of {args.time_budget}s was spent"
+            if partial_report is not None:
+                partial_report.add_skipped(project_key(work_dir, project))
+            break
+
+        # Hash the files before validating them so that the manifest never gets ahead of them
+        digest = None
+        if manifest is not None:
+            with metrics.registry.timer(metrics.PHASE_DURATION, phase="manifest"):
+                digest = project_digest(project)
+        base_data = None
+
+        # Look for appsettings.json file first
+        if project.base is None:
+            if not args.recursive:
+                print(helper.color_text("\nThe base file 'appsettings.json' wasn't found in the provided directory.", "red"))
+                exit(1)
+
+            if enabled_rules is None or rules.MISSING_BASE_FILE in enabled_rules:
+                validator_report.add_failure(
+                    os.path.join(project.directory, BASE_APPSETTINGS_FILE),
+                    "Missing base file",
+                    "The base file 'appsettings.json' wasn't found in this project directory.",
+                    rules.MISSING_BASE_FILE
+                )
+                if args.fail_fast:
+                    stopped = "Stopped at the first failure"
+                    if partial_report is not None:
+                        partial_report.add_project(position, [os.path.join(project.directory, BASE_APPSETTINGS_FILE)] +
+                                                   project.environments, validator_report)
+                    break
+
+        # Process the base appsettings file and then each of the environment files
+        environments_data = {}
+        try:
+            if project.base is not None:
+                base_data = process_base_appsettings_file(project.base, enabled_rules, args.fail_fast,
+                                                          subtree_cache).appsettings_data
+                validated_files = validated_files + 1
+
+            for env_appsettings_file in project.environments:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    stopped = f"The time budget of {args.time_budget}s was spent"
+                    break
+                environments_data[env_appsettings_file] = process_environment_appsettings_file(
+                    env_appsettings_file, enabled_rules, args.fail_fast, subtree_cache).appsettings_data
+                validated_files = validated_files + 1
+        except StopValidation:
+            validated_files = validated_files + 1
+            stopped = "Stopped at the first failure"
+
+        # The partial report gets the findings of the project even when it wasn't fully validated,
+        # like the report of an unsharded run, but the manifest only takes the complete ones
+        if partial_report is not None:
+            base_file = project.base or os.path.join(project.directory, BASE_APPSETTINGS_FILE)
+            partial_report.add_project(position, [base_file] + project.environments, validator_report)
+
+        if stopped is not None:
+            break
+        validated_projects = validated_projects + 1
+
+        if manifest is not None and not manifest.is_up_to_date(project, digest):
+            with metrics.registry.timer(metrics.PHASE_DURATION, phase="manifest"):
+                manifest.update(project, digest, base_data, environments_data)
+
+    # The partial report lists the projects of the shard that were left, so that the merge knows it isn't complete
+    if stopped is not None and partial_report is not None:
+        partial_report.complete = False
+        for project in projects:
+            if shard_count == 1 or shard_of(project_key(work_dir, project), shard_count) == shard:
+                partial_report.add_skipped(project_key(work_dir, project))
+
+    # Stops the discovery as well, when the validation stopped early
+    projects.close()
+
+    if manifest is not None:
+        with metrics.registry.timer(metrics.PHASE_DURATION, phase="manifest"):
+            manifest.prune()
+            manifest.save(args.emit_manifest)
+
+    if partial_report is not None:
+        partial_report.save(args.partial_report)
+
+    if subtree_cache is not None:
+        subtree_cache.save(args.incremental_cache)
+
+    # Print the report for each file
+    with metrics.registry.timer(metrics.PHASE_DURATION, phase="render"):
+        failures = render_report(args)
+
+    # Tells what was covered when the run didn't get through every project
+    if stopped is not None:
+        print(helper.color_text(f"\n{stopped}: {validated_files} files were validated, covering {validated_projects} projects " +
+                                "completely, and the remaining files were skipped.", "yellow"))
+
+    if args.metrics_out:
+        metrics.registry.write(args.metrics_out)
+
+    # Exit code is conditioned on the existence of failures, and then on the coverage
+    exit(1 if failures > 0 else EXIT_INCOMPLETE if stopped is not None else 0)
+
+def run(argv):
+    """
+    Runs a command of the linter from scratch, be it in this process or in the daemon.
+
+    Parameters:
+        - argv (list): The command line arguments, without the program name.
+
+    Returns:
+        - int: The exit code.
+    """
+
+    # Nothing is carried over from a previous run but the caches
+    validator_report.clear()
+    metrics.registry.clear()
+
+    try:
+        if argv[:1] == ["merge"]:
+            merge_main(argv[1:])
+        elif argv[:1] == ["drift"]:
+            drift_main(argv[1:])
+        else:
+            lint_main(argv)
+    except SystemExit as ex:
+        if ex.code is None or isinstance(ex.code, int):
+            return ex.code or 0
+        print(ex.code, file=sys.stderr)
+        return 1
+
+    return 0
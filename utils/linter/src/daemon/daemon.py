@@ -0,0 +1,366 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import hashlib
+import io
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import time
+
+# Bumped whenever the request or the response change, a daemon never serves another version
+PROTOCOL_VERSION = 2
+
+# Environment variable with the path of the socket, overriding the default one
+SOCKET_ENV = "VAULT_APPSETTINGS_LINTER_SOCKET"
+
+# How long the client waits for the daemon to accept the connection, in seconds
+CONNECT_TIMEOUT = 0.5
+
+# The environment variables the lint reads, the only ones sent to the daemon: the terminal
+# and color settings of rich and argparse. The Vault settings and tokens never leave the client.
+CLIENT_ENVIRON = ("COLUMNS", "LINES", "TERM", "COLORTERM", "NO_COLOR", "FORCE_COLOR", "PYTHON_COLORS",
+                  "TTY_COMPATIBLE", "TTY_INTERACTIVE", "JUPYTER_COLUMNS", "JUPYTER_LINES", "UNICODE_VERSION")
+
+# The folder of the linter package, whose sources tell whether the daemon runs the same code as the client
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def socket_path(environ=None):
+    """
+    Finds the path of the socket the daemon listens on.
+
+    Parameters:
+        - environ (dict|None): The environment variables, os.environ when None.
+
+    Returns:
+        - str: The path of the socket, within a folder private to the current user.
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get(SOCKET_ENV):
+        return environ[SOCKET_ENV]
+    runtime_dir = environ.get("XDG_RUNTIME_DIR") or environ.get("TMPDIR") or "/tmp"
+    return os.path.join(runtime_dir, f"vault-appsettings-linter-{os.getuid()}", "daemon.sock")
+
+def code_fingerprint(package_dir=PACKAGE_DIR):
+    """
+    Fingerprints the sources of the linter from their names, sizes and modification times,
+    so that a daemon left running after an upgrade doesn't serve the new CLI.
+
+    Parameters:
+        - package_dir (str): The folder of the linter package.
+
+    Returns:
+        - str: The hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    for directory, subdirectories, files in os.walk(package_dir):
+        subdirectories.sort()
+        for file in sorted(files):
+            if file.endswith(".py"):
+                path = os.path.join(directory, file)
+                status = os.stat(path)
+                digest.update(f"{os.path.relpath(path, package_dir)}:{status.st_size}:{status.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:32]
+
+def is_private(path):
+    """
+    Tells whether a socket and the folder holding it belong to the current user, and whether
+    nobody else can reach into that folder to replace the socket.
+
+    Parameters:
+        - path (str): The path of the socket.
+
+    Returns:
+        - bool: True when the socket can be trusted with a request.
+    """
+    try:
+        directory_status = os.lstat(os.path.dirname(os.path.abspath(path)))
+        socket_status = os.lstat(path)
+    except OSError:
+        return False
+
+    return stat.S_ISDIR(directory_status.st_mode) and directory_status.st_uid == os.getuid() and \
+        stat.S_IMODE(directory_status.st_mode) & 0o077 == 0 and \
+        stat.S_ISSOCK(socket_status.st_mode) and socket_status.st_uid == os.getuid()
+
+def peer_uid(connection):
+    """
+    Finds the user on the other side of a Unix socket connection.
+
+    Returns:
+        - int|None: The user id, None when the platform doesn't tell.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", credentials)[1]
+
+def make_private_directory(directory):
+    """
+    Creates the folder of the socket, readable only by the current user.
+
+    Raises:
+        OSError: If the folder already exists and belongs to someone else or other users can reach into it.
+    """
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+
+    status = os.lstat(directory)
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or stat.S_IMODE(status.st_mode) & 0o077:
+        raise OSError(f"The folder '{directory}' of the socket must belong to the current user and have mode 0700")
+
+def terminal_sizes():
+    """
+    Measures the terminal of the standard streams, the way rich and argparse do.
+
+    Returns:
+        - list: The [columns, lines] of the stdin, stdout and stderr descriptors, None when they aren't terminals.
+    """
+    sizes = []
+    for file_descriptor in (0, 1, 2):
+        try:
+            sizes.append(list(os.get_terminal_size(file_descriptor)))
+        except (AttributeError, ValueError, OSError):
+            sizes.append(None)
+    return sizes
+
+def request(argv, path=None):
+    """
+    Sends a lint to the daemon, and writes its output as if it had run in this process.
+
+    Parameters:
+        - argv (list): The command line arguments, without the program name.
+        - path (str|None): The path of the socket, see socket_path.
+
+    Returns:
+        - int|None: The exit code, None when no daemon could serve the request and it must run in-process.
+    """
+    path = path or socket_path()
+
+    # Nothing is sent to a socket that someone else could have put there
+    if not is_private(path):
+        return None
+
+    message = {
+        "version": PROTOCOL_VERSION,
+        "code": code_fingerprint(),
+        "argv": [sys.argv[0]] + list(argv),
+        "cwd": os.getcwd(),
+        "environ": {name: os.environ[name] for name in CLIENT_ENVIRON if name in os.environ},
+        "isatty": [sys.stdout.isatty(), sys.stderr.isatty()],
+        "terminal_sizes": terminal_sizes(),
+    }
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(path)
+            if peer_uid(client) not in (None, os.getuid()):
+                return None
+
+            # The lint itself may take long, only the connection is bounded
+            client.settimeout(None)
+            client.sendall(json.dumps(message).encode("utf-8"))
+            client.shutdown(socket.SHUT_WR)
+            response = json.loads(_receive(client) or b"{}")
+    except (OSError, ValueError):
+        return None
+
+    if "exit_code" not in response:
+        return None
+
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.stderr.flush()
+    return response["exit_code"]
+
+def _receive(connection):
+    """
+    Reads from a connection until the other side stops writing.
+    """
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+class CapturedStream(io.StringIO):
+    """
+    Captures what is written to a standard stream, telling the writers whether the client
+    stream is a terminal so that the colors and the layout don't change.
+
+    Attributes:
+        terminal (bool): Whether the client stream is a terminal.
+    """
+
+    def __init__(self, terminal):
+        super().__init__()
+        self.terminal = terminal
+
+    def isatty(self):
+        return self.terminal
+
+class LintDaemon:
+    """
+    A warm linter process that serves the lints of the CLI over a Unix socket.
+
+    The imports, the compiled expressions and the verdict cache are shared by every
+    request. Each request runs with the arguments, the working directory, the environment
+    and the terminal of its client, one at a time since those are global to the process.
+
+    Attributes:
+        run (callable): Runs a lint from its arguments and returns the exit code.
+        path (str): The path of the socket.
+        code (str): The fingerprint of the sources the daemon was started with, see code_fingerprint.
+        served (int): How many requests were served.
+    """
+
+    def __init__(self, run, path=None):
+        self.run = run
+        self.path = path or socket_path()
+        self.code = code_fingerprint()
+        self.served = 0
+        self.__server = None
+
+    def start(self):
+        """
+        Starts listening within a folder private to the current user, replacing the socket left
+        behind by a daemon that didn't stop cleanly.
+
+        Raises:
+            OSError: If another daemon is already listening on the socket, or the folder isn't private.
+        """
+        make_private_directory(os.path.dirname(os.path.abspath(self.path)))
+
+        if os.path.exists(self.path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.path)
+                except OSError:
+                    os.unlink(self.path)
+                else:
+                    raise OSError(f"Another daemon is already listening on '{self.path}'")
+
+        self.__server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # The requests carry the working directory and the terminal of the client, nobody else may connect
+        previous_umask = os.umask(0o177)
+        try:
+            self.__server.bind(self.path)
+        finally:
+            os.umask(previous_umask)
+        self.__server.listen(16)
+
+    def serve_forever(self):
+        """
+        Serves the requests until interrupted, removing the socket on the way out.
+        """
+        try:
+            while True:
+                connection, _ = self.__server.accept()
+                with connection:
+                    # Only the lints of the user who started the daemon are served
+                    if peer_uid(connection) in (None, os.getuid()):
+                        self.handle_connection(connection)
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stops listening and removes the socket.
+        """
+        if self.__server is not None:
+            self.__server.close()
+            self.__server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def handle_connection(self, connection):
+        """
+        Serves the request of a single connection.
+        """
+        try:
+            message = json.loads(_receive(connection))
+        except (OSError, ValueError):
+            return
+
+        started = time.perf_counter()
+        response = self.handle_request(message)
+        self.served = self.served + 1
+
+        try:
+            connection.sendall(json.dumps(response).encode("utf-8"))
+        except OSError:
+            # The client went away, e.g. interrupted by the user
+            return
+
+        status = f"exit {response['exit_code']}" if "exit_code" in response else f"run by the client, {response['reason']}"
+        print(f"{' '.join(message.get('argv', [])[1:])}: {status} in {time.perf_counter() - started:.3f}s", flush=True)
+
+    def handle_request(self, message):
+        """
+        Runs a lint within the context of its client.
+
+        Returns:
+            dict: The output and the exit code, or just the reason when the client has to run it by itself.
+        """
+        if message.get("version") != PROTOCOL_VERSION:
+            return {"reason": f"Protocol version {message.get('version')} isn't supported"}
+        if message.get("code") != self.code:
+            return {"reason": "The linter changed since the daemon started, restart it"}
+
+        stdout = CapturedStream(message["isatty"][0])
+        stderr = CapturedStream(message["isatty"][1])
+        sizes = message["terminal_sizes"]
+
+        def get_terminal_size(file_descriptor=1):
+            if 0 <= file_descriptor < len(sizes) and sizes[file_descriptor] is not None:
+                return os.terminal_size(sizes[file_descriptor])
+            raise OSError(f"The descriptor {file_descriptor} of the client isn't a terminal")
+
+        saved = (sys.stdout, sys.stderr, sys.argv, os.getcwd(), dict(os.environ), os.get_terminal_size)
+        try:
+            os.chdir(message["cwd"])
+            for name in CLIENT_ENVIRON:
+                if name in message["environ"]:
+                    os.environ[name] = message["environ"][name]
+                else:
+                    os.environ.pop(name, None)
+            os.get_terminal_size = get_terminal_size
+            sys.stdout, sys.stderr, sys.argv = stdout, stderr, message["argv"]
+
+            exit_code = self.run(message["argv"][1:])
+        except (OSError, ValueError, json.JSONDecodeError) as ex:
+            # The client runs the lint by itself, e.g. when its working directory is gone. Programming errors
+            # stop the daemon with their traceback, and the client runs the lint by itself as well
+            return {"reason": repr(ex)}
+        finally:
+            sys.stdout, sys.stderr, sys.argv = saved[0], saved[1], saved[2]
+            os.get_terminal_size = saved[5]
+            os.environ.clear()
+            os.environ.update(saved[4])
+            os.chdir(saved[3])
+
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
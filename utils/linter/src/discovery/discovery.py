@@ -0,0 +1,315 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import fnmatch
+import os
+import queue
+import re
+import threading
+
+# Name of the base appsettings file of every project
+BASE_APPSETTINGS_FILE = "appsettings.json"
+
+# Directories that never contain appsettings files worth linting
+PRUNED_DIRECTORIES = frozenset(["bin", "obj", "node_modules", ".git"])
+
+class ProjectAppsettings:
+    """
+    The appsettings files found in a single project directory.
+
+    Attributes:
+        directory (str): The project directory.
+        base (str|None): Path to the base appsettings.json file, None if it doesn't exist.
+        environments (list): Paths to the environment specific appsettings files, sorted by name.
+    """
+
+    def __init__(self, directory, base, environments):
+        self.directory = directory
+        self.base = base
+        self.environments = environments
+
+    def __eq__(self, other):
+        return isinstance(other, ProjectAppsettings) and \
+            (self.directory, self.base, self.environments) == (other.directory, other.base, other.environments)
+
+    def __repr__(self):
+        return f"ProjectAppsettings({self.directory!r}, {self.base!r}, {self.environments!r})"
+
+def is_appsettings_file(filename):
+    """
+    Checks if a file name is one of the appsettings files.
+
+    Parameters:
+        - filename (str): The name of the file.
+
+    Returns:
+        - bool: True for appsettings.json and appsettings.<Environment>.json files.
+    """
+    return filename == BASE_APPSETTINGS_FILE or \
+        (filename.startswith("appsettings.") and filename.endswith(".json"))
+
+def _glob_to_regex(pattern):
+    """
+    Translates a .gitignore glob into a regular expression matched against '/' separated paths.
+    """
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+            continue
+        if pattern.startswith("/**", index) and index + 3 == len(pattern):
+            regex += "/.*"
+            index += 3
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                regex += "[" + pattern[index + 1:end].replace("\\", "\\\\") + "]"
+                index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            regex += re.escape(pattern[index])
+        else:
+            regex += re.escape(char)
+        index += 1
+    return re.compile(regex + r"\Z")
+
+class GitIgnore:
+    """
+    The rules of a single .gitignore file, relative to the directory where it lives.
+
+    Only the subset of the syntax used in practice is supported: comments, negations,
+    directory only rules, anchored rules and the '*', '?', '[]' and '**' wildcards.
+    """
+
+    def __init__(self, lines):
+        """
+        Parses the lines of a .gitignore file.
+
+        Args:
+            lines (iterable): The lines of the .gitignore file.
+        """
+        self.rules = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+
+            # Rules without a slash match at any depth, the others are anchored
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+
+            self.rules.append((_glob_to_regex(line), negated, directory_only, anchored))
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Loads the .gitignore file of a directory.
+
+        Returns:
+            GitIgnore|None: The parsed rules or None if the directory doesn't have a .gitignore file.
+        """
+        try:
+            with open(os.path.join(directory, ".gitignore"), "r", encoding="utf-8", errors="replace") as gitignore:
+                rules = cls(gitignore)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, relative_path, is_dir):
+        """
+        Matches a path against the rules, the last matching rule wins.
+
+        Args:
+            relative_path (str): The '/' separated path relative to the .gitignore directory.
+            is_dir (bool): Whether the path is a directory.
+
+        Returns:
+            bool|None: True if ignored, False if explicitly re-included, None if no rule matched.
+        """
+        result = None
+        basename = relative_path.rsplit("/", 1)[-1]
+        for regex, negated, directory_only, anchored in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.match(relative_path if anchored else basename):
+                result = not negated
+        return result
+
+class _Walker:
+    """
+    Walks a directory tree with os.scandir, pruning the ignored directories on the way down.
+    """
+
+    def __init__(self, work_dir, excludes, use_gitignore):
+        self.work_dir = work_dir
+        self.excludes = list(excludes or [])
+        self.use_gitignore = use_gitignore
+
+    def is_excluded(self, relative_path, name):
+        """
+        Checks if a path is matched by any of the --exclude globs, either by full path or by name.
+        """
+        return any(fnmatch.fnmatchcase(relative_path, pattern) or fnmatch.fnmatchcase(name, pattern)
+                   for pattern in self.excludes)
+
+    def is_ignored(self, gitignores, relative_path, is_dir):
+        """
+        Checks the path against the stack of .gitignore files, the innermost one has precedence.
+        """
+        for base, gitignore in reversed(gitignores):
+            path = relative_path[len(base) + 1:] if base else relative_path
+            result = gitignore.match(path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def walk(self, recursive):
+        """
+        Yields the ProjectAppsettings of every directory that contains appsettings files,
+        in a deterministic pre-order (entries are visited sorted by name).
+        """
+        stack = [(self.work_dir, "", [])]
+        while stack:
+            directory, relative_dir, gitignores = stack.pop()
+
+            if self.use_gitignore:
+                gitignore = GitIgnore.load(directory)
+                if gitignore is not None:
+                    gitignores = gitignores + [(relative_dir, gitignore)]
+
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            base = None
+            environments = []
+            subdirectories = []
+            for entry in entries:
+                relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    if not recursive or entry.name in PRUNED_DIRECTORIES or \
+                            self.is_excluded(relative_path, entry.name) or \
+                            self.is_ignored(gitignores, relative_path, True):
+                        continue
+                    subdirectories.append((entry.path, relative_path))
+
+                elif is_appsettings_file(entry.name) and entry.is_file():
+                    if self.is_excluded(relative_path, entry.name) or \
+                            self.is_ignored(gitignores, relative_path, False):
+                        continue
+                    if entry.name == BASE_APPSETTINGS_FILE:
+                        base = entry.path
+                    else:
+                        environments.append(entry.path)
+
+            if base is not None or environments:
+                yield ProjectAppsettings(directory, base, environments)
+
+            # Reversed so that the stack pops the subdirectories sorted by name
+            for path, relative_path in reversed(subdirectories):
+                stack.append((path, relative_path, gitignores))
+
+def discover(work_dir, recursive=False, excludes=None, use_gitignore=True):
+    """
+    Discovers the appsettings files grouped by project directory.
+
+    Parameters:
+        - work_dir (str): The directory where the search starts.
+        - recursive (bool): Whether to descend into the subdirectories.
+        - excludes (list): Globs of files and directories to be skipped.
+        - use_gitignore (bool): Whether to honour the .gitignore files found on the way.
+
+    Returns:
+        - generator: The ProjectAppsettings found, in a deterministic order.
+    """
+    return _Walker(work_dir, excludes, use_gitignore).walk(recursive)
+
+# Marks the end of the discovery on the producer/consumer queue
+_DONE = object()
+
+def discover_in_background(work_dir, recursive=False, excludes=None, use_gitignore=True, maxsize=64):
+    """
+    Runs the discovery on a producer thread so that it overlaps with the validation of
+    the projects that were already found.
+
+    Parameters:
+        - work_dir (str): The directory where the search starts.
+        - recursive (bool): Whether to descend into the subdirectories.
+        - excludes (list): Globs of files and directories to be skipped.
+        - use_gitignore (bool): Whether to honour the .gitignore files found on the way.
+        - maxsize (int): How many discovered projects may be waiting to be consumed.
+
+    Returns:
+        - generator: The ProjectAppsettings found, in the same order as discover().
+    """
+    projects = queue.Queue(maxsize=maxsize)
+    cancelled = threading.Event()
+
+    def producer():
+        try:
+            for project in discover(work_dir, recursive, excludes, use_gitignore):
+                if cancelled.is_set():
+                    return
+                projects.put(project)
+        except Exception as ex:  # noqa: BLE001
+            # Re-raised by the consumer, KeyboardInterrupt and SystemExit are left alone
+            projects.put(ex)
+        finally:
+            projects.put(_DONE)
+
+    thread = threading.Thread(target=producer, name="appsettings-discovery", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = projects.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Unblocks the producer if the consumer stopped early
+        cancelled.set()
+        while thread.is_alive():
+            try:
+                projects.get_nowait()
+            except queue.Empty:
+                thread.join(0.01)
@@ -0,0 +1,268 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import json
+from itertools import combinations
+
+from ..manifest.manifest import BASE_ENVIRONMENT, environment_name
+from ..utils import configuration, helper
+from ..validator import grammar
+
+# Prefix of the Vault connection settings in a flattened configuration, lower cased
+VAULT_SECTION = "vault" + configuration.KEY_DELIMITER
+
+# Authentication methods, in the order VaultClientFactory tries them, with the settings each one needs
+AUTH_METHODS = [
+    ("kubernetes", ["kubernetesSaRoleName"]),
+    ("approle", ["roleIdPath", "secretIdPath"]),
+    ("certificate", ["certificatePath", "certificatePassword", "certificateRolesName"]),
+]
+
+# Authentication method of the configurations that don't set any of the above
+NO_AUTH_METHOD = "none"
+
+# Aspects compared between environments, with the letter used for them in the matrix
+ASPECTS = [("mount_point", "M"), ("auth_method", "A"), ("placeholder_keys", "K")]
+
+class EnvironmentProfile:
+    """
+    What an environment of a service looks like to Vault.
+
+    Attributes:
+        mount_point (str|None): The Vault mount point.
+        auth_method (str): The authentication method VaultClientFactory would use.
+        placeholder_keys (dict): The paths whose value has a placeholder, keyed by their lower cased form
+            since .NET compares paths case insensitively.
+    """
+
+    def __init__(self, mount_point, auth_method, placeholder_keys):
+        self.mount_point = mount_point
+        self.auth_method = auth_method
+        self.placeholder_keys = placeholder_keys
+        self.__key = tuple(self.aspect(aspect) for aspect, _ in ASPECTS)
+
+    def aspect(self, name):
+        """
+        The value of an aspect as it is compared, see ASPECTS. The placeholder keys are compared
+        by their lower cased form only, like .NET does.
+
+        Parameters:
+            - name (str): The name of the aspect.
+        """
+        if name == "placeholder_keys":
+            return frozenset(self.placeholder_keys)
+        return getattr(self, name)
+
+    def __eq__(self, other):
+        return isinstance(other, EnvironmentProfile) and self.__key == other.__key
+
+    def __hash__(self):
+        return hash(self.__key)
+
+    @classmethod
+    def from_index(cls, index):
+        """
+        Builds the profile of an effective configuration in a single pass over its values.
+
+        Parameters:
+            - index (dict): The effective configuration values keyed by path.
+        """
+        vault = {}
+        placeholder_keys = {}
+        for path, value in index.items():
+            lowered = path.lower()
+            if lowered.startswith(VAULT_SECTION):
+                vault[lowered[len(VAULT_SECTION):]] = value
+            if isinstance(value, str) and grammar.find_placeholders(value):
+                placeholder_keys[lowered] = path
+
+        auth_method = NO_AUTH_METHOD
+        for method, settings in AUTH_METHODS:
+            if all(vault.get(setting.lower()) for setting in settings):
+                auth_method = method
+                break
+
+        return cls(vault.get("mountpoint"), auth_method, placeholder_keys)
+
+class EnvironmentDrift:
+    """
+    The differences between the profiles of two environments.
+
+    Attributes:
+        aspects (list): The names of the aspects that differ, see ASPECTS.
+        only_left (list): The placeholder keys that only the first environment has.
+        only_right (list): The placeholder keys that only the second environment has.
+    """
+
+    def __init__(self, left_profile, right_profile):
+        self.aspects = [aspect for aspect, _ in ASPECTS
+                        if left_profile.aspect(aspect) != right_profile.aspect(aspect)]
+
+        left_keys = left_profile.placeholder_keys
+        right_keys = right_profile.placeholder_keys
+        self.only_left = sorted(left_keys[key] for key in left_keys.keys() - right_keys.keys())
+        self.only_right = sorted(right_keys[key] for key in right_keys.keys() - left_keys.keys())
+
+class ServiceDrift:
+    """
+    The environment profiles of a service, and the drift between them.
+
+    Environments usually share a handful of profiles, so the drift is computed once for each
+    pair of distinct profiles rather than for each pair of environments.
+
+    Attributes:
+        name (str): The project directory of the service.
+        profiles (dict): The EnvironmentProfile of each environment.
+        unreadable (list): The appsettings files that couldn't be parsed, and were left out.
+    """
+
+    def __init__(self, name, profiles, unreadable=None):
+        self.name = name
+        self.profiles = profiles
+        self.unreadable = unreadable or []
+        self.__drifts = {}
+
+    @property
+    def environments(self):
+        """
+        The environments of the service, sorted by name.
+        """
+        return sorted(self.profiles)
+
+    @property
+    def has_drift(self):
+        """
+        Whether some environments don't match.
+        """
+        return len(set(self.profiles.values())) > 1
+
+    def drift(self, left, right):
+        """
+        The drift between two environments, None when they match.
+        """
+        profiles = (self.profiles[left], self.profiles[right])
+        if profiles[0] == profiles[1]:
+            return None
+
+        if profiles not in self.__drifts:
+            self.__drifts[profiles] = EnvironmentDrift(*profiles)
+        return self.__drifts[profiles]
+
+def _load_index(appsettings_file, unreadable):
+    """
+    Loads and flattens an appsettings file, None if it can't be parsed.
+    """
+    try:
+        with open(appsettings_file, "r") as file:
+            return configuration.flatten(json.load(file))
+    except (OSError, ValueError):
+        unreadable.append(appsettings_file)
+        return None
+
+def service_drift(name, project):
+    """
+    Computes the drift between the environments of a project. Each file is flattened once,
+    and every environment is overlaid on top of the base like .NET does.
+
+    Parameters:
+        - name (str): The name of the service.
+        - project (ProjectAppsettings): The project.
+
+    Returns:
+        - ServiceDrift: The drift of the service.
+    """
+    unreadable = []
+    base_index = (_load_index(project.base, unreadable) if project.base else None) or {}
+
+    profiles = {}
+    for appsettings_file in project.environments:
+        index = _load_index(appsettings_file, unreadable)
+        if index is not None:
+            profiles[environment_name(appsettings_file)] = \
+                EnvironmentProfile.from_index(configuration.overlay(base_index, index))
+
+    # The base file on its own is only an environment when there is no other
+    if not project.environments:
+        profiles[BASE_ENVIRONMENT] = EnvironmentProfile.from_index(base_index)
+
+    return ServiceDrift(name, profiles, unreadable)
+
+def print_drift_report(service_drifts):
+    """
+    Prints the drift matrix of each service, followed by the details of every pair that doesn't match.
+
+    Parameters:
+        - service_drifts (list): The ServiceDrift of each service.
+
+    Returns:
+        - int: The number of services with drift.
+    """
+    # rich takes longer to import than linting a file, so it's only loaded when a table is printed
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    drifting = 0
+
+    for service in service_drifts:
+        environments = service.environments
+
+        table = Table(
+            title=f"\nService: {service.name}",
+            caption=", ".join(f"{letter}: {aspect.replace('_', ' ')}" for aspect, letter in ASPECTS),
+            box=box.SQUARE_DOUBLE_HEAD)
+        table.add_column("Environment", justify="left", no_wrap=True)
+        for environment in environments:
+            table.add_column(environment, justify="center", no_wrap=True)
+
+        for left in environments:
+            cells = []
+            for right in environments:
+                drift = service.drift(left, right)
+                letters = "".join(letter for aspect, letter in ASPECTS if drift and aspect in drift.aspects)
+                cells.append(f"[red]{letters}[/red]" if letters else "[green]=[/green]")
+            table.add_row(left, *cells)
+
+        console.print(table)
+
+        for appsettings_file in service.unreadable:
+            print(helper.color_text(f"  - {appsettings_file}: can't be parsed, it was left out.", "red"))
+
+        if service.has_drift:
+            drifting = drifting + 1
+
+        for left, right in combinations(environments, 2):
+            drift = service.drift(left, right)
+            if drift is None:
+                continue
+
+            print(helper.color_text(f"  {left} <> {right}", "yellow"))
+            left_profile = service.profiles[left]
+            right_profile = service.profiles[right]
+            if "mount_point" in drift.aspects:
+                print(f"    mountPoint: {left_profile.mount_point} <> {right_profile.mount_point}")
+            if "auth_method" in drift.aspects:
+                print(f"    auth method: {left_profile.auth_method} <> {right_profile.auth_method}")
+            for key in drift.only_left:
+                print(f"    only in {left}: {key}")
+            for key in drift.only_right:
+                print(f"    only in {right}: {key}")
+
+    print(f"\n{drifting} of {len(service_drifts)} services have drift between their environments.")
+    return drifting
@@ -0,0 +1,213 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import hashlib
+import json
+import os
+
+from ..utils import configuration
+from ..validator import grammar
+
+# Version of the manifest file layout
+MANIFEST_VERSION = 1
+
+# Environment used for the services that only have the base appsettings.json file
+BASE_ENVIRONMENT = "(base)"
+
+# Kinds of Vault reads done by VaultConfigurationProvider
+KIND_SECRET = "secret"
+KIND_DICT = "dict"
+
+def placeholder_reads(index):
+    """
+    Lists, in load order, the Vault read done for each placeholder of a flattened configuration.
+    VaultConfigurationProvider doesn't deduplicate them, so the same path may show up several times.
+    Placeholders that the provider would refuse to load are left out, the linter reports those.
+
+    Parameters:
+        - index (dict): The effective configuration values keyed by path.
+
+    Returns:
+        - generator: The reads as (path, kind, field) tuples, the field being None for dicts.
+    """
+    for value in index.values():
+        if not isinstance(value, str):
+            continue
+
+        for placeholder in grammar.scan(value):
+            if placeholder.outcome == grammar.OUTCOME_SECRET:
+                yield placeholder.path, KIND_SECRET, placeholder.field
+            elif placeholder.outcome == grammar.OUTCOME_DICT:
+                yield placeholder.path, KIND_DICT, None
+
+def vault_reads(index):
+    """
+    Lists the Vault reads that VaultConfigurationProvider does for a flattened configuration.
+
+    Parameters:
+        - index (dict): The effective configuration values keyed by path.
+
+    Returns:
+        - list: The deduplicated reads as dictionaries with mountPoint, path, kind and fields.
+    """
+    mount_point = configuration.get_value(index, "Vault:mountPoint")
+    reads = {}
+
+    for path, kind, field in placeholder_reads(index):
+        fields = reads.setdefault((path, kind), set())
+        if field is not None:
+            fields.add(field)
+
+    return [
+        {"mountPoint": mount_point, "path": path, "kind": kind, "fields": sorted(fields)}
+        for (path, kind), fields in sorted(reads.items())
+    ]
+
+def environment_name(appsettings_file):
+    """
+    Extracts the environment name from an 'appsettings.<Environment>.json' file path.
+    """
+    return os.path.basename(appsettings_file)[len("appsettings."):-len(".json")]
+
+def project_digest(project):
+    """
+    Computes a digest of all the appsettings files of a project, used to skip unchanged services.
+
+    Parameters:
+        - project (ProjectAppsettings): The project whose files are hashed.
+
+    Returns:
+        - str: The hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for appsettings_file in [project.base] + project.environments:
+        if appsettings_file is None:
+            continue
+        digest.update(os.path.basename(appsettings_file).encode("utf-8") + b"\0")
+        with open(appsettings_file, "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+class Manifest:
+    """
+    The prefetch manifest of the Vault reads done by each service in each environment.
+
+    The manifest is written with sorted keys so that the same inputs always produce the same
+    bytes, and it keeps a digest of the appsettings files of each service so that a later run
+    only recomputes the services whose files changed.
+
+    Attributes:
+        work_dir (str): The directory the service names are relative to.
+        services (dict): The manifest entries keyed by service.
+    """
+
+    def __init__(self, work_dir, services=None):
+        self.work_dir = work_dir
+        self.services = services or {}
+
+    @classmethod
+    def load(cls, work_dir, manifest_file):
+        """
+        Loads a previously emitted manifest, starting from an empty one if it doesn't exist,
+        is broken or was written with another layout version.
+        """
+        try:
+            with open(manifest_file, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return cls(work_dir)
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(work_dir)
+
+        return cls(work_dir, data.get("services", {}))
+
+    def service_name(self, project):
+        """
+        The name of a service is its project directory relative to the work dir.
+        """
+        return os.path.relpath(project.directory, self.work_dir).replace(os.sep, "/")
+
+    def is_up_to_date(self, project, digest):
+        """
+        Checks if the manifest entries of a project were computed from the same files.
+        """
+        entry = self.services.get(self.service_name(project))
+        return entry is not None and entry.get("digest") == digest
+
+    def update(self, project, digest, base_data, environments_data):
+        """
+        Recomputes the manifest entries of a project.
+
+        Parameters:
+            - project (ProjectAppsettings): The project being updated.
+            - digest (str|None): The digest of the project files, None to force a recompute on the next run.
+            - base_data (dict|None): The parsed base appsettings file.
+            - environments_data (dict): The parsed environment files keyed by file path.
+        """
+        base_index = configuration.flatten(base_data or {})
+        environments = {}
+
+        if base_data is not None or not project.environments:
+            environments[BASE_ENVIRONMENT] = vault_reads(base_index)
+
+        for appsettings_file, data in environments_data.items():
+            if data is not None:
+                index = configuration.overlay(base_index, configuration.flatten(data))
+                environments[environment_name(appsettings_file)] = vault_reads(index)
+
+        # Files that couldn't be parsed must be looked at again on the next run
+        parsed = (project.base is None or base_data is not None) and \
+            all(data is not None for data in environments_data.values())
+
+        self.services[self.service_name(project)] = {
+            "digest": digest if parsed else None,
+            "environments": environments
+        }
+
+    def prune(self):
+        """
+        Drops the services whose project directory doesn't exist anymore.
+        """
+        for service in list(self.services):
+            if not os.path.isdir(os.path.join(self.work_dir, service)):
+                del self.services[service]
+
+    def dumps(self):
+        """
+        Serialises the manifest in its deterministic form.
+        """
+        return json.dumps({"version": MANIFEST_VERSION, "services": self.services},
+                          indent=2, sort_keys=True) + "\n"
+
+    def save(self, manifest_file):
+        """
+        Writes the manifest, leaving the file untouched when nothing changed.
+        """
+        content = self.dumps()
+        try:
+            with open(manifest_file, "r") as file:
+                if file.read() == content:
+                    return
+        except OSError:
+            pass
+
+        temporary_file = manifest_file + ".tmp"
+        with open(temporary_file, "w") as file:
+            file.write(content)
+        os.replace(temporary_file, manifest_file)
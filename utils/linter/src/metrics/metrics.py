@@ -0,0 +1,224 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import math
+import os
+import time
+from contextlib import contextmanager
+
+# Prefix of every metric written by the linter
+PREFIX = "appsettings_linter_"
+
+#
+# Metric families collected during a run
+#
+FILES_SCANNED = PREFIX + "files_scanned"
+BYTES_PARSED = PREFIX + "parsed_bytes"
+PLACEHOLDERS = PREFIX + "placeholders"
+FINDINGS = PREFIX + "findings"
+SUBTREES = PREFIX + "subtrees"
+PHASE_DURATION = PREFIX + "phase_duration_seconds"
+
+# Upper bounds, in seconds, of the duration buckets
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _Histogram:
+    """
+    The cumulative buckets, sum and count of a histogram with one set of labels.
+    """
+
+    __slots__ = ("count", "counts", "sum")
+
+    def __init__(self, buckets):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+class MetricsRegistry:
+    """
+    Counters and histograms collected while the linter runs, written in the OpenMetrics text format.
+
+    Updating a metric is a dictionary lookup and an addition, so the collection can stay enabled
+    on every run and only the rendering happens when the metrics are asked for.
+
+    Attributes:
+        families (dict): The type, help, unit and buckets of each metric family, keyed by name.
+    """
+
+    def __init__(self):
+        self.families = {}
+        self.__samples = {}
+
+    def counter(self, name, help_text, unit=None):
+        """
+        Declares a counter family, its samples get the '_total' suffix.
+        """
+        self.families[name] = ("counter", help_text, unit, None)
+        self.__samples[name] = {}
+
+    def histogram(self, name, help_text, buckets, unit=None):
+        """
+        Declares a histogram family with the given bucket upper bounds.
+        """
+        self.families[name] = ("histogram", help_text, unit, tuple(sorted(buckets)))
+        self.__samples[name] = {}
+
+    def inc(self, name, amount=1, **labels):
+        """
+        Increases a counter.
+        """
+        samples = self.__samples[name]
+        key = tuple(sorted(labels.items()))
+        samples[key] = samples.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """
+        Records an observation in a histogram.
+        """
+        buckets = self.families[name][3]
+        samples = self.__samples[name]
+        key = tuple(sorted(labels.items()))
+        histogram = samples.get(key)
+        if histogram is None:
+            histogram = samples[key] = _Histogram(buckets)
+
+        for position, bound in enumerate(buckets):
+            if value <= bound:
+                histogram.counts[position] = histogram.counts[position] + 1
+                break
+        histogram.sum = histogram.sum + value
+        histogram.count = histogram.count + 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Observes the duration of a block of code in a histogram.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, iterable, name, **labels):
+        """
+        Iterates over an iterable, observing how long each item took to be produced.
+        """
+        iterator = iter(iterable)
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                self.observe(name, time.perf_counter() - started, **labels)
+                yield item
+        finally:
+            # Stopping early must also stop the underlying generator, e.g. a discovery thread
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    def value(self, name, **labels):
+        """
+        The current value of a counter, or the count of a histogram.
+        """
+        sample = self.__samples[name].get(tuple(sorted(labels.items())))
+        if isinstance(sample, _Histogram):
+            return sample.count
+        return sample or 0
+
+    def clear(self):
+        """
+        Drops every sample, keeping the declared families.
+        """
+        for samples in self.__samples.values():
+            samples.clear()
+
+    def render(self):
+        """
+        Renders every family in the OpenMetrics text format.
+
+        Returns:
+            - str: The exposition, ending with the mandatory '# EOF' line.
+        """
+        lines = []
+        for name in sorted(self.families):
+            kind, help_text, unit, buckets = self.families[name]
+            lines.append(f"# TYPE {name} {kind}")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            lines.append(f"# HELP {name} {_escape(help_text)}")
+
+            for key, sample in sorted(self.__samples[name].items()):
+                if kind == "counter":
+                    lines.append(f"{name}_total{_labels(key)} {_number(sample)}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(buckets, sample.counts):
+                    cumulative = cumulative + count
+                    lines.append(f"{name}_bucket{_labels(key + (('le', _number(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(key + (('le', '+Inf'),))} {sample.count}")
+                lines.append(f"{name}_sum{_labels(key)} {_number(sample.sum)}")
+                lines.append(f"{name}_count{_labels(key)} {sample.count}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, metrics_file):
+        """
+        Writes the metrics to a file, atomically so that a textfile collector never reads half of it.
+        """
+        temporary_file = f"{metrics_file}.{os.getpid()}.tmp"
+        with open(temporary_file, "w") as file:
+            file.write(self.render())
+        os.replace(temporary_file, metrics_file)
+
+def _escape(text):
+    """
+    Escapes a label value or a help text.
+    """
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(key):
+    """
+    Renders a set of labels, nothing when there are none.
+    """
+    if not key:
+        return ""
+    return "{" + ",".join(f'{label}="{_escape(str(value))}"' for label, value in key) + "}"
+
+def _number(value):
+    """
+    Renders a sample value.
+    """
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+# The metrics of the current run
+registry = MetricsRegistry()
+registry.counter(FILES_SCANNED, "Appsettings files scanned, by kind.")
+registry.counter(BYTES_PARSED, "Bytes of appsettings files parsed.", unit="bytes")
+registry.counter(PLACEHOLDERS, "Placeholders found, by type.")
+registry.counter(FINDINGS, "Findings reported, by severity and rule.")
+registry.counter(SUBTREES, "Subtrees of the appsettings files looked at with --incremental-cache, by outcome.")
+registry.histogram(PHASE_DURATION, "Duration of each step of the run, by phase.", DURATION_BUCKETS, unit="seconds")
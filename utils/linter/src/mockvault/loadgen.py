@@ -0,0 +1,214 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+from ..discovery.discovery import discover
+from ..manifest.manifest import BASE_ENVIRONMENT, environment_name, placeholder_reads
+from ..utils import configuration
+from ..utils.vault_http import VaultHttpClient, VaultHttpError
+
+
+class LoadSet:
+    """
+    The Vault reads done by one service in one environment when its configuration is loaded.
+
+    Attributes:
+        name (str): The service and environment, e.g. 'services/api (Production)'.
+        mount_point (str): The mount point the reads go to.
+        reads (list): The secret paths read, in load order and with repetitions.
+    """
+
+    def __init__(self, name, mount_point, reads):
+        self.name = name
+        self.mount_point = mount_point
+        self.reads = reads
+
+    @property
+    def unique_reads(self):
+        """
+        How many distinct secrets the load needs.
+        """
+        return len(set(self.reads))
+
+def _load_json(appsettings_file):
+    """
+    Loads an appsettings file, None if it can't be parsed.
+    """
+    try:
+        with open(appsettings_file, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def extract_load_sets(work_dir, recursive=False, default_mount_point=None):
+    """
+    Extracts the placeholder sets of every service and environment below the work dir.
+
+    Parameters:
+        - work_dir (str): The directory where the appsettings files are.
+        - recursive (bool): Whether to look for projects in the subdirectories.
+        - default_mount_point (str|None): The mount point of the configurations without one.
+
+    Returns:
+        - list: The LoadSet of each service and environment that reads from Vault.
+    """
+    load_sets = []
+    for project in discover(work_dir, recursive):
+        base_index = configuration.flatten(_load_json(project.base) if project.base else {})
+        indexes = {BASE_ENVIRONMENT: base_index}
+        for appsettings_file in project.environments:
+            indexes[environment_name(appsettings_file)] = \
+                configuration.overlay(base_index, configuration.flatten(_load_json(appsettings_file) or {}))
+
+        for environment, index in indexes.items():
+            mount_point = configuration.get_value(index, "Vault:mountPoint") or default_mount_point
+            # The provider goes through the values in GetChildren order, not in the order of the documents
+            ordered = {path: index[path] for path in sorted(index, key=configuration.sort_key)}
+            reads = [path for path, _, _ in placeholder_reads(ordered)]
+            if mount_point and reads:
+                load_sets.append(LoadSet(f"{project.directory} ({environment})", mount_point, reads))
+
+    return load_sets
+
+class LoadResult:
+    """
+    The statistics of a load test.
+
+    Attributes:
+        loads (int): How many configuration loads were replayed.
+        requests (int): How many requests were sent to Vault.
+        unique_reads (int): How many requests would be needed if every load read each secret once.
+        errors (Counter): The failed requests by HTTP status.
+        latencies (list): The duration in seconds of every load.
+        elapsed (float): The duration in seconds of the whole test.
+    """
+
+    def __init__(self):
+        self.loads = 0
+        self.requests = 0
+        self.unique_reads = 0
+        self.errors = Counter()
+        self.latencies = []
+        self.elapsed = 0.0
+
+    @property
+    def amplification(self):
+        """
+        The ratio between the requests sent and the distinct secrets needed.
+        """
+        return self.requests / self.unique_reads if self.unique_reads else 0.0
+
+    def percentile(self, percent):
+        """
+        A percentile of the load latencies, in seconds.
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def summary(self):
+        """
+        The human readable summary of the test.
+        """
+        return "\n".join([
+            f"Loads: {self.loads} in {self.elapsed:.3f}s ({self.loads / self.elapsed if self.elapsed else 0:.1f} loads/s)",
+            f"Requests: {self.requests} ({self.requests / self.elapsed if self.elapsed else 0:.1f} requests/s)",
+            f"Request amplification: {self.amplification:.2f}x ({self.unique_reads} distinct secrets needed)",
+            f"Load latency: p50 {self.percentile(50) * 1000:.1f}ms, p95 {self.percentile(95) * 1000:.1f}ms, " +
+            f"max {max(self.latencies, default=0) * 1000:.1f}ms",
+            "Errors: " + (", ".join(f"{status}: {count}" for status, count in sorted(self.errors.items())) or "none")
+        ])
+
+async def replay(client, load_sets, iterations=1, concurrency=8):
+    """
+    Replays the configuration loads against Vault, reading the secrets one after the other
+    within a load like VaultConfigurationProvider.Load does, with several loads in parallel.
+
+    Parameters:
+        - client (VaultHttpClient): The client used to reach Vault.
+        - load_sets (list): The LoadSet of each service and environment.
+        - iterations (int): How many times every load set is replayed.
+        - concurrency (int): How many loads run at the same time.
+
+    Returns:
+        - LoadResult: The statistics of the test.
+    """
+    result = LoadResult()
+    pending = asyncio.Queue()
+    for _ in range(iterations):
+        for load_set in load_sets:
+            pending.put_nowait(load_set)
+
+    async def worker():
+        while not pending.empty():
+            load_set = pending.get_nowait()
+            started = time.perf_counter()
+            for path in load_set.reads:
+                result.requests = result.requests + 1
+                try:
+                    await client.read_kv2(load_set.mount_point, path)
+                except VaultHttpError as ex:
+                    result.errors[ex.status] = result.errors[ex.status] + 1
+            result.latencies.append(time.perf_counter() - started)
+            result.loads = result.loads + 1
+            result.unique_reads = result.unique_reads + load_set.unique_reads
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+    result.elapsed = time.perf_counter() - started
+    return result
+
+def main():
+    """
+    Runs a load test against a Vault server, usually the local mock.
+    """
+
+    parser = argparse.ArgumentParser(description="Replays the placeholder sets of the appsettings files against Vault.")
+    parser.add_argument('--work-dir', required=True, help='The directory where the appsettings files should be located.')
+    parser.add_argument('--recursive', action='store_true', help='Look for appsettings files in every project directory.')
+    parser.add_argument('--address', default="http://127.0.0.1:8200", help='The Vault address.')
+    parser.add_argument('--token', default="mock-vault-token", help='The Vault token.')
+    parser.add_argument('--mount-point', help='The mount point of the configurations that do not define one.')
+    parser.add_argument('--iterations', type=int, default=10, help='How many times every load set is replayed.')
+    parser.add_argument('--concurrency', type=int, default=8, help='How many loads run at the same time.')
+
+    args = parser.parse_args()
+
+    load_sets = extract_load_sets(args.work_dir, args.recursive, args.mount_point)
+    print("=== Vault Resolution Load Test ===")
+    print(f"\n{len(load_sets)} load sets with {sum(len(load_set.reads) for load_set in load_sets)} reads found in: " +
+          args.work_dir)
+
+    async def run():
+        client = VaultHttpClient(args.address, args.token, max_connections=args.concurrency)
+        try:
+            return await replay(client, load_sets, args.iterations, args.concurrency)
+        finally:
+            await client.close()
+
+    result = asyncio.run(run())
+    print("\n" + result.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import random
+import uuid
+from collections import Counter
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+# Token handed out by the mocked authentication methods
+MOCK_TOKEN = "mock-vault-token"
+
+# Path of the endpoint that exposes the request counters of the mock
+STATS_PATH = "/v1/sys/mock/requests"
+
+class MockVaultServer:
+    """
+    A local stand-in for the Vault KV v2 API, meant for resolution load tests.
+
+    The secrets are served from a fixture shaped as {"<mount>": {"<path>": {"<field>": "<value>"}}}
+    and every request can be delayed or failed on purpose.
+
+    Attributes:
+        secrets (dict): The secrets served, keyed by mount point and path.
+        latency (float): Seconds added to every response.
+        jitter (float): Maximum random seconds added on top of the latency.
+        error_rate (float): Probability of answering a secret read with an internal error.
+        denied (list): Globs of '<mount>/<path>' that are answered with permission denied.
+        requests (Counter): How many requests were received for each path.
+    """
+
+    def __init__(self, secrets, latency=0.0, jitter=0.0, error_rate=0.0, denied=None, seed=None):
+        self.secrets = secrets
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.denied = list(denied or [])
+        self.requests = Counter()
+        self.__random = random.Random(seed)
+        self.__server = None
+        self.__connections = set()
+
+        # Longest mount points first, so that nested mounts win over their parents
+        self.__mounts = sorted(secrets, key=len, reverse=True)
+
+    @classmethod
+    def from_fixture(cls, fixture_file, **kwargs):
+        """
+        Creates a server from a JSON fixture file.
+        """
+        with open(fixture_file, "r") as fixture:
+            return cls(json.load(fixture), **kwargs)
+
+    @property
+    def port(self):
+        """
+        The port the server is listening on.
+        """
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Starts listening, port 0 picks a free port.
+
+        Returns:
+            int: The port the server is listening on.
+        """
+        self.__server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.port
+
+    async def stop(self):
+        """
+        Stops listening and closes the server, including the kept-alive connections.
+        """
+        self.__server.close()
+        for connection in list(self.__connections):
+            connection.cancel()
+        await asyncio.gather(*self.__connections, return_exceptions=True)
+        await self.__server.wait_closed()
+
+    async def serve_forever(self, host="127.0.0.1", port=8200):
+        """
+        Serves until cancelled.
+        """
+        await self.start(host, port)
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves the requests of a keep-alive connection.
+        """
+        connection = asyncio.current_task()
+        self.__connections.add(connection)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target = request_line.decode("latin-1").split()[:2]
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", "0")))
+
+                status, body = await self.handle_request(method, unquote(urlsplit(target).path))
+
+                content = json.dumps(body).encode("utf-8")
+                writer.write((f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                              "Content-Type: application/json\r\n"
+                              f"Content-Length: {len(content)}\r\n\r\n").encode("latin-1") + content)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            # A cancellation, e.g. by stop, still goes up to the task once the connection is closed
+            self.__connections.discard(connection)
+            writer.close()
+
+    async def handle_request(self, method, path):
+        """
+        Answers a single request.
+
+        Returns:
+            tuple: The HTTPStatus and the JSON body.
+        """
+        if path == STATS_PATH:
+            return HTTPStatus.OK, {"data": {"requests": dict(self.requests), "total": sum(self.requests.values())}}
+
+        self.requests[path] = self.requests[path] + 1
+
+        delay = self.latency + (self.__random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if path == "/v1/sys/health":
+            return HTTPStatus.OK, {"initialized": True, "sealed": False, "standby": False}
+
+        # Every authentication method accepts whatever credentials it gets
+        if method == "POST" and path.startswith("/v1/auth/") and path.endswith("/login"):
+            return HTTPStatus.OK, {"auth": {"client_token": MOCK_TOKEN, "lease_duration": 3600, "renewable": True}}
+
+        mount_point, secret_path = self.__split(path)
+        if mount_point is None or method != "GET":
+            return HTTPStatus.NOT_FOUND, {"errors": []}
+
+        if any(fnmatch.fnmatchcase(f"{mount_point}/{secret_path}", pattern) for pattern in self.denied):
+            return HTTPStatus.FORBIDDEN, {"errors": ["1 error occurred:\n\t* permission denied\n\n"]}
+
+        if self.error_rate and self.__random.random() < self.error_rate:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"errors": ["injected error"]}
+
+        if secret_path not in self.secrets[mount_point]:
+            return HTTPStatus.NOT_FOUND, {"errors": []}
+
+        return HTTPStatus.OK, {
+            "request_id": str(uuid.UUID(int=self.__random.getrandbits(128))),
+            "lease_id": "",
+            "renewable": False,
+            "lease_duration": 0,
+            "data": {
+                "data": self.secrets[mount_point][secret_path],
+                "metadata": {"created_time": "2024-01-01T00:00:00Z", "deletion_time": "",
+                             "destroyed": False, "version": 1}
+            },
+            "wrap_info": None,
+            "warnings": None,
+            "auth": None
+        }
+
+    def __split(self, path):
+        """
+        Splits a '/v1/<mount>/data/<path>' request path into the mount point and the secret path.
+        """
+        for mount_point in self.__mounts:
+            prefix = f"/v1/{mount_point}/data/"
+            if path.startswith(prefix):
+                return mount_point, path[len(prefix):]
+        return None, None
+
+def main():
+    """
+    Runs the mock server until interrupted.
+    """
+
+    parser = argparse.ArgumentParser(description="Local Vault KV v2 mock server for resolution load tests.")
+    parser.add_argument('--fixture', required=True,
+                        help='JSON file with the secrets, shaped as {"<mount>": {"<path>": {"<field>": "<value>"}}}.')
+    parser.add_argument('--host', default="127.0.0.1", help='The address to listen on.')
+    parser.add_argument('--port', type=int, default=8200, help='The port to listen on.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Maximum random seconds added on top of the latency.')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Probability of answering a secret read with an internal error.')
+    parser.add_argument('--deny', action='append', default=[], metavar='GLOB',
+                        help="Answer the '<mount>/<path>' secrets matching the glob with permission denied.")
+    parser.add_argument('--seed', type=int, help='Seed of the random generator, for reproducible runs.')
+
+    args = parser.parse_args()
+
+    server = MockVaultServer.from_fixture(args.fixture, latency=args.latency, jitter=args.jitter,
+                                          error_rate=args.error_rate, denied=args.deny, seed=args.seed)
+
+    print(f"=== Mock Vault ===\n\nServing {args.fixture} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+from ..utils import configuration
+from ..utils.vault_http import VaultHttpClient, VaultHttpError
+from ..validator import grammar
+
+# The user home placeholder, as VaultConfiguration looks for it in the AppRole paths
+USER_HOME_PLACEHOLDER = "{% " + grammar.USER_HOME + " %}"
+
+# Default mount paths of the authentication methods, see VaultClientFactory
+DEFAULT_APPROLE_AUTH_NAME = "approle"
+DEFAULT_KUBERNETES_AUTH_NAME = "kubernetes"
+DEFAULT_KUBERNETES_SA_TOKEN_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/token"
+
+# The Vault settings as (attribute, appsettings key, environment variable), see VaultConfiguration.cs.
+# Like in the library, a non empty environment variable wins over the appsettings file.
+VAULT_SETTINGS = [
+    ("address", "vaultAddress", "VAULT_ADDR"),
+    ("mount_point", "mountPoint", "VAULT_MOUNTPOINT"),
+    ("skip_verify", "vaultSkipVerify", "VAULT_SKIP_VERIFY"),
+    ("approle_auth_name", "approleAuthName", "APPROLE_AUTH_NAME"),
+    ("role_id_path", "roleIdPath", "APPROLE_ROLE_ID_PATH"),
+    ("secret_id_path", "secretIdPath", "APPROLE_SECRET_ID_PATH"),
+    ("kubernetes_auth_name", "kubernetesAuthName", "VAULT_K8S_NAME"),
+    ("kubernetes_sa_role_name", "kubernetesSaRoleName", "VAULT_ROLE"),
+    ("kubernetes_sa_token_path", "kubernetesSaTokenPath", "SA_TOKEN_PATH"),
+]
+
+class ResolverError(Exception):
+    """
+    Raised when the configuration can't be materialised, with the same messages as
+    the VaultConfigurationSourceException thrown by the library.
+    """
+
+def fix_home_dir_path(file_path, environ=None):
+    """
+    Prefixes a path with the home directory, like VaultConfiguration.FixHomeDirPath.
+
+    Parameters:
+        - file_path (str): The path, without the user home placeholder.
+        - environ (dict|None): The environment variables, os.environ by default.
+
+    Returns:
+        - str: The path inside the home directory.
+    """
+    environ = os.environ if environ is None else environ
+    home = environ.get("HOME" if sys.platform.startswith("linux") else "USERPROFILE", "")
+    if file_path.startswith(os.sep):
+        return home + file_path
+    return home + os.sep + file_path
+
+def expand_user_home(value, environ=None):
+    """
+    Replaces the user home placeholder of a value by the home directory.
+
+    Parameters:
+        - value (str): The configuration value.
+        - environ (dict|None): The environment variables, os.environ by default.
+
+    Returns:
+        - str: The value, untouched when it has no user home placeholder.
+    """
+    if USER_HOME_PLACEHOLDER.upper() not in value.upper():
+        return value
+    return fix_home_dir_path(value.replace(USER_HOME_PLACEHOLDER, ""), environ)
+
+def expand_user_home_values(index, environ=None):
+    """
+    Replaces the user home placeholders of every value of a flattened configuration.
+    """
+    return {path: expand_user_home(value, environ) if isinstance(value, str) else value
+            for path, value in index.items()}
+
+class VaultSettings:
+    """
+    The Vault connection settings of a configuration, as VaultConfiguration reads them.
+
+    Attributes:
+        address (str|None): The Vault address.
+        mount_point (str|None): The mount point of the KV v2 secrets engine.
+        skip_verify (str|None): 'true' to skip the validation of the TLS certificate.
+        approle_auth_name (str|None): The AppRole authentication method name.
+        role_id_path (str|None): The file with the AppRole role ID.
+        secret_id_path (str|None): The file with the AppRole secret ID.
+        kubernetes_auth_name (str|None): The Kubernetes authentication method name.
+        kubernetes_sa_role_name (str|None): The Kubernetes service account role.
+        kubernetes_sa_token_path (str|None): The file with the Kubernetes service account token.
+    """
+
+    def __init__(self, **settings):
+        for attribute, _, _ in VAULT_SETTINGS:
+            setattr(self, attribute, settings.get(attribute))
+
+    @classmethod
+    def from_index(cls, index, environ=None):
+        """
+        Reads the settings of a flattened configuration, the environment variables first.
+
+        Parameters:
+            - index (dict): The configuration values keyed by path.
+            - environ (dict|None): The environment variables, os.environ by default.
+        """
+        environ = os.environ if environ is None else environ
+        settings = {}
+        for attribute, key, variable in VAULT_SETTINGS:
+            settings[attribute] = environ.get(variable) or \
+                configuration.get_value(index, "Vault" + configuration.KEY_DELIMITER + key)
+
+        # The AppRole paths may live in the home directory, but only when both are set
+        if settings["role_id_path"] and settings["secret_id_path"]:
+            for attribute in ("role_id_path", "secret_id_path"):
+                settings[attribute] = expand_user_home(settings[attribute], environ)
+
+        return cls(**settings)
+
+    @property
+    def is_complete(self):
+        """
+        Whether the library would materialise the placeholders, i.e. the address and an
+        authentication method are set.
+        """
+        return bool(self.address) and (bool(self.role_id_path and self.secret_id_path) or
+                                       bool(self.kubernetes_sa_role_name))
+
+class SecretCache:
+    """
+    A cache of the secrets read from Vault, so that reloads within the time to live don't
+    read them again. Failed reads are never cached. The secrets are keyed by the Vault address
+    as well, so that a cache shared by loaders of several Vault servers never mixes them up.
+
+    Attributes:
+        ttl (float): Seconds a secret is kept for.
+        hits (int): How many lookups were answered from the cache.
+        misses (int): How many lookups had to go to Vault.
+    """
+
+    def __init__(self, ttl=300.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__clock = clock
+        self.__entries = {}
+
+    def get(self, address, mount_point, path):
+        """
+        Gets a secret, None when it isn't cached or it expired.
+        """
+        entry = self.__entries.get((address, mount_point, path))
+        if entry is None or entry[0] <= self.__clock():
+            self.__entries.pop((address, mount_point, path), None)
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        return entry[1]
+
+    def put(self, address, mount_point, path, secret):
+        """
+        Caches a secret.
+        """
+        self.__entries[(address, mount_point, path)] = (self.__clock() + self.ttl, secret)
+
+    def clear(self):
+        """
+        Drops every cached secret.
+        """
+        self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+def _read_file(file_path):
+    """
+    Reads a credentials file, on a worker thread so that the event loop isn't blocked.
+    """
+    with open(file_path, "r") as file:
+        return file.read()
+
+def _to_string(value):
+    """
+    Converts a secret value to the string the configuration gets.
+    """
+    return value if isinstance(value, str) else json.dumps(value)
+
+class Resolver:
+    """
+    Materialises the placeholders of a flattened configuration like VaultConfigurationProvider.Load,
+    but reads each Vault path once per load, concurrently, and through a cache.
+
+    Attributes:
+        client (VaultHttpClient): The authenticated client used to reach Vault.
+        mount_point (str): The mount point of the KV v2 secrets engine.
+        cache (SecretCache): The secrets read on previous loads.
+        concurrency (int): How many paths are read at the same time.
+        expand_user_home (bool): Whether to replace the user home placeholders by the home directory,
+            which the library leaves as they are.
+        reads (int): How many paths were read from Vault.
+    """
+
+    def __init__(self, client, mount_point, cache=None, concurrency=16, expand_user_home=False, environ=None):
+        self.client = client
+        self.mount_point = mount_point
+        self.cache = cache if cache is not None else SecretCache()
+        self.concurrency = concurrency
+        self.expand_user_home = expand_user_home
+        self.reads = 0
+        self.__environ = environ
+
+    async def resolve(self, index):
+        """
+        Materialises the placeholders of a configuration.
+
+        Parameters:
+            - index (dict): The configuration values keyed by path.
+
+        Returns:
+            - dict: The configuration values keyed by path, with the secrets in place of the placeholders
+              and the keys of each vault_dict secret added below the path that holds it.
+
+        Raises:
+            - ResolverError: At the first placeholder, in load order, the library would fail on.
+        """
+        plan = self.plan(index)
+        secrets = await self.fetch({placeholder.path for _, placeholder in plan
+                                    if placeholder.outcome in (grammar.OUTCOME_SECRET, grammar.OUTCOME_DICT)})
+
+        data = {}
+        for path, placeholder in plan:
+            if placeholder.outcome == grammar.OUTCOME_UNPARSEABLE:
+                raise ResolverError(f"Could not parse the content of placeholder {placeholder.text} in config section {path}")
+
+            if placeholder.outcome == grammar.OUTCOME_BAD_SECRET_KEY:
+                raise ResolverError(f"Could not parse placeholder secret key '{placeholder.key}'")
+
+            if placeholder.outcome == grammar.OUTCOME_UNKNOWN_TYPE:
+                raise ResolverError(f"Unknown secret type '{placeholder.type}' in placeholder '{placeholder.text}'")
+
+            secret = secrets[placeholder.path]
+            if isinstance(secret, Exception):
+                raise self.__error(secret, placeholder)
+
+            if placeholder.outcome == grammar.OUTCOME_SECRET:
+                if placeholder.field not in secret:
+                    raise ResolverError(f"Unable to load secret from vault corresponding to key '{placeholder.key}': " +
+                                        f"Didn't find the required field {placeholder.field} at vault path {placeholder.path}")
+                data[path] = data.get(path, index[path]).replace(placeholder.text, _to_string(secret[placeholder.field]))
+            else:
+                # The value holding the dict placeholder is left as it is, like the library does
+                for key, value in secret.items():
+                    data[path + configuration.KEY_DELIMITER + key] = _to_string(value)
+
+        resolved = configuration.overlay(index, data)
+        return expand_user_home_values(resolved, self.__environ) if self.expand_user_home else resolved
+
+    @staticmethod
+    def plan(index):
+        """
+        Lists, in load order, the placeholders the library would act on. The provider goes through
+        the sections as GetChildren sorts them, not in the order of the documents.
+
+        Returns:
+            - list: (configuration path, Placeholder) pairs, the skipped and unrecognised ones left out.
+        """
+        plan = []
+        for path in sorted(index, key=configuration.sort_key):
+            value = index[path]
+            if not isinstance(value, str) or "{%" not in value:
+                continue
+            for placeholder in grammar.scan(value):
+                if placeholder.recognised and placeholder.outcome != grammar.OUTCOME_SKIPPED:
+                    plan.append((path, placeholder))
+        return plan
+
+    async def fetch(self, paths):
+        """
+        Reads a set of paths, each of them once and from the cache when possible.
+
+        Returns:
+            - dict: The secret of each path, or the exception raised while reading it.
+        """
+        secrets = {}
+        missing = []
+        for path in sorted(paths):
+            secret = self.cache.get(self.client.address, self.mount_point, path)
+            if secret is None:
+                missing.append(path)
+            else:
+                secrets[path] = secret
+
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def read(path):
+            async with slots:
+                self.reads = self.reads + 1
+                return await self.client.read_kv2(self.mount_point, path)
+
+        results = await asyncio.gather(*[read(path) for path in missing], return_exceptions=True)
+        for path, result in zip(missing, results):
+            if not isinstance(result, Exception):
+                self.cache.put(self.client.address, self.mount_point, path, result)
+            secrets[path] = result
+
+        return secrets
+
+    @staticmethod
+    def __error(exception, placeholder):
+        """
+        Translates a failed read into the error the library would throw.
+        """
+        if isinstance(exception, VaultHttpError):
+            if exception.permission_denied:
+                return ResolverError("Access to vault was denied, is the mountpoint correctly configured?")
+            kind = "secret" if placeholder.outcome == grammar.OUTCOME_SECRET else "dictionary"
+            return ResolverError(f"Unable to load {kind} from vault corresponding to key '{placeholder.key}': {exception}")
+        return ResolverError(f"Unable to connect to Vault: {exception}")
+
+class ConfigurationLoader:
+    """
+    Loads appsettings files and materialises their placeholders, the way a .NET service using
+    the Stratio Vault Library sees its configuration. Calling load again reloads the files,
+    reusing the Vault login and the secrets cached within their time to live.
+
+    Usage:
+        loader = ConfigurationLoader(["appsettings.json", "appsettings.Production.json"])
+        configuration = await loader.load()
+        await loader.close()
+
+    Attributes:
+        appsettings_files (list): The files, each one overlaid on top of the previous ones.
+        token (str|None): A Vault token to use instead of the AppRole or Kubernetes login.
+        cache (SecretCache): The secrets read on previous loads.
+        concurrency (int): How many paths are read at the same time.
+        expand_user_home (bool): Whether to replace the user home placeholders by the home directory.
+    """
+
+    def __init__(self, appsettings_files, token=None, ttl=300.0, concurrency=16, expand_user_home=False,
+                 environ=None, cache=None):
+        self.appsettings_files = appsettings_files
+        self.token = token
+        self.cache = cache if cache is not None else SecretCache(ttl)
+        self.concurrency = concurrency
+        self.expand_user_home = expand_user_home
+        self.__environ = os.environ if environ is None else environ
+        self.__client = None
+
+    def read_index(self):
+        """
+        Reads and overlays the appsettings files into a flattened configuration.
+        """
+        index = {}
+        for appsettings_file in self.appsettings_files:
+            with open(appsettings_file, "r") as file:
+                index = configuration.overlay(index, configuration.flatten(json.load(file)))
+        return index
+
+    async def load(self):
+        """
+        Loads the configuration.
+
+        Returns:
+            - dict: The materialised configuration values keyed by path.
+
+        Raises:
+            - ResolverError: If the configuration can't be materialised.
+        """
+        index = await asyncio.to_thread(self.read_index)
+        if not Resolver.plan(index):
+            return expand_user_home_values(index, self.__environ) if self.expand_user_home else index
+
+        settings = VaultSettings.from_index(index, self.__environ)
+        if not (settings.is_complete or (self.token and settings.address)):
+            raise ResolverError("Placeholders were found but the Vault configuration is not complete.")
+        if not settings.mount_point:
+            raise ResolverError(f"Vault mountpoint must be set, got '{settings.mount_point}'")
+
+        if self.__client is None:
+            self.__client = await self.login(settings)
+
+        resolver = Resolver(self.__client, settings.mount_point, self.cache, self.concurrency,
+                            self.expand_user_home, self.__environ)
+        return await resolver.resolve(index)
+
+    async def login(self, settings):
+        """
+        Creates the Vault client, trying the given token, then Kubernetes and AppRole like VaultClientFactory.
+
+        Returns:
+            - VaultHttpClient: The authenticated client.
+        """
+        client = VaultHttpClient(settings.address, self.token, verify=settings.skip_verify != "true",
+                                 max_connections=self.concurrency)
+        if self.token:
+            return client
+
+        reasons = []
+        if settings.kubernetes_sa_role_name:
+            token_path = settings.kubernetes_sa_token_path or DEFAULT_KUBERNETES_SA_TOKEN_PATH
+            if os.path.isfile(token_path):
+                jwt = await asyncio.to_thread(_read_file, token_path)
+                return await self.__login(client, settings.kubernetes_auth_name or DEFAULT_KUBERNETES_AUTH_NAME,
+                                          {"role": settings.kubernetes_sa_role_name, "jwt": jwt})
+            reasons.append(f"Kubernetes auth: Unable to find the Service Account token file at {token_path}")
+
+        if settings.role_id_path and settings.secret_id_path:
+            if os.path.isfile(settings.role_id_path) and os.path.isfile(settings.secret_id_path):
+                role_id = (await asyncio.to_thread(_read_file, settings.role_id_path)).strip()
+                secret_id = (await asyncio.to_thread(_read_file, settings.secret_id_path)).strip()
+                return await self.__login(client, settings.approle_auth_name or DEFAULT_APPROLE_AUTH_NAME,
+                                          {"role_id": role_id, "secret_id": secret_id})
+            reasons.append("AppRole auth: Either Secret or Role ID file does not exist")
+
+        await client.close()
+        raise ResolverError("Unable to connect to vault to retrieve configuration. " + " ".join(reasons))
+
+    async def close(self):
+        """
+        Closes the connections to Vault.
+        """
+        if self.__client is not None:
+            await self.__client.close()
+            self.__client = None
+
+    @staticmethod
+    async def __login(client, auth_name, credentials):
+        """
+        Logs in with an authentication method and keeps the token in the client.
+        """
+        try:
+            status, body = await client.request("POST", f"/v1/auth/{auth_name}/login", credentials)
+        except OSError as ex:
+            await client.close()
+            raise ResolverError(f"Unable to connect to Vault: {ex}") from ex
+
+        if status != 200:
+            await client.close()
+            raise ResolverError("Unable to connect to vault to retrieve configuration: " +
+                                str(VaultHttpError(status, (body or {}).get("errors", []))))
+
+        client.token = body["auth"]["client_token"]
+        return client
+
+def load(appsettings_files, **kwargs):
+    """
+    Loads appsettings files once, for the scripts that don't run an event loop.
+
+    Parameters:
+        - appsettings_files (list): The files, each one overlaid on top of the previous ones.
+        - kwargs: The options of ConfigurationLoader.
+
+    Returns:
+        - dict: The materialised configuration values keyed by path.
+    """
+    async def run():
+        loader = ConfigurationLoader(appsettings_files, **kwargs)
+        try:
+            return await loader.load()
+        finally:
+            await loader.close()
+
+    return asyncio.run(run())
@@ -0,0 +1,254 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import hashlib
+import json
+import os
+
+# Version of the partial report file layout
+PARTIAL_REPORT_VERSION = 2
+
+# Keys of the findings of a file, in the order they are stored in a partial report
+FINDING_KINDS = ("successes", "warnings", "failures")
+
+class ShardError(Exception):
+    """
+    Raised when a shard specification or a set of partial reports can't be used.
+    """
+
+def parse_shard(value):
+    """
+    Parses a shard specification.
+
+    Parameters:
+        - value (str): The shard as 'i/N', i going from 1 to N.
+
+    Returns:
+        - tuple: The shard index and the number of shards.
+
+    Raises:
+        - ShardError: If the specification isn't valid.
+    """
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ShardError(f"The shard '{value}' should be written as i/N, e.g. 1/4.") from None
+
+    if count < 1 or not 1 <= index <= count:
+        raise ShardError(f"The shard '{value}' should have 1 <= i <= N.")
+
+    return index, count
+
+def project_key(work_dir, project):
+    """
+    The key of a project is its directory relative to the work dir, '/' separated on every platform.
+    """
+    return os.path.relpath(project.directory, work_dir).replace(os.sep, "/")
+
+def shard_of(key, count):
+    """
+    Finds the shard a project belongs to. The hash doesn't depend on the platform, the Python
+    version or the projects around it, so every node agrees on the partition without talking.
+
+    Parameters:
+        - key (str): The project key.
+        - count (int): The number of shards.
+
+    Returns:
+        - int: The shard, from 1 to count.
+    """
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+class PartialReport:
+    """
+    The findings of the projects validated by one shard.
+
+    Each project keeps its position in the discovery order of the whole work dir, which is
+    what allows the merge to replay the findings in the same order as an unsharded run.
+
+    Attributes:
+        work_dir (str): The work dir as given to the linter, it is part of every file name.
+        shard (int): The shard index, from 1 to count.
+        count (int): The number of shards.
+        projects (list): [position, [[filename, successes, warnings, failures], ...]] entries.
+        complete (bool): Whether the shard validated every one of its projects. The project it stopped
+            at, if any, is in the projects with the findings found until then.
+        skipped (list): The keys of the projects of the shard that weren't looked at, see project_key.
+    """
+
+    def __init__(self, work_dir, shard, count, projects=None, complete=True, skipped=None):
+        self.work_dir = work_dir
+        self.shard = shard
+        self.count = count
+        self.projects = projects if projects is not None else []
+        self.complete = complete
+        self.skipped = skipped if skipped is not None else []
+
+    def add_project(self, position, filenames, validator_report):
+        """
+        Takes the findings of a project out of the validator report.
+
+        Parameters:
+            - position (int): The position of the project in the discovery order.
+            - filenames (list): The files of the project, in the order they were validated.
+            - validator_report (ValidatorReport): The report the files were validated into.
+        """
+        files = dict(validator_report.iter_files())
+        self.projects.append([position, [
+            [filename] + [files[filename][kind] for kind in FINDING_KINDS]
+            for filename in filenames if filename in files
+        ]])
+
+    def add_skipped(self, key):
+        """
+        Records a project of the shard that wasn't validated, e.g. because the time budget was spent.
+
+        Parameters:
+            - key (str): The project key.
+        """
+        self.complete = False
+        self.skipped.append(key)
+
+    def dumps(self):
+        """
+        Serialises the partial report in its compact form.
+        """
+        return json.dumps({"version": PARTIAL_REPORT_VERSION, "workDir": self.work_dir,
+                           "shard": [self.shard, self.count], "complete": self.complete,
+                           "skipped": self.skipped, "projects": self.projects},
+                          separators=(",", ":"), ensure_ascii=False)
+
+    def save(self, partial_report_file):
+        """
+        Writes the partial report.
+        """
+        with open(partial_report_file, "w", encoding="utf-8") as file:
+            file.write(self.dumps())
+
+    @classmethod
+    def load(cls, partial_report_file):
+        """
+        Loads a partial report.
+
+        Raises:
+            - ShardError: If the file can't be read, is malformed or wasn't written by this version of the linter.
+        """
+        try:
+            with open(partial_report_file, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as ex:
+            raise ShardError(f"The partial report '{partial_report_file}' can't be read: {ex}") from None
+
+        if not isinstance(data, dict) or data.get("version") != PARTIAL_REPORT_VERSION:
+            raise ShardError(f"The partial report '{partial_report_file}' has an unsupported layout.")
+
+        if not _is_valid(data):
+            raise ShardError(f"The partial report '{partial_report_file}' is malformed or truncated.")
+
+        shard, count = data["shard"]
+        return cls(data["workDir"], shard, count, data["projects"], data["complete"], data["skipped"])
+
+def _is_entry(entry):
+    """
+    Tells whether a finding of a partial report is an [item, message] pair.
+    """
+    return isinstance(entry, list) and len(entry) == 2 and all(isinstance(value, str) for value in entry)
+
+def _is_file(file):
+    """
+    Tells whether a file of a partial report is a [filename, successes, warnings, failures] entry.
+    """
+    return isinstance(file, list) and len(file) == 1 + len(FINDING_KINDS) and isinstance(file[0], str) and \
+        all(isinstance(entries, list) and all(_is_entry(entry) for entry in entries) for entries in file[1:])
+
+def _is_valid(data):
+    """
+    Checks the structure of a partial report, down to every finding, so that a broken file
+    is told apart before the merge replays anything.
+    """
+    shard = data.get("shard")
+    if not isinstance(data.get("workDir"), str) or not isinstance(shard, list) or len(shard) != 2 or \
+            not all(type(value) is int for value in shard) or not 1 <= shard[0] <= shard[1]:
+        return False
+
+    if not isinstance(data.get("complete"), bool) or not isinstance(data.get("skipped"), list) or \
+            not all(isinstance(key, str) for key in data["skipped"]):
+        return False
+
+    projects = data.get("projects")
+    return isinstance(projects, list) and all(
+        isinstance(project, list) and len(project) == 2 and type(project[0]) is int and
+        isinstance(project[1], list) and all(_is_file(file) for file in project[1])
+        for project in projects)
+
+def merge(partial_reports, validator_report):
+    """
+    Replays the findings of a complete set of partial reports into a validator report,
+    in the order an unsharded run would have added them. The findings of the shards that
+    stopped early are replayed as well, see incomplete_shards.
+
+    Parameters:
+        - partial_reports (list): The PartialReport of every shard.
+        - validator_report (ValidatorReport): The report the findings are added to.
+
+    Returns:
+        - str: The work dir the shards were run on.
+
+    Raises:
+        - ShardError: If the partial reports don't come from the same run, or some shard is missing.
+    """
+    if not partial_reports:
+        raise ShardError("No partial reports were given.")
+
+    first = partial_reports[0]
+    for partial_report in partial_reports:
+        if partial_report.work_dir != first.work_dir or partial_report.count != first.count:
+            raise ShardError("The partial reports come from runs with different work dirs or shard counts.")
+
+    shards = sorted(partial_report.shard for partial_report in partial_reports)
+    if shards != list(range(1, first.count + 1)):
+        raise ShardError(f"Expected one partial report for each of the shards 1 to {first.count}, " +
+                         f"got shards {', '.join(map(str, shards))}.")
+
+    projects = sorted((project for partial_report in partial_reports for project in partial_report.projects),
+                      key=lambda project: project[0])
+
+    adders = (validator_report.add_success, validator_report.add_warning, validator_report.add_failure)
+    for _, files in projects:
+        for filename, *findings in files:
+            validator_report.add_file(filename)
+            for add, entries in zip(adders, findings):
+                for item, message in entries:
+                    add(filename, item, message)
+
+    return first.work_dir
+
+def incomplete_shards(partial_reports):
+    """
+    Finds the shards that didn't validate every one of their projects.
+
+    Parameters:
+        - partial_reports (list): The PartialReport of every shard.
+
+    Returns:
+        - list: The incomplete PartialReport objects, by shard.
+    """
+    return sorted((partial_report for partial_report in partial_reports if not partial_report.complete),
+                  key=lambda partial_report: partial_report.shard)
@@ -0,0 +1,133 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import re
+
+# Separator used by Microsoft.Extensions.Configuration between the keys of a path
+KEY_DELIMITER = ":"
+
+# The keys ConfigurationKeyComparer compares as numbers, i.e. the ones int.TryParse accepts
+_INTEGER_KEY = re.compile(r"\s*[+-]?[0-9]+\s*")
+
+def flatten(data):
+    """
+    Flattens an appsettings document into the 'Section:Path -> value' pairs seen by the
+    .NET configuration system, which is what VaultConfigurationProvider iterates over.
+
+    Objects contribute their keys and arrays their indexes to the path, while empty
+    objects and arrays are kept as a path without a value (None), like the .NET JSON parser does.
+
+    Parameters:
+        - data (dict): The parsed appsettings file.
+
+    Returns:
+        - dict: The configuration values keyed by path, in document order.
+    """
+    index = {}
+    if not isinstance(data, dict):
+        return index
+
+    stack = [(None, data)]
+    while stack:
+        path, node = stack.pop()
+
+        if isinstance(node, dict):
+            children = list(node.items())
+        elif isinstance(node, list):
+            children = [(str(position), child) for position, child in enumerate(node)]
+        else:
+            index[path] = node
+            continue
+
+        if not children:
+            if path is not None:
+                index[path] = None
+            continue
+
+        # Reversed so that the stack pops the children in document order
+        for key, child in reversed(children):
+            stack.append((key if path is None else path + KEY_DELIMITER + key, child))
+
+    return index
+
+def overlay(base, override):
+    """
+    Overlays the flattened values of an environment file on top of the base ones.
+    Like in .NET, the paths are compared case insensitively and the last file wins.
+
+    Parameters:
+        - base (dict): The flattened base appsettings file.
+        - override (dict): The flattened environment specific appsettings file.
+
+    Returns:
+        - dict: The effective configuration values keyed by path.
+    """
+    merged = dict(base)
+    paths = {path.lower(): path for path in base}
+
+    for path, value in override.items():
+        existing = paths.get(path.lower())
+        if existing is not None and existing != path:
+            del merged[existing]
+        paths[path.lower()] = path
+        merged[path] = value
+
+    return merged
+
+def _compared_key(key):
+    """
+    How ConfigurationKeyComparer sees a key: numbers come first and by value, then the
+    other keys by their upper cased form, like an OrdinalIgnoreCase comparison.
+    """
+    if _INTEGER_KEY.fullmatch(key):
+        number = int(key)
+        if -2**31 <= number < 2**31:
+            return (0, number, "")
+    return (1, 0, key.upper())
+
+def sort_key(path):
+    """
+    The key that sorts the paths of a flattened configuration in the order GetChildren returns
+    them at each level, i.e. the order in which VaultConfigurationProvider goes through them.
+
+    Parameters:
+        - path (str): The path of a value, e.g. 'Kafka:Brokers:0'.
+
+    Returns:
+        - list: The comparable form of each key of the path.
+    """
+    return [_compared_key(key) for key in path.split(KEY_DELIMITER)]
+
+def get_value(index, path, default=None):
+    """
+    Gets a value from a flattened configuration, comparing the paths case insensitively.
+
+    Parameters:
+        - index (dict): The flattened configuration.
+        - path (str): The path of the value, e.g. 'Vault:mountPoint'.
+        - default: The value returned when the path doesn't exist.
+    """
+    if path in index:
+        return index[path]
+
+    lowered = path.lower()
+    for candidate, value in index.items():
+        if candidate.lower() == lowered:
+            return value
+
+    return default
@@ -0,0 +1,197 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import asyncio
+import json
+import ssl
+from urllib.parse import quote, urlsplit
+
+
+class VaultHttpError(Exception):
+    """
+    Raised when Vault answers a request with an error status.
+
+    Attributes:
+        status (int): The HTTP status code.
+        errors (list): The error messages sent by Vault.
+    """
+
+    def __init__(self, status, errors):
+        super().__init__(f"Vault answered with status {status}: {'; '.join(errors) or 'no details'}")
+        self.status = status
+        self.errors = errors
+
+    @property
+    def permission_denied(self):
+        """
+        Whether Vault denied the access, which usually means a wrong mount point or policy.
+        """
+        return self.status == 403 or any("permission denied" in error for error in self.errors)
+
+class VaultHttpClient:
+    """
+    A minimal asyncio HTTP/1.1 client for the Vault API, with keep-alive connections.
+
+    It only relies on the standard library so that the linter doesn't grow new dependencies.
+
+    Attributes:
+        address (str): The Vault address, e.g. 'https://vault.my-org.com:8200'.
+        token (str|None): The Vault token sent on every request.
+    """
+
+    def __init__(self, address, token=None, verify=True, max_connections=16):
+        """
+        Initialize the client.
+
+        Args:
+            address (str): The Vault address.
+            token (str|None): The Vault token sent on every request.
+            verify (bool): Whether to validate the TLS certificate of the server.
+            max_connections (int): How many connections may be open at the same time.
+        """
+        url = urlsplit(address)
+        self.address = address
+        self.token = token
+        self.__host = url.hostname or "127.0.0.1"
+        self.__port = url.port or (443 if url.scheme == "https" else 80)
+        self.__base_path = url.path.rstrip("/")
+        self.__ssl = None
+        if url.scheme == "https":
+            self.__ssl = ssl.create_default_context()
+            if not verify:
+                self.__ssl.check_hostname = False
+                self.__ssl.verify_mode = ssl.CERT_NONE
+        self.__idle = []
+        self.__slots = asyncio.Semaphore(max_connections)
+
+    async def request(self, method, path, body=None):
+        """
+        Sends a request to Vault.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The API path, e.g. '/v1/sys/health'.
+            body (dict|None): The JSON body of the request.
+
+        Returns:
+            tuple: The status code and the decoded JSON body (None when empty).
+
+        Raises:
+            VaultHttpError: If the body of the response isn't JSON.
+        """
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        headers = [
+            f"{method} {self.__base_path}{path} HTTP/1.1",
+            f"Host: {self.__host}:{self.__port}",
+            "Accept: application/json",
+            f"Content-Length: {len(payload)}",
+        ]
+        if self.token:
+            headers.append(f"X-Vault-Token: {self.token}")
+        if payload:
+            headers.append("Content-Type: application/json")
+        message = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload
+
+        async with self.__slots:
+            # A kept-alive connection may have been closed by the server, retry once on a new one
+            for attempt in range(2):
+                reused = bool(self.__idle)
+                reader, writer = self.__idle.pop() if reused else \
+                    await asyncio.open_connection(self.__host, self.__port, ssl=self.__ssl)
+                keep_alive = False
+                try:
+                    writer.write(message)
+                    await writer.drain()
+                    status, keep_alive, content = await _read_response(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                finally:
+                    # Whatever went wrong, e.g. a timeout or a cancellation, the connection isn't reused
+                    if keep_alive:
+                        self.__idle.append((reader, writer))
+                    else:
+                        writer.close()
+
+                try:
+                    return status, json.loads(content) if content.strip() else None
+                except ValueError as ex:
+                    raise VaultHttpError(status, [f"The response isn't valid JSON: {ex}"]) from ex
+
+    async def read_kv2(self, mount_point, path):
+        """
+        Reads a KV v2 secret.
+
+        Args:
+            mount_point (str): The mount point of the secrets engine.
+            path (str): The path of the secret.
+
+        Returns:
+            dict: The key/value pairs of the secret.
+
+        Raises:
+            VaultHttpError: If the secret couldn't be read.
+        """
+        status, data = await self.request("GET", f"/v1/{quote(mount_point)}/data/{quote(path)}")
+        if status != 200:
+            raise VaultHttpError(status, (data or {}).get("errors", []))
+        return data["data"]["data"]
+
+    async def close(self):
+        """
+        Closes all the idle connections.
+        """
+        while self.__idle:
+            _, writer = self.__idle.pop()
+            writer.close()
+
+async def _read_response(reader):
+    """
+    Reads an HTTP/1.1 response, supporting both fixed length and chunked bodies.
+
+    Returns:
+        tuple: The status code, whether the connection can be reused and the body.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("The connection was closed by the server")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        content = b""
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            content += await reader.readexactly(size)
+            await reader.readline()
+    else:
+        content = await reader.readexactly(int(headers.get("content-length", "0")))
+
+    keep_alive = headers.get("connection", "").lower() != "close"
+    return status, keep_alive, content
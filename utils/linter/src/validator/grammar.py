@@ -0,0 +1,227 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import re
+
+# The supported types of placeholders, see PlaceholderTypes.cs
+VAULT_SECRET = "vault_secret"
+VAULT_DICT = "vault_dict"
+USER_HOME = "user_home"
+
+#
+# Outcomes of VaultConfigurationProvider for each placeholder
+#
+OUTCOME_SECRET = "secret"              # Materialized with GetVaultSecret
+OUTCOME_DICT = "dict"                  # Materialized with GetVaultDict
+OUTCOME_SKIPPED = "skipped"            # Contains user_home, left as it is
+OUTCOME_UNPARSEABLE = "unparseable"    # Not exactly a type and a key, the startup fails
+OUTCOME_BAD_SECRET_KEY = "bad-key"     # vault_secret key isn't <path>:<field>, the startup fails
+OUTCOME_UNKNOWN_TYPE = "unknown-type"  # Neither vault_secret nor vault_dict, the startup fails
+
+# Characters that stop the placeholder body in the provider expression {%[^(%})]*%}
+_BODY_STOPS = ("(", ")", "}")
+
+# Characters matched by \s in .NET regular expressions, i.e. [\f\n\r\t\v\x85\p{Z}].
+# Python's \s and str.isspace() differ, e.g. on the \x1c-\x1f separators.
+DOTNET_SPACES = "\f\n\r\t\v\x85 \xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006" + \
+                "\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+
+# Same expression as TryGetPlaceholderTypeAndKey, [^\s{%}]+, with the .NET meaning of \s
+_FIELDS_PATTERN = re.compile("[^" + re.escape(DOTNET_SPACES) + "{%}]+")
+
+def _spans(value):
+    """
+    Scans a string in linear time for the placeholders the provider would find.
+
+    Yields:
+        tuple: (start, end, recognised) for every '{%', recognised being False for the ones
+        that don't start a placeholder and are left as they are by the provider.
+    """
+    length = len(value)
+    closing = -2
+    start = value.find("{%")
+    while start != -1:
+        # The body can't have a '%', so the first '%' after the opening must be the closing one
+        percent = value.find("%", start + 2)
+        if percent == -1:
+            yield start, length, False
+            return
+
+        if percent + 1 < length and value[percent + 1] == "}":
+            body = value[start + 2:percent]
+            if not any(stop in body for stop in _BODY_STOPS):
+                yield start, percent + 2, True
+                start = value.find("{%", percent + 2)
+                continue
+
+        # No '{%' can start between here and the '%' that broke the match, except right before it
+        following = value.find("{%", max(start + 1, percent - 1))
+
+        # The fragment reported ends at the next '%}', looked up again only once it's behind us
+        if closing != -1 and closing < start + 2:
+            closing = value.find("%}", start + 2)
+        end = length if closing == -1 else closing + 2
+        yield start, end if following == -1 else min(end, following), False
+        start = following
+
+def _spans_list(value):
+    """
+    Same as _spans, with a fast path for the values holding only well formed placeholders.
+    """
+    spans = []
+    start = value.find("{%")
+    while start != -1:
+        percent = value.find("%", start + 2)
+        if percent == -1 or value[percent + 1:percent + 2] != "}":
+            break
+        body = value[start + 2:percent]
+        if "(" in body or ")" in body or "}" in body:
+            break
+        spans.append((start, percent + 2, True))
+        start = value.find("{%", percent + 2)
+    else:
+        return spans
+
+    # Something isn't well formed, the general scanner starts over
+    return list(_spans(value))
+
+def find_placeholders(value):
+    """
+    Finds the placeholders of a configuration value, exactly like
+    VaultConfigurationProvider.GetPlaceholdersInString does with {%[^(%})]*%}.
+
+    Parameters:
+        - value (str): The configuration value.
+
+    Returns:
+        - list: The placeholders found, in order.
+    """
+    if "{%" not in value:
+        return []
+    return [value[start:end] for start, end, recognised in _spans_list(value) if recognised]
+
+def split_fields(placeholder):
+    """
+    Splits a placeholder into its fields, exactly like VaultConfigurationProvider.TryGetPlaceholderTypeAndKey
+    does with [^\\s{%}]+.
+
+    Parameters:
+        - placeholder (str): The placeholder, including the '{%' and '%}' delimiters.
+
+    Returns:
+        - list: The fields of the placeholder.
+    """
+    return _FIELDS_PATTERN.findall(placeholder)
+
+class Placeholder:
+    """
+    A placeholder as understood by VaultConfigurationProvider.
+
+    Attributes:
+        text (str): The placeholder as written, or the unrecognised fragment.
+        recognised (bool): Whether the provider finds it as a placeholder at all.
+        fields (list): The whitespace separated fields.
+        outcome (str|None): What the provider does with it, None when it isn't recognised.
+        type (str|None): The placeholder type, when there are exactly two fields.
+        key (str|None): The placeholder key, when there are exactly two fields.
+        path (str|None): The Vault path read, for the secret and dict outcomes.
+        field (str|None): The Vault field read, for the secret outcome.
+    """
+
+    __slots__ = ("field", "fields", "key", "outcome", "path", "recognised", "text", "type")
+
+    def __init__(self, text, recognised=True):
+        self.text = text
+        self.recognised = recognised
+        self.fields = split_fields(text) if recognised else []
+        self.type = self.key = self.path = self.field = None
+        self.outcome = self.__outcome() if recognised else None
+
+    def __repr__(self):
+        return f"Placeholder({self.text!r}, outcome={self.outcome!r})"
+
+    @property
+    def content(self):
+        """
+        The placeholder without its delimiters and surrounding spaces, e.g. 'vault_dict path/to/secret'.
+        """
+        return self.text[2:-2].strip() if self.recognised else self.text
+
+    def __outcome(self):
+        # The user home check comes first and is case insensitive, see MaterializePlaceholdersInSection
+        if USER_HOME.upper() in self.text.upper():
+            return OUTCOME_SKIPPED
+
+        if len(self.fields) != 2:
+            return OUTCOME_UNPARSEABLE
+        self.type, self.key = self.fields
+
+        if self.type == VAULT_SECRET:
+            path_and_field = self.key.split(":")
+            if len(path_and_field) != 2:
+                return OUTCOME_BAD_SECRET_KEY
+            self.path, self.field = path_and_field
+            return OUTCOME_SECRET
+
+        if self.type == VAULT_DICT:
+            self.path = self.key
+            return OUTCOME_DICT
+
+        return OUTCOME_UNKNOWN_TYPE
+
+def scan(value):
+    """
+    Scans a configuration value for placeholders, including the '{%' fragments the provider
+    doesn't recognise as placeholders and would silently leave as they are.
+
+    Parameters:
+        - value (str): The configuration value.
+
+    Returns:
+        - list: The Placeholder objects found, in order.
+    """
+    if "{%" not in value:
+        return []
+    return [Placeholder(value[start:end], recognised) for start, end, recognised in _spans_list(value)]
+
+def _collect(node, placeholders):
+    """
+    Collects the placeholders of every string value below a node, in document order.
+    """
+    for value in node.values() if isinstance(node, dict) else node:
+        if isinstance(value, str):
+            if "{%" in value:
+                placeholders.extend(scan(value))
+        elif isinstance(value, (dict, list)):
+            _collect(value, placeholders)
+
+def scan_document(data):
+    """
+    Scans every string value of an appsettings document for placeholders. Like the provider,
+    only the values are looked at, never the keys.
+
+    Parameters:
+        - data (dict|list): The parsed appsettings document, or a part of it.
+
+    Returns:
+        - list: The Placeholder objects found, in document order.
+    """
+    placeholders = []
+    if isinstance(data, (dict, list)):
+        _collect(data, placeholders)
+    return placeholders
@@ -0,0 +1,147 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import sys
+
+# File that contains helping methods
+from ..utils import helper
+
+# Order, label and color in which each kind of finding is rendered
+SECTIONS = [
+    ("failures", "Failure", "red"),
+    ("warnings", "Warning", "yellow"),
+    ("successes", "Success", "green"),
+]
+
+class StreamingReportRenderer:
+    """
+    Renders the validator report line by line, as an alternative to the rich tables
+    that become slow and unreadable with thousands of findings.
+
+    Nothing is accumulated while rendering, and the findings that fall outside the
+    requested page or over the per file cap are skipped without being visited, so the
+    cost depends on what is printed and not on the size of the report.
+
+    Attributes:
+        output (file): Where the report is written to.
+        max_findings_per_file (int|None): Maximum findings rendered for each file.
+        summary_only (bool): Whether to render only the counters of each file.
+        page_size (int|None): How many findings are rendered per page, None for a single page.
+        page (int): The page to render, starting at 1.
+    """
+
+    def __init__(self, output=None, max_findings_per_file=None, summary_only=False, page_size=None, page=1):
+        self.output = output or sys.stdout
+        self.max_findings_per_file = max_findings_per_file
+        self.summary_only = summary_only
+        self.page_size = page_size
+        self.page = page
+
+    def render(self, validator_report):
+        """
+        Renders the report.
+
+        Args:
+            validator_report (ValidatorReport): The report to be rendered.
+
+        Returns:
+            int: The number of findings rendered.
+        """
+        if self.summary_only:
+            return self.render_summary(validator_report)
+
+        # The window of findings, numbered across all files, that belongs to the requested page
+        first = (self.page - 1) * self.page_size if self.page_size else 0
+        last = first + self.page_size if self.page_size else None
+
+        position = 0
+        rendered = 0
+        for filename, report_data in validator_report.iter_files():
+            counts = [len(report_data[key]) for key, _, _ in SECTIONS]
+            visible = sum(counts)
+            if self.max_findings_per_file is not None:
+                visible = min(visible, self.max_findings_per_file)
+
+            # Files entirely before or after the page are only counted, their findings aren't visited
+            start = max(first - position, 0)
+            end = visible if last is None else min(last - position, visible)
+            position = position + visible
+            if start >= end:
+                continue
+
+            self.__write(f"\nAppsettings file: {filename}")
+            self.__write(f"Successes: {counts[2]}, Warnings: {counts[1]}, Failures: {counts[0]}")
+
+            for label, color, item, message in self.__findings(report_data, start, end):
+                self.__write(helper.color_text(f"  {label} - {item}: {message}", color))
+                rendered = rendered + 1
+
+            hidden = sum(counts) - visible
+            if hidden > 0 and end == visible:
+                self.__write(f"  ... {hidden} more findings not shown")
+
+        if self.page_size:
+            total_pages = max(1, -(-position // self.page_size))
+            self.__write(f"\nPage {self.page} of {total_pages} ({position} findings)")
+
+        return rendered
+
+    def render_summary(self, validator_report):
+        """
+        Renders one line with the counters of each file, and the totals.
+
+        Args:
+            validator_report (ValidatorReport): The report to be rendered.
+
+        Returns:
+            int: Always 0, no findings are rendered.
+        """
+        totals = [0, 0, 0]
+        files = 0
+        for filename, report_data in validator_report.iter_files():
+            counts = [len(report_data[key]) for key, _, _ in SECTIONS]
+            totals = [total + count for total, count in zip(totals, counts)]
+            files = files + 1
+
+            color = "red" if counts[0] else "yellow" if counts[1] else "green"
+            self.__write(helper.color_text(
+                f"{filename}: Successes: {counts[2]}, Warnings: {counts[1]}, Failures: {counts[0]}", color))
+
+        self.__write(f"\nFiles: {files}, Successes: {totals[2]}, Warnings: {totals[1]}, Failures: {totals[0]}")
+        return 0
+
+    @staticmethod
+    def __findings(report_data, start, end):
+        """
+        Yields the findings of a file between two positions, failures first,
+        slicing each list instead of walking through the skipped findings.
+        """
+        offset = 0
+        for key, label, color in SECTIONS:
+            entries = report_data[key]
+            for item, message in entries[max(start - offset, 0):max(end - offset, 0)]:
+                yield label, color, item, message
+            offset = offset + len(entries)
+            if offset >= end:
+                return
+
+    def __write(self, line):
+        """
+        Writes a line to the output.
+        """
+        self.output.write(line + "\n")
@@ -0,0 +1,142 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import fnmatch
+import re
+
+#
+# Placeholder syntax rules
+#
+VAULT_SECRET_SYNTAX = "vault-secret-syntax"
+VAULT_DICT_SYNTAX = "vault-dict-syntax"
+USER_HOME_SYNTAX = "user-home-syntax"
+
+#
+# Vault object field rules
+#
+VAULT_ADDRESS = "vault-address"
+MOUNT_POINT = "mount-point"
+APPROLE_AUTH_NAME = "approle-auth-name"
+ROLE_ID_PATH = "role-id-path"
+SECRET_ID_PATH = "secret-id-path"
+KUBERNETES_AUTH_NAME = "kubernetes-auth-name"
+KUBERNETES_SA_ROLE_NAME = "kubernetes-sa-role-name"
+KUBERNETES_SA_TOKEN_PATH = "kubernetes-sa-token-path"
+
+#
+# Rules that aren't pattern based
+#
+INVALID_JSON = "invalid-json"
+MISSING_BASE_FILE = "missing-base-file"
+VAULT_SECTION_MISSING = "vault-section-missing"
+PLACEHOLDER_UNRECOGNISED = "placeholder-unrecognised"
+PLACEHOLDER_UNPARSEABLE = "placeholder-unparseable"
+USER_HOME_SKIPPED = "user-home-skipped"
+UNKNOWN_PLACEHOLDER_TYPE = "unknown-placeholder-type"
+ENVIRONMENT_PLACEHOLDER = "environment-placeholder"
+
+# The rules run on the placeholders of the base and of the environment files
+BASE_PLACEHOLDER_RULES = frozenset([
+    VAULT_SECRET_SYNTAX, VAULT_DICT_SYNTAX, USER_HOME_SYNTAX, PLACEHOLDER_UNRECOGNISED,
+    PLACEHOLDER_UNPARSEABLE, USER_HOME_SKIPPED, UNKNOWN_PLACEHOLDER_TYPE,
+])
+ENVIRONMENT_PLACEHOLDER_RULES = BASE_PLACEHOLDER_RULES | frozenset([ENVIRONMENT_PLACEHOLDER])
+
+# The rules run on the Vault object
+VAULT_OBJECT_RULES = frozenset([
+    VAULT_SECTION_MISSING, VAULT_ADDRESS, MOUNT_POINT, APPROLE_AUTH_NAME, ROLE_ID_PATH, SECRET_ID_PATH,
+    KUBERNETES_AUTH_NAME, KUBERNETES_SA_ROLE_NAME, KUBERNETES_SA_TOKEN_PATH,
+])
+
+# Every rule, in the order they are documented
+ALL_RULES = (
+    INVALID_JSON, MISSING_BASE_FILE,
+    VAULT_SECRET_SYNTAX, VAULT_DICT_SYNTAX, USER_HOME_SYNTAX, PLACEHOLDER_UNRECOGNISED, PLACEHOLDER_UNPARSEABLE,
+    USER_HOME_SKIPPED, UNKNOWN_PLACEHOLDER_TYPE, ENVIRONMENT_PLACEHOLDER,
+    VAULT_SECTION_MISSING, VAULT_ADDRESS, MOUNT_POINT, APPROLE_AUTH_NAME, ROLE_ID_PATH, SECRET_ID_PATH,
+    KUBERNETES_AUTH_NAME, KUBERNETES_SA_ROLE_NAME, KUBERNETES_SA_TOKEN_PATH,
+)
+
+# Patterns shared by more than one rule
+_AUTH_NAME_PATTERN = r'^(?!.*--)(?!-.*)([a-zA-Z0-9-]*)$'
+_FILE_PATH_PATTERN = r'^({% user_home %}){0,1}([\/]*[a-zA-Z0-9_\-\.]+)+(.[a-zA-Z]+?)$'
+
+# The regular expression behind each of the pattern based rules
+PATTERNS = {
+    VAULT_SECRET_SYNTAX: re.compile(
+        r'^vault_secret\s+([_a-zA-Z]+(?:[-\/][_a-zA-Z]+)*):([_a-zA-Z]+(?:[-\/][_a-zA-Z]+)*)$'),
+    VAULT_DICT_SYNTAX: re.compile(r'^vault_dict\s+([_a-zA-Z]+(?:[-\/][_a-zA-Z]+)*)$'),
+    USER_HOME_SYNTAX: re.compile(r'^user_home$'),
+    MOUNT_POINT: re.compile(
+        r'^(?!.*--)(?!.*\/\/)(?!.*-\/)(?!.*\/-)(?!-.*)(?!\/.*)([a-zA-Z0-9-]*\/)*[a-zA-Z0-9-]+$'),
+    APPROLE_AUTH_NAME: re.compile(_AUTH_NAME_PATTERN),
+    ROLE_ID_PATH: re.compile(_FILE_PATH_PATTERN),
+    SECRET_ID_PATH: re.compile(_FILE_PATH_PATTERN),
+    KUBERNETES_AUTH_NAME: re.compile(_AUTH_NAME_PATTERN),
+    KUBERNETES_SA_ROLE_NAME: re.compile(_AUTH_NAME_PATTERN),
+    KUBERNETES_SA_TOKEN_PATH: re.compile(_FILE_PATH_PATTERN),
+}
+
+def evaluate(rule, value):
+    """
+    Computes the verdict of a rule for a given value, without any memoisation.
+
+    Parameters:
+        - rule (str): The identifier of the rule to be evaluated.
+        - value (str): The value to be checked against the rule.
+
+    Returns:
+        - bool: True if the value complies with the rule, False otherwise.
+    """
+    if rule == VAULT_ADDRESS:
+        # validators takes longer to import than linting a file, so it's only loaded when an address is checked
+        import validators
+        return bool(validators.url(value))
+
+    return PATTERNS[rule].match(value) is not None
+
+def _expand(patterns):
+    """
+    Expands rule IDs and globs such as 'vault-*' into the rules they match.
+    """
+    selected = set()
+    for pattern in patterns:
+        matched = fnmatch.filter(ALL_RULES, pattern)
+        if not matched:
+            raise ValueError(f"Unknown rule '{pattern}', the rules are: {', '.join(ALL_RULES)}.")
+        selected.update(matched)
+    return selected
+
+def select_rules(select=None, ignore=None):
+    """
+    Works out which rules run, from the selected and the ignored rule IDs or globs.
+
+    Parameters:
+        - select (list|None): The rules to run, all of them when empty.
+        - ignore (list|None): The rules not to run, even if selected.
+
+    Returns:
+        - frozenset|None: The enabled rules, None when all of them are.
+
+    Raises:
+        - ValueError: If a rule ID or glob doesn't match any rule.
+    """
+    if not select and not ignore:
+        return None
+    enabled = _expand(select) if select else set(ALL_RULES)
+    return frozenset(enabled - _expand(ignore or []))
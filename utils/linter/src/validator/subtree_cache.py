@@ -0,0 +1,207 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import hashlib
+import json
+import os
+
+# Version of the cache file layout, and of the findings it holds
+SUBTREE_CACHE_VERSION = 3
+
+#
+# Parts of an appsettings file that are cached separately
+#
+PART_PLACEHOLDERS = "placeholders"  # Every value but the Vault object, see Validator.find_placeholders
+PART_VAULT = "vault"                # The Vault object, see Validator.validate_vault_object
+
+def subtree_hash(node, hashes=None):
+    """
+    Hashes a subtree of an appsettings document bottom-up, like a Merkle tree: each object and
+    array is hashed from its own values and the digests of the objects and arrays nested in it,
+    so every value is encoded once whatever the depth. The order of the keys is part of the hash,
+    since it is the order of the findings.
+
+    Parameters:
+        - node (dict|list): The parsed JSON object or array, any other value is hashed as is.
+        - hashes (dict|None): Gets the digest of the node and of every object and array nested in it,
+          keyed by their id().
+
+    Returns:
+        - str: The hexadecimal digest.
+    """
+    subtree = node
+    if isinstance(node, dict):
+        nested = [key for key, value in node.items() if isinstance(value, (dict, list))]
+        if nested:
+            node = dict(node)
+    elif isinstance(node, list):
+        nested = [index for index, value in enumerate(node) if isinstance(value, (dict, list))]
+        if nested:
+            node = list(node)
+    else:
+        nested = []
+
+    # The nested objects and arrays are replaced by their digest, a {"#": digest} object can't be
+    # mistaken for a value since the values that are objects are replaced as well. The repr() of
+    # parsed JSON tells apart every type and keeps the order of the keys
+    for key in nested:
+        node[key] = {"#": subtree_hash(node[key], hashes)}
+
+    # A digest is only compared with the one of the same subtree in the previous run, 64 bits are
+    # plenty and keep the cache file small
+    digest = hashlib.sha256(repr(node).encode()).hexdigest()[:16]
+    if hashes is not None:
+        hashes[id(subtree)] = digest
+    return digest
+
+class SubtreeCache:
+    """
+    The findings of the previous run for each subtree of each appsettings file, so that a
+    run only revalidates the subtrees that changed since then.
+
+    Each object and array is kept as a node shaped as [<subtree_hash>, [[key, findings, node], ...], counts],
+    listing in document order the string values with findings and the nested objects and arrays,
+    and counting the placeholders of the whole subtree by type for the statistics of the run.
+    The subtrees without any finding leave the list empty, and the ones without any placeholder
+    either are kept as [<subtree_hash>] alone. Each finding is a [kind, item] pair, the kinds being
+    the (severity, message, rule) triples shared by the whole cache. The findings only hold for the
+    rules and mode they were found with, so the cache starts over whenever those change.
+
+    Attributes:
+        configuration (dict): The validator configuration the findings were found with.
+        kinds (list): The [severity, message, rule] of each kind of finding.
+    """
+
+    def __init__(self, enabled_rules=None, fail_fast=False, files=None, kinds=None):
+        self.configuration = {
+            "rules": sorted(enabled_rules) if enabled_rules is not None else None,
+            "failFast": fail_fast
+        }
+        self.kinds = kinds or []
+        self.__kind_indexes = {tuple(kind): index for index, kind in enumerate(self.kinds)}
+        self.__previous = files or {}
+        self.__current = {}
+        self.__loaded_kinds = len(self.kinds)
+
+    @classmethod
+    def load(cls, cache_file, enabled_rules=None, fail_fast=False):
+        """
+        Loads the cache of a previous run, starting from an empty one if it doesn't exist, is broken,
+        was written with another layout version or with another validator configuration.
+        """
+        cache = cls(enabled_rules, fail_fast)
+        try:
+            with open(cache_file, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return cache
+
+        if not isinstance(data, dict) or data.get("version") != SUBTREE_CACHE_VERSION or \
+                data.get("configuration") != cache.configuration:
+            return cache
+
+        return cls(enabled_rules, fail_fast, data.get("files", {}), data.get("kinds", []))
+
+    def kind(self, severity, message, rule):
+        """
+        The index of a kind of finding, added to the kinds when it's a new one.
+        """
+        key = (severity, message, rule)
+        if key not in self.__kind_indexes:
+            self.__kind_indexes[key] = len(self.kinds)
+            self.kinds.append(list(key))
+        return self.__kind_indexes[key]
+
+    def findings(self, node, findings=None):
+        """
+        Lists the findings of a subtree, in document order.
+
+        Returns:
+            - list: The (severity, item, message, rule) of each finding.
+        """
+        findings = [] if findings is None else findings
+        for _, node_findings, child in node[1] if len(node) > 1 else []:
+            for kind, item in node_findings or []:
+                severity, message, rule = self.kinds[kind]
+                findings.append((severity, item, message, rule))
+            if child is not None:
+                self.findings(child, findings)
+        return findings
+
+    @staticmethod
+    def node(digest, items, counts=None):
+        """
+        Builds the node of a subtree, leaving the items out when there isn't any finding below it,
+        and the counts when there isn't any placeholder.
+        """
+        if not any(findings or (child is not None and len(child) > 1 and child[1])
+                   for _, findings, child in items):
+            items = []
+        if counts:
+            return [digest, items, dict(counts)]
+        return [digest, items] if items else [digest]
+
+    @staticmethod
+    def placeholder_counts(node):
+        """
+        The placeholders of a subtree by type, see Validator.placeholder_kind.
+        """
+        return node[2] if len(node) > 2 else {}
+
+    @staticmethod
+    def children(node):
+        """
+        The nodes of the nested objects and arrays of a subtree, keyed by their key or index.
+        """
+        return {key: child for key, _, child in node[1] if child is not None} if node and len(node) > 1 else {}
+
+    def previous(self, filename, part):
+        """
+        The node of a part of a file in the previous run.
+
+        Returns:
+            - dict|None: The node, None when the part wasn't cached.
+        """
+        return self.__previous.get(filename, {}).get(part)
+
+    def store(self, filename, part, node):
+        """
+        Keeps the node of a part of a file for the next run.
+        """
+        self.__current.setdefault(filename, {})[part] = node
+
+    def save(self, cache_file):
+        """
+        Writes the cache, unless nothing changed since the previous run. The files that weren't
+        validated in this run, e.g. because the run stopped early, keep their previous nodes as
+        long as they exist.
+        """
+        files = {filename: parts for filename, parts in self.__previous.items() if os.path.isfile(filename)}
+        for filename, parts in self.__current.items():
+            files[filename] = dict(files.get(filename, {}), **parts)
+
+        # Comparing the nodes is much cheaper than serialising them again
+        if files == self.__previous and len(self.kinds) == self.__loaded_kinds and os.path.isfile(cache_file):
+            return
+
+        temporary_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temporary_file, "w") as file:
+            # Serialised in one go, json.dump would fall back to the slow pure Python encoder
+            file.write(json.dumps({"version": SUBTREE_CACHE_VERSION, "configuration": self.configuration,
+                                   "kinds": self.kinds, "files": files}, separators=(",", ":"), check_circular=False))
+        os.replace(temporary_file, cache_file)
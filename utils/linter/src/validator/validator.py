@@ -16,10 +16,21 @@ Rafael Couto (rafaelcouto@stratioautomotive.com)
 Bernardo Marques (bernardomarques@stratioautomotive.com)
 """
 
-import copy
 import json
-import re
-import validators
+import os
+from collections import Counter
+
+from . import grammar, rules
+from .subtree_cache import PART_PLACEHOLDERS, PART_VAULT, subtree_hash
+from .verdict_cache import verdict_cache
+
+# Statistics of the run
+from ..metrics import metrics
+
+class StopValidation(Exception):
+    """
+    Raised by a fail fast Validator on the first failure, to stop the run.
+    """
 
 class Validator:
     """
@@ -27,16 +38,166 @@ class Validator:
 
     Attributes:
         validator_report (ValidatorReport): An instance of the Validation Report.
+        enabled_rules (frozenset|None): The rules that run, None for all of them.
+        fail_fast (bool): Whether to stop at the first failure, without recording the successes.
+        subtree_cache (SubtreeCache|None): The findings of the previous run, to only revalidate what changed.
     """
 
-    def __init__(self, appsettings_file, validator_report):
+    def __init__(self, appsettings_file, validator_report, enabled_rules=None, fail_fast=False, subtree_cache=None):
         """
         Initialize the validator object with an existing validation report.
         """
         self.validator_report = validator_report
+        self.enabled_rules = enabled_rules
+        self.fail_fast = fail_fast
+        self.subtree_cache = subtree_cache
         self.appsettings_file = appsettings_file
+
+        # The findings of the subtree being validated, when they are kept for the next run
+        self.__findings = None
+
+        # The findings reused from the previous run that weren't added to the report yet, and the
+        # subtrees and placeholders that weren't added to the statistics of the run yet
+        self.__reused = []
+        self.__subtrees = Counter()
+        self.__reused_placeholders = Counter()
+
         self.appsettings_data = self.load_appsettings(appsettings_file)
 
+    def is_enabled(self, rule):
+        """
+        Checks if a rule runs.
+
+        Parameters:
+            rule (str): The identifier of the rule.
+        """
+        return self.enabled_rules is None or rule in self.enabled_rules
+
+    def any_enabled(self, rule_set):
+        """
+        Checks if any of a set of rules runs, so that the work they share can be skipped otherwise.
+
+        Parameters:
+            rule_set (frozenset): The identifiers of the rules.
+        """
+        return self.enabled_rules is None or not self.enabled_rules.isdisjoint(rule_set)
+
+    def add_success(self, filename, item, message, rule):
+        """
+        Adds a success to the report, unless the rule doesn't run or only failures matter.
+        """
+        if not self.fail_fast and self.is_enabled(rule):
+            self.__keep("success", item, message, rule)
+            self.validator_report.add_success(filename, item, message, rule)
+
+    def add_warning(self, filename, item, message, rule):
+        """
+        Adds a warning to the report, unless the rule doesn't run.
+        """
+        if self.is_enabled(rule):
+            self.__keep("warning", item, message, rule)
+            self.validator_report.add_warning(filename, item, message, rule)
+
+    def add_failure(self, filename, item, message, rule):
+        """
+        Adds a failure to the report, unless the rule doesn't run.
+
+        Raises:
+            StopValidation: When failing fast.
+        """
+        if self.is_enabled(rule):
+            self.__keep("failure", item, message, rule)
+            self.validator_report.add_failure(filename, item, message, rule)
+            if self.fail_fast:
+                raise StopValidation(filename)
+
+    def __keep(self, severity, item, message, rule):
+        """
+        Keeps a finding of the subtree being validated, when there's one.
+        """
+        if self.__findings is not None:
+            self.__findings.append([self.subtree_cache.kind(severity, message, rule), item])
+
+    def __replay(self, node):
+        """
+        Adds the findings of an unchanged subtree to the report, as they were found in the previous run.
+        """
+        self.__subtrees["reused"] += 1
+        for kind, count in self.subtree_cache.placeholder_counts(node).items():
+            self.__reused_placeholders[kind] += count
+
+        # They were found with the same rules, only the first failure has to stop a fail fast run
+        if not self.fail_fast:
+            self.subtree_cache.findings(node, self.__reused)
+            return
+        for severity, item, message, rule in self.subtree_cache.findings(node):
+            getattr(self, "add_" + severity)(self.appsettings_file, item, message, rule)
+
+    def __flush(self):
+        """
+        Adds the reused findings to the report in one go, which must happen before anything else is added.
+        """
+        if self.__reused:
+            self.validator_report.add_findings(self.appsettings_file, self.__reused)
+            self.__reused = []
+
+    def __flush_statistics(self):
+        """
+        Adds the subtrees looked at and the reused placeholders to the statistics of the run, in one go.
+        """
+        for outcome, count in self.__subtrees.items():
+            metrics.registry.inc(metrics.SUBTREES, count, outcome=outcome)
+        for kind, count in self.__reused_placeholders.items():
+            metrics.registry.inc(metrics.PLACEHOLDERS, count, type=kind)
+        self.__subtrees.clear()
+        self.__reused_placeholders.clear()
+
+    def __validate_subtree(self, node, previous, check, hashes):
+        """
+        Validates the placeholders of an object or an array that changed since the previous run,
+        reusing the findings of its nested objects and arrays that didn't.
+
+        Parameters:
+            node (dict|list): The subtree.
+            previous (list|None): The node of the subtree in the previous run.
+            check (callable): Validates a single placeholder.
+            hashes (dict): The digest of every nested object and array, by id(), see subtree_hash.
+
+        Returns:
+            list: The node of the subtree, without its hash.
+        """
+        self.__subtrees["revalidated"] += 1
+        previous_children = self.subtree_cache.children(previous)
+
+        items = []
+        counts = Counter()
+        for key, value in node.items() if isinstance(node, dict) else enumerate(node):
+            if isinstance(value, (dict, list)):
+                digest = hashes[id(value)]
+                child = previous_children.get(key)
+                if child is not None and child[0] == digest:
+                    self.__replay(child)
+                else:
+                    self.__flush()
+                    child = self.__validate_subtree(value, child, check, hashes)
+                    child[0] = digest
+                for kind, count in self.subtree_cache.placeholder_counts(child).items():
+                    counts[kind] += count
+                items.append([key, None, child])
+
+            elif isinstance(value, str) and "{%" in value:
+                self.__flush()
+                self.__findings = findings = []
+                try:
+                    for placeholder in self.count_placeholders(grammar.scan(value), counts):
+                        check(placeholder)
+                finally:
+                    self.__findings = None
+                if findings:
+                    items.append([key, findings, None])
+
+        return self.subtree_cache.node(None, items, counts)
+
     def load_appsettings(self, appsettings_file):
         """
         Load an appsettings.json file into a dictionary structure.
@@ -49,119 +210,252 @@ class Validator:
         """
 
         with open(appsettings_file, "r") as base:
+            metrics.registry.inc(metrics.BYTES_PARSED, os.fstat(base.fileno()).st_size)
             try:
                 settings = json.load(base)
             except Exception:
-                self.validator_report.add_failure(
+                self.add_failure(
                     appsettings_file,
                     "Invalid JSON",
-                    "File has a broken JSON syntax and could not be parsed."
+                    "File has a broken JSON syntax and could not be parsed.",
+                    rules.INVALID_JSON
                 )
                 return None
 
         return settings
 
-    def match_placeholder(self, appsettings_file, string, pattern, message):
+    def match_placeholder(self, appsettings_file, placeholder, rule, message):
         """
-        Tries to match the given string with a placeholder.
+        Tries to match the given placeholder with a placeholder syntax rule.
 
         Parameters:
             appsettings_file (str): The name of the appsettings file.
-            string (str): The string where to find the placeholder.
-            pattern (str): The regular expression that should match the string.
+            placeholder (grammar.Placeholder): The placeholder to be validated.
+            rule (str): The identifier of the placeholder syntax rule that should match the placeholder.
             message (str): The specific message to be added to the report if matching fails.
         """
-        if not re.match(pattern, string):
-            self.validator_report.add_failure(
+        if not self.is_enabled(rule):
+            return
+
+        # The rule is checked on the fields as split by the library, e.g. 'vault_dict path/to/secret'
+        if not verdict_cache.verdict(rule, " ".join(placeholder.fields)):
+            self.add_failure(
                 appsettings_file,
-                "'{% " + string + " %}'",
-                message
+                "'" + placeholder.text + "'",
+                message,
+                rule
             )
         else:
-            self.validator_report.add_success(
+            self.add_success(
                 appsettings_file,
-                "'{% " + string + " %}'",
-                "Meets the placeholder syntax requirements."
+                "'" + placeholder.text + "'",
+                "Meets the placeholder syntax requirements.",
+                rule
             )
 
-    def match_field(self, appsettings_file, string, pattern, message_on_success, message_on_failure):
+    def match_field(self, appsettings_file, string, rule, message_on_success, message_on_failure):
         """
-        Tries to match the given string with a pattern.
+        Tries to match the given string with a field rule.
 
         Parameters:
             appsettings_file (str): The name of the appsettings file.
             string (str): The string to be validated.
-            pattern (str): The regular expression that should match the string.
+            rule (str): The identifier of the field rule that should match the string.
             message_on_success (str): The specific message to be added to the report if matching succeeds.
             message_on_failure (str): The specific message to be added to the report if matching fails.
         """
-        if not re.match(pattern, string):
-            self.validator_report.add_failure(
+        if not self.is_enabled(rule):
+            return
+
+        if not verdict_cache.verdict(rule, string):
+            self.add_failure(
                 appsettings_file,
                 string,
-                message_on_failure
+                message_on_failure,
+                rule
             )
         else:
-            self.validator_report.add_success(
+            self.add_success(
                 appsettings_file,
                 string,
-                message_on_success
+                message_on_success,
+                rule
             )
 
+    def find_placeholders(self):
+        """
+        Finds the placeholders in the values of the appsettings file, the same way the
+        Stratio Vault Library does, leaving the Vault object out.
+
+        Returns:
+            - list: The grammar.Placeholder objects found, in document order.
+        """
+
+        # When we're validating the secret fields we don't need to validate the vault connection
+        # That's what the validate_vault_object method is for
+        clean_appsettings_data = {}
+        if isinstance(self.appsettings_data, dict):
+            clean_appsettings_data = {key: value for key, value in self.appsettings_data.items() if key != "Vault"}
+
+        return self.count_placeholders(grammar.scan_document(clean_appsettings_data))
+
+    def count_placeholders(self, placeholders, counts=None):
+        """
+        Counts the placeholders found for the statistics of the run.
+
+        Parameters:
+            placeholders (list): The placeholders found.
+            counts (Counter|None): Also counts them by type here, e.g. for the subtree cache.
+
+        Returns:
+            - list: The same placeholders.
+        """
+        for placeholder in placeholders:
+            kind = self.placeholder_kind(placeholder)
+            metrics.registry.inc(metrics.PLACEHOLDERS, type=kind)
+            if counts is not None:
+                counts[kind] += 1
+        return placeholders
+
+    def validate_placeholders(self, check):
+        """
+        Validates every placeholder found with the given check. With a subtree cache, only the
+        top level sections and nested objects that changed since the previous run are looked at.
+
+        Parameters:
+            check (callable): Validates a single placeholder.
+        """
+        if self.subtree_cache is None or not isinstance(self.appsettings_data, dict):
+            for placeholder in self.find_placeholders():
+                check(placeholder)
+            return
+
+        # The document is always revalidated, each of its top level sections only when it changed
+        clean_appsettings_data = {key: value for key, value in self.appsettings_data.items() if key != "Vault"}
+        previous = self.subtree_cache.previous(self.appsettings_file, PART_PLACEHOLDERS)
+
+        # Every object and array is hashed once, bottom-up, before looking for the ones that changed
+        hashes = {}
+        subtree_hash(clean_appsettings_data, hashes)
+        try:
+            node = self.__validate_subtree(clean_appsettings_data, previous, check, hashes)
+            self.__flush()
+        finally:
+            self.__flush_statistics()
+        self.subtree_cache.store(self.appsettings_file, PART_PLACEHOLDERS, node)
+
+    @staticmethod
+    def placeholder_kind(placeholder):
+        """
+        Classifies a placeholder for the statistics of the run.
+
+        Returns:
+            - str: vault_secret, vault_dict, user_home, unparseable, unknown or unrecognised.
+        """
+        if not placeholder.recognised:
+            return "unrecognised"
+        if placeholder.outcome == grammar.OUTCOME_SKIPPED:
+            return grammar.USER_HOME
+        if placeholder.outcome == grammar.OUTCOME_UNPARSEABLE:
+            return "unparseable"
+        if placeholder.type in (grammar.VAULT_SECRET, grammar.VAULT_DICT):
+            return placeholder.type
+        return "unknown"
+
+    def report_unrecognised_placeholder(self, placeholder):
+        """
+        Adds a failure for a '{%' that looks like a placeholder but that the library doesn't recognise.
+
+        Parameters:
+            placeholder (grammar.Placeholder): The unrecognised fragment.
+        """
+        self.add_failure(
+            self.appsettings_file,
+            "'" + placeholder.text + "'",
+            "The Stratio Vault Library won't recognise this placeholder and will leave it as it is. " +
+            "Placeholders must end with '%}' and can't contain '(', ')' or '}'.",
+            rules.PLACEHOLDER_UNRECOGNISED
+        )
+
     def validate_base_appsettings_placeholders(self):
         """
         Validates the base appsettings.json placeholders and adds the assessments to
         the validation report.
         """
 
-        # If the appsettings file couldn't be loaded, just return w/out doing nothing
-        if self.appsettings_data is None:
+        # If the appsettings file couldn't be loaded, or none of the placeholder rules run, just return
+        if self.appsettings_data is None or not self.any_enabled(rules.BASE_PLACEHOLDER_RULES):
             return
 
-        clean_appsettings_data = copy.deepcopy(self.appsettings_data)
+        # Goes through all the placeholders in the appsettings file
+        self.validate_placeholders(self.check_base_placeholder)
 
-        # When we're validating the secret fields we don't need to validate the vault connection
-        # That's what the validate_vault_object method is for
-        if "Vault" in self.appsettings_data:
-            del clean_appsettings_data["Vault"]
+    def check_base_placeholder(self, placeholder):
+        """
+        Validates a placeholder of the base appsettings.json file.
 
-        # Goes through all the placeholders in the appsettings file
-        for match in re.findall(r'{% (.+?) %}', json.dumps(clean_appsettings_data)):
+        Parameters:
+            placeholder (grammar.Placeholder): The placeholder to be validated.
+        """
 
-            # Vault Secret Field
-            if match.startswith("vault_secret "):
-                self.match_placeholder(
-                    self.appsettings_file,
-                    match,
-                    r'^vault_secret\s+([_a-zA-Z]+(?:[-\/][_a-zA-Z]+)*):([_a-zA-Z]+(?:[-\/][_a-zA-Z]+)*)$',
-                    "Vault secret field placeholders should be similar to: '{% vault_secret path/to/secret:key %}'."
-                )
+        # Looks like a placeholder, but it isn't one for the library
+        if not placeholder.recognised:
+            self.report_unrecognised_placeholder(placeholder)
 
-            # Vault Secret Dict
-            elif match.startswith("vault_dict "):
-                self.match_placeholder(
-                    self.appsettings_file,
-                    match,
-                    r'^vault_dict\s+([_a-zA-Z]+(?:[-\/][_a-zA-Z]+)*)$',
-                    "Vault secret dict placeholders should be similar to: '{% vault_dict path/to/secret %}'."
-                )
+        # Home
+        elif placeholder.content.startswith(grammar.USER_HOME):
+            self.match_placeholder(
+                self.appsettings_file,
+                placeholder,
+                rules.USER_HOME_SYNTAX,
+                "The user home placeholder should be literally only: '{% user_home %}'."
+            )
 
-            # Home
-            elif match.startswith("user_home"):
-                self.match_placeholder(
-                    self.appsettings_file,
-                    match,
-                    r'^user_home$',
-                    "The user home placeholder should be literally only: '{% user_home %}'."
-                )
+        # Anything mentioning the user home is skipped by the library
+        elif placeholder.outcome == grammar.OUTCOME_SKIPPED:
+            self.add_warning(
+                self.appsettings_file,
+                "'" + placeholder.text + "'",
+                "Contains 'user_home', so the Stratio Vault Library skips it and it won't be materialized.",
+                rules.USER_HOME_SKIPPED
+            )
 
-            # Anything else might be some kind of other typo, let's create a warning
-            else:
-                self.validator_report.add_warning(
-                    self.appsettings_file,
-                    "'{% " + match + " %}'",
-                    "Are you sure that this is correct? You might be using it for something else!"
-                )
+        # The library needs exactly a type and a key
+        elif placeholder.outcome == grammar.OUTCOME_UNPARSEABLE:
+            self.add_failure(
+                self.appsettings_file,
+                "'" + placeholder.text + "'",
+                "The Stratio Vault Library can't parse this placeholder, it should be similar to: '{% <type> <key> %}'.",
+                rules.PLACEHOLDER_UNPARSEABLE
+            )
+
+        # Vault Secret Field
+        elif placeholder.type == grammar.VAULT_SECRET:
+            self.match_placeholder(
+                self.appsettings_file,
+                placeholder,
+                rules.VAULT_SECRET_SYNTAX,
+                "Vault secret field placeholders should be similar to: '{% vault_secret path/to/secret:key %}'."
+            )
+
+        # Vault Secret Dict
+        elif placeholder.type == grammar.VAULT_DICT:
+            self.match_placeholder(
+                self.appsettings_file,
+                placeholder,
+                rules.VAULT_DICT_SYNTAX,
+                "Vault secret dict placeholders should be similar to: '{% vault_dict path/to/secret %}'."
+            )
+
+        # Any other type makes the library throw at startup, just like an unparseable placeholder
+        else:
+            self.add_failure(
+                self.appsettings_file,
+                "'" + placeholder.text + "'",
+                "The Stratio Vault Library only knows the 'vault_secret' and 'vault_dict' placeholders, " +
+                "it can't start with this one.",
+                rules.UNKNOWN_PLACEHOLDER_TYPE
+            )
 
     def validate_environment_appsettings_placeholders(self):
         """
@@ -169,40 +463,75 @@ class Validator:
         the validation report.
         """
 
-        # If the appsettings file couldn't be loaded, just return w/out doing nothing
-        if self.appsettings_data is None:
+        # If the appsettings file couldn't be loaded, or none of the placeholder rules run, just return
+        if self.appsettings_data is None or not self.any_enabled(rules.ENVIRONMENT_PLACEHOLDER_RULES):
             return
 
-        clean_appsettings_data = copy.deepcopy(self.appsettings_data)
+        # Goes through all the placeholders in the appsettings file
+        self.validate_placeholders(self.check_environment_placeholder)
 
-        # When we're validating the secret fields we don't need to validate the vault connection
-        # That's what the validate_vault_object method is for
-        if "Vault" in self.appsettings_data:
-            del clean_appsettings_data["Vault"]
+    def check_environment_placeholder(self, placeholder):
+        """
+        Validates a placeholder of an environment specific appsettings file. The library materializes
+        it like the ones of the base file, so it is checked the same way.
 
-        # Goes through all the placeholders in the appsettings file
-        for match in re.findall(r'{% (.+?) %}', json.dumps(clean_appsettings_data)):
+        Parameters:
+            placeholder (grammar.Placeholder): The placeholder to be validated.
+        """
+        self.check_base_placeholder(placeholder)
 
-            self.validator_report.add_warning(
-                self.appsettings_file,
-                "'{% " + match + " %}'",
-                "As a best practice you should put all your secret placeholders in the base appsettings.json file!"
-            )
+        # Looks like a placeholder, but it isn't one for the library, which was already reported
+        if not placeholder.recognised:
+            return
+
+        self.add_warning(
+            self.appsettings_file,
+            "'" + placeholder.text + "'",
+            "As a best practice you should put all your secret placeholders in the base appsettings.json file!",
+            rules.ENVIRONMENT_PLACEHOLDER
+        )
 
     def validate_vault_object(self):
         """
         Validates the Vault object to make sure it has a proper configuration.
         """
 
-        # If the appsettings file couldn't be loaded, just return w/out doing nothing
-        if self.appsettings_data is None:
+        # If the appsettings file couldn't be loaded, or none of the Vault object rules run, just return
+        if self.appsettings_data is None or not self.any_enabled(rules.VAULT_OBJECT_RULES):
             return
 
+        if self.subtree_cache is None or not isinstance(self.appsettings_data, dict):
+            self.check_vault_object()
+            return
+
+        # The Vault object is only validated again when it changed
+        digest = subtree_hash(self.appsettings_data["Vault"]) if "Vault" in self.appsettings_data else None
+        node = self.subtree_cache.previous(self.appsettings_file, PART_VAULT)
+        if node is not None and node[0] == digest:
+            self.__replay(node)
+            self.__flush()
+            self.__flush_statistics()
+        else:
+            metrics.registry.inc(metrics.SUBTREES, outcome="revalidated")
+            self.__findings = findings = []
+            try:
+                self.check_vault_object()
+            finally:
+                self.__findings = None
+            node = self.subtree_cache.node(digest, [["Vault", findings, None]])
+        self.subtree_cache.store(self.appsettings_file, PART_VAULT, node)
+
+    def check_vault_object(self):
+        """
+        Checks each setting of the Vault object, or its absence.
+        """
+
         if "Vault" not in self.appsettings_data:
-            self.validator_report.add_warning(
+            self.add_warning(
                     self.appsettings_file,
                     "Vault Section",
-                    "You don't have the Vault connection configuration section in this appsettings file!"
+                    "You don't have the Vault connection configuration section in this appsettings file!",
+                    rules.VAULT_SECTION_MISSING
                 )
             return
 
@@ -211,18 +540,20 @@ class Validator:
         #
 
         # Validate the syntax of the Vault address
-        if "vaultAddress" in self.appsettings_data["Vault"]:
-            if validators.url(self.appsettings_data["Vault"]["vaultAddress"]):
-                self.validator_report.add_success(
+        if "vaultAddress" in self.appsettings_data["Vault"] and self.is_enabled(rules.VAULT_ADDRESS):
+            if verdict_cache.verdict(rules.VAULT_ADDRESS, self.appsettings_data["Vault"]["vaultAddress"]):
+                self.add_success(
                     self.appsettings_file,
                     self.appsettings_data["Vault"]["vaultAddress"],
-                    "is a valid Vault address."
+                    "is a valid Vault address.",
+                    rules.VAULT_ADDRESS
                 )
             else:
-                self.validator_report.add_failure(
+                self.add_failure(
                     self.appsettings_file,
                     self.appsettings_data["Vault"]["vaultAddress"],
-                    "is NOT a valid Vault address."
+                    "is NOT a valid Vault address.",
+                    rules.VAULT_ADDRESS
                 )
 
         # Validate the syntax of the Vault mountpoint
@@ -230,7 +561,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["mountPoint"],
-                r'^(?!.*--)(?!.*\/\/)(?!.*-\/)(?!.*\/-)(?!-.*)(?!\/.*)([a-zA-Z0-9-]*\/)*[a-zA-Z0-9-]+$',
+                rules.MOUNT_POINT,
                 "is a valid Vault mountpoint.",
                 "is NOT a valid Vault mountpoint."
             )
@@ -244,7 +575,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["approleAuthName"],
-                r'^(?!.*--)(?!-.*)([a-zA-Z0-9-]*)$',
+                rules.APPROLE_AUTH_NAME,
                 "is a valid Vault AppRole authentication method name.",
                 "is NOT a valid Vault AppRole authentication method name."
             )
@@ -254,7 +585,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["roleIdPath"],
-                r'^({% user_home %}){0,1}([\/]*[a-zA-Z0-9_\-\.]+)+(.[a-zA-Z]+?)$',
+                rules.ROLE_ID_PATH,
                 "is a valid Vault AppRole ID path.",
                 "is NOT a valid Vault AppRole ID path."
             )
@@ -264,7 +595,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["secretIdPath"],
-                r'^({% user_home %}){0,1}([\/]*[a-zA-Z0-9_\-\.]+)+(.[a-zA-Z]+?)$',
+                rules.SECRET_ID_PATH,
                 "is a valid Vault AppRole secret ID path.",
                 "is NOT a valid Vault AppRole secret ID path."
             )
@@ -278,7 +609,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["kubernetesAuthName"],
-                r'^(?!.*--)(?!-.*)([a-zA-Z0-9-]*)$',
+                rules.KUBERNETES_AUTH_NAME,
                 "is a valid Vault Kubernetes authentication method name.",
                 "is NOT a valid Vault Kubernetes authentication method name."
             )
@@ -288,7 +619,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["kubernetesSaRoleName"],
-                r'^(?!.*--)(?!-.*)([a-zA-Z0-9-]*)$',
+                rules.KUBERNETES_SA_ROLE_NAME,
                 "is a valid Vault Kubernetes Service Account name.",
                 "is NOT a valid Vault Kubernetes Service Account name."
             )
@@ -298,7 +629,7 @@ class Validator:
             self.match_field(
                 self.appsettings_file,
                 self.appsettings_data["Vault"]["kubernetesSaTokenPath"],
-                r'^({% user_home %}){0,1}([\/]*[a-zA-Z0-9_\-\.]+)+(.[a-zA-Z]+?)$',
+                rules.KUBERNETES_SA_TOKEN_PATH,
                 "is a valid Vault Kubernetes Service Account token path.",
                 "is NOT a valid Vault Kubernetes Service Account token path."
             )
@@ -16,13 +16,17 @@ Rafael Couto (rafaelcouto@stratioautomotive.com)
 Bernardo Marques (bernardomarques@stratioautomotive.com)
 """
 
-from rich.console import Console
-from rich.table import Table
-from rich import box
+from collections import Counter
 
 # File that contains helping methods
 from ..utils import helper
 
+# Statistics of the run
+from ..metrics import metrics
+
+# The list of the report data holding each severity of finding
+SEVERITY_KEYS = {"success": "successes", "warning": "warnings", "failure": "failures"}
+
 class ValidatorReport:
     """
     A class to store the validator report objects like successes, warnings, and failures.
@@ -57,7 +61,7 @@ class ValidatorReport:
             "failures": []
         }
 
-    def add_success(self, filename, item, message):
+    def add_success(self, filename, item, message, rule=None):
         """
         Add a success message to the validator report.
 
@@ -65,11 +69,13 @@ class ValidatorReport:
             filename (str): The name of the file the report entry belongs to.
             item (str): The identified placeholder item.
             message (str): The success message to be added.
+            rule (str|None): The identifier of the rule behind the entry, see rules.py.
         """
         self.add_file(filename)
         self.__files[filename]["successes"].append([item, message])
+        metrics.registry.inc(metrics.FINDINGS, severity="success", rule=rule or "none")
 
-    def add_warning(self, filename, item, message):
+    def add_warning(self, filename, item, message, rule=None):
         """
         Add a warning message to the validator report.
 
@@ -77,11 +83,13 @@ class ValidatorReport:
             filename (str): The name of the file the report entry belongs to.
             item (str): The identified placeholder item.
             message (str): The warning message to be added.
+            rule (str|None): The identifier of the rule behind the entry, see rules.py.
         """
         self.add_file(filename)
         self.__files[filename]["warnings"].append([item, message])
+        metrics.registry.inc(metrics.FINDINGS, severity="warning", rule=rule or "none")
 
-    def add_failure(self, filename, item, message):
+    def add_failure(self, filename, item, message, rule=None):
         """
         Add a failure message to the validator report.
 
@@ -89,9 +97,49 @@ class ValidatorReport:
             filename (str): The name of the file the report entry belongs to.
             item (str): The identified placeholder item.
             message (str): The failure message to be added.
+            rule (str|None): The identifier of the rule behind the entry, see rules.py.
         """
         self.add_file(filename)
         self.__files[filename]["failures"].append([item, message])
+        metrics.registry.inc(metrics.FINDINGS, severity="failure", rule=rule or "none")
+
+    def add_findings(self, filename, findings):
+        """
+        Add several findings at once to the validator report, e.g. the ones reused from a previous run.
+
+        Args:
+            filename (str): The name of the file the report entries belong to.
+            findings (list): The (severity, item, message, rule) of each entry, the severity being
+                'success', 'warning' or 'failure'.
+        """
+        if not findings:
+            return
+
+        self.add_file(filename)
+        report_data = self.__files[filename]
+        counts = Counter()
+        for severity, item, message, rule in findings:
+            report_data[SEVERITY_KEYS[severity]].append([item, message])
+            counts[severity, rule or "none"] += 1
+
+        for (severity, rule), count in counts.items():
+            metrics.registry.inc(metrics.FINDINGS, count, severity=severity, rule=rule)
+
+    def iter_files(self):
+        """
+        Iterate over the report of each file, in the order the files were added.
+
+        Returns:
+            iterator: (filename, report data) pairs, the report data having the successes,
+            warnings and failures lists of [item, message] entries.
+        """
+        return iter(self.__files.items())
+
+    def clear(self):
+        """
+        Drop every file from the report, so that the same object can hold the report of another run.
+        """
+        self.__files = {}
 
     def print_report_table(self):
         """
@@ -101,6 +149,11 @@ class ValidatorReport:
         from the validator report in a well-formatted table using the tabulate library.
         """
 
+        # rich takes longer to import than linting a file, so it's only loaded when a table is printed
+        from rich import box
+        from rich.console import Console
+        from rich.table import Table
+
         # Print a table for each of the files
         for filename, report_data in self.__files.items():
 
@@ -174,10 +227,13 @@ class ValidatorReport:
             console = Console()
             console.print(table)
 
-    def print_exit_summary(self):
+    def print_exit_summary(self, max_findings_per_file=None):
         """
         Prints the closing summary before the Linter ends.
 
+        Args:
+            max_findings_per_file (int|None): Maximum failures and warnings printed for each file.
+
         Returns:
             - bool: The exit status that should be sent in the end
         """
@@ -199,15 +255,28 @@ class ValidatorReport:
 
             print("> " + file + " " + file_status)
 
+            printed = 0
+
             # Prints file failures
             if len(report["failures"]) > 0:
                 failures = failures + 1
                 for item, message in report["failures"]:
+                    if max_findings_per_file is not None and printed >= max_findings_per_file:
+                        break
                     print(helper.color_text("  - " + item + ": " + message, "red"))
+                    printed = printed + 1
 
             # Prints file warnings
             if len(report["warnings"]) > 0:
                 for item, message in report["warnings"]:
+                    if max_findings_per_file is not None and printed >= max_findings_per_file:
+                        break
                     print(helper.color_text("  - " + item + ": " + message, "yellow"))
+                    printed = printed + 1
+
+            # Tells how many findings were left out
+            hidden = len(report["failures"]) + len(report["warnings"]) - printed
+            if hidden > 0:
+                print(f"  ... {hidden} more not shown")
 
         return failures
@@ -0,0 +1,149 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import threading
+from collections import OrderedDict
+
+from . import rules
+
+
+class VerdictCache:
+    """
+    A bounded LRU memo of rule verdicts keyed by (rule, value).
+
+    Across a fleet of services the same Vault addresses, mount points and placeholders
+    show up over and over again, so their verdicts are computed once and then reused by
+    every Validator in the run.
+
+    Attributes:
+        maxsize (int): The maximum number of verdicts kept in memory.
+        hits (int): How many lookups were answered from the memo.
+        misses (int): How many lookups had to evaluate the rule.
+    """
+
+    def __init__(self, maxsize=4096):
+        """
+        Initialize an empty verdict memo.
+
+        Args:
+            maxsize (int): The maximum number of verdicts kept in memory.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__verdicts = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__verdicts)
+
+    def verdict(self, rule, value):
+        """
+        Returns the verdict of a rule for a value, evaluating it only when it isn't memoised yet.
+
+        Args:
+            rule (str): The identifier of the rule to be evaluated.
+            value (str): The value to be checked against the rule.
+
+        Returns:
+            bool: True if the value complies with the rule, False otherwise.
+        """
+        key = (rule, value)
+
+        with self.__lock:
+            if key in self.__verdicts:
+                self.__verdicts.move_to_end(key)
+                self.hits = self.hits + 1
+                return self.__verdicts[key]
+
+        # Evaluate outside of the lock, a duplicated evaluation is harmless
+        result = rules.evaluate(rule, value)
+
+        with self.__lock:
+            self.misses = self.misses + 1
+            self.__store(key, result)
+
+        return result
+
+    def snapshot(self):
+        """
+        Exports the memoised verdicts as a plain dictionary that can be pickled and sent
+        to process pool workers.
+
+        Returns:
+            dict: The verdicts keyed by (rule, value), from least to most recently used.
+        """
+        with self.__lock:
+            return dict(self.__verdicts)
+
+    def seed(self, table):
+        """
+        Seeds the memo from a precomputed table of verdicts.
+
+        Args:
+            table (dict): Verdicts keyed by (rule, value), as returned by snapshot().
+        """
+        with self.__lock:
+            for key, result in table.items():
+                self.__store(key, result)
+
+    def clear(self):
+        """
+        Drops every memoised verdict and resets the statistics.
+        """
+        with self.__lock:
+            self.__verdicts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __store(self, key, result):
+        """
+        Stores a verdict, evicting the least recently used ones when the memo is full.
+        Must be called while holding the lock.
+        """
+        self.__verdicts[key] = result
+        self.__verdicts.move_to_end(key)
+        while len(self.__verdicts) > self.maxsize:
+            self.__verdicts.popitem(last=False)
+
+# The memo shared by all the Validator instances of the current process
+verdict_cache = VerdictCache()
+
+def precompute(pairs):
+    """
+    Builds a table of verdicts for the given (rule, value) pairs, ready to seed other processes.
+
+    Args:
+        pairs (iterable): The (rule, value) pairs to be evaluated.
+
+    Returns:
+        dict: The verdicts keyed by (rule, value).
+    """
+    return {(rule, value): verdict_cache.verdict(rule, value) for rule, value in pairs}
+
+def initialize_worker(table):
+    """
+    Process pool initializer that seeds the worker memo from a precomputed table.
+
+    Usage:
+        ProcessPoolExecutor(initializer=initialize_worker, initargs=(verdict_cache.snapshot(),))
+
+    Args:
+        table (dict): Verdicts keyed by (rule, value).
+    """
+    verdict_cache.seed(table)
@@ -74,6 +74,7 @@ def test_env_appsettings_file_with_placeholders():
     linter.validate_environment_appsettings_placeholders()
     linter.validate_vault_object()
 
-    assert len(validator_report._ValidatorReport__files[appsettings_file]["successes"]) == 5
+    # The placeholder is checked like in the base file, and warned about being in an environment file
+    assert len(validator_report._ValidatorReport__files[appsettings_file]["successes"]) == 6
     assert len(validator_report._ValidatorReport__files[appsettings_file]["warnings"]) == 1
     assert len(validator_report._ValidatorReport__files[appsettings_file]["failures"]) == 0
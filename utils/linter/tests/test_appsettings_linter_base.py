@@ -95,13 +95,14 @@ def test_appsettings_broken_secrets():
 
     assert len(validator_report._ValidatorReport__files[appsettings_file]["successes"]) == 11
 
-    assert len(validator_report._ValidatorReport__files[appsettings_file]["warnings"]) == 2
+    assert len(validator_report._ValidatorReport__files[appsettings_file]["warnings"]) == 0
+
+    # The library throws at startup on the unknown placeholder types
+    assert len(validator_report._ValidatorReport__files[appsettings_file]["failures"]) == 4
     assert any("'{% vault_dicionary my-tools/events/clients %}'" in item
-                for item in validator_report._ValidatorReport__files[appsettings_file]["warnings"])
+                for item in validator_report._ValidatorReport__files[appsettings_file]["failures"])
     assert any("'{% vault_secret_secret my-tools/kafka:brokers %}'" in item
-                for item in validator_report._ValidatorReport__files[appsettings_file]["warnings"])
-
-    assert len(validator_report._ValidatorReport__files[appsettings_file]["failures"]) == 2
+                for item in validator_report._ValidatorReport__files[appsettings_file]["failures"])
     assert any("'{% vault_secret my-tools/kafkatopic %}'" in item
                 for item in validator_report._ValidatorReport__files[appsettings_file]["failures"])
     assert any("'{% vault_dict my-tools/mysql/clients:nonexistent %}'" in item
@@ -0,0 +1,161 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from src.daemon import daemon
+from src.daemon.daemon import SOCKET_ENV
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def _lint(socket_file, *args):
+    """
+    Runs the linter CLI in a new process, pointed at the given daemon socket.
+    """
+    environ = dict(os.environ, **{SOCKET_ENV: str(socket_file)})
+    result = subprocess.run([sys.executable, "-m", "src.main", *args], capture_output=True, text=True, env=environ)
+    return result.returncode, result.stdout, result.stderr
+
+def test_daemon_output_matches_in_process(tmp_path):
+    """
+    Validates that the lints served by the daemon have the same output and exit code as the in-process ones.
+    """
+
+    # The daemon creates the private folder of its socket
+    socket_file = tmp_path / "daemon" / "linter.sock"
+    lint_daemon = subprocess.Popen([sys.executable, "-m", "src.main", "--daemon", "--socket", str(socket_file)],
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for _ in range(100):
+            if socket_file.exists():
+                break
+            time.sleep(0.05)
+
+        commands = [
+            ["--work-dir", resources_folder],
+            ["--work-dir", resources_folder, "--summary-only"],
+            ["--work-dir", resources_folder, "--select", "vault-secret-syntax", "--stream"],
+            ["--work-dir", "does-not-exist"],
+            ["--work-dir", resources_folder, "--select", "no-such-rule"],
+            ["drift", "--work-dir", resources_folder],
+        ]
+        for command in commands:
+            # Twice through the daemon, so that the second run finds the caches warm
+            served = _lint(socket_file, *command)
+            assert _lint(socket_file, *command) == served
+            assert _lint(socket_file, "--no-daemon", *command) == served
+    finally:
+        lint_daemon.terminate()
+        log = lint_daemon.communicate(timeout=10)[0]
+
+    # Every lint but the in-process ones went through the daemon, which removed its socket on the way out
+    assert len([line for line in log.splitlines() if ": exit " in line]) == 2 * len(commands)
+    assert not socket_file.exists()
+
+def test_falls_back_without_daemon(tmp_path):
+    """
+    Validates that the CLI lints in-process when the socket is missing or nobody listens on it.
+    """
+
+    expected = _lint(tmp_path / "missing.sock", "--no-daemon", "--work-dir", resources_folder, "--summary-only")
+    assert expected[0] == 1
+
+    assert _lint(tmp_path / "missing.sock", "--work-dir", resources_folder, "--summary-only") == expected
+
+    # A socket left behind by a daemon that was killed
+    private_folder = tmp_path / "private"
+    private_folder.mkdir(mode=0o700)
+    stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale_socket.bind(str(private_folder / "stale.sock"))
+    stale_socket.close()
+    assert _lint(private_folder / "stale.sock", "--work-dir", resources_folder, "--summary-only") == expected
+
+def test_nothing_sent_to_untrusted_socket(tmp_path):
+    """
+    Validates that the client doesn't send anything to a socket in a folder other users can reach into.
+    """
+
+    shared_folder = tmp_path / "shared"
+    shared_folder.mkdir()
+    shared_folder.chmod(0o755)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(shared_folder / "linter.sock"))
+    listener.listen(1)
+    listener.settimeout(0.5)
+    try:
+        assert daemon.request(["--work-dir", resources_folder], str(shared_folder / "linter.sock")) is None
+        try:
+            listener.accept()[0].close()
+            connected = True
+        except socket.timeout:
+            connected = False
+        assert not connected
+    finally:
+        listener.close()
+
+def test_request_only_carries_terminal_settings(tmp_path, monkeypatch):
+    """
+    Validates that the request holds the fingerprint of the sources and only the terminal settings
+    of the client environment, never its Vault settings.
+    """
+
+    private_folder = tmp_path / "private"
+    private_folder.mkdir(mode=0o700)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(private_folder / "linter.sock"))
+    listener.listen(1)
+    received = {}
+
+    def serve():
+        connection = listener.accept()[0]
+        with connection:
+            received.update(json.loads(daemon._receive(connection)))
+            connection.sendall(json.dumps({"reason": "Refused by the test"}).encode("utf-8"))
+
+    server = threading.Thread(target=serve)
+    server.start()
+    try:
+        monkeypatch.setenv("VAULT_TOKEN", "s.secret")
+        monkeypatch.setenv("COLUMNS", "91")
+        assert daemon.request(["--work-dir", resources_folder], str(private_folder / "linter.sock")) is None
+        server.join(timeout=10)
+    finally:
+        listener.close()
+
+    assert received["environ"]["COLUMNS"] == "91"
+    assert set(received["environ"]) <= set(daemon.CLIENT_ENVIRON)
+    assert received["code"] == daemon.code_fingerprint()
+
+def test_daemon_refuses_other_code(tmp_path):
+    """
+    Validates that a daemon doesn't serve a client running other sources, e.g. after an upgrade.
+    """
+
+    lint_daemon = daemon.LintDaemon(lambda argv: 0, str(tmp_path / "daemon" / "linter.sock"))
+    message = {"version": daemon.PROTOCOL_VERSION, "code": lint_daemon.code, "argv": ["linter"],
+               "cwd": str(tmp_path), "environ": {}, "isatty": [False, False], "terminal_sizes": [None, None, None]}
+
+    assert lint_daemon.handle_request(message)["exit_code"] == 0
+    assert "exit_code" not in lint_daemon.handle_request(dict(message, code="upgraded"))
@@ -0,0 +1,111 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import os
+
+from src.discovery.discovery import GitIgnore, discover, discover_in_background
+
+def _touch(root, *paths):
+    """
+    Creates empty appsettings files, and their directories, below the root directory.
+    """
+    for path in paths:
+        full_path = os.path.join(root, *path.split("/"))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as file:
+            file.write("{}")
+
+def _relative(root, projects):
+    """
+    Converts the discovered projects into '/' separated paths relative to the root directory.
+    """
+    def relative(path):
+        return os.path.relpath(path, root).replace(os.sep, "/")
+
+    return [(relative(project.directory),
+             project.base and relative(project.base),
+             [relative(env) for env in project.environments]) for project in projects]
+
+def test_discovery_groups_files_per_project(tmp_path):
+    """
+    Validates that the appsettings files are grouped per project directory, in a deterministic order.
+    """
+
+    _touch(tmp_path, "b/appsettings.json", "b/appsettings.Production.json", "b/appsettings.Development.json",
+                     "a/appsettings.json", "a/nested/appsettings.Staging.json", "a/other.json")
+
+    assert _relative(tmp_path, discover(str(tmp_path), recursive=True)) == [
+        ("a", "a/appsettings.json", []),
+        ("a/nested", None, ["a/nested/appsettings.Staging.json"]),
+        ("b", "b/appsettings.json", ["b/appsettings.Development.json", "b/appsettings.Production.json"]),
+    ]
+
+    assert _relative(tmp_path, discover(str(tmp_path), recursive=False)) == []
+
+def test_discovery_prunes_build_and_ignored_directories(tmp_path):
+    """
+    Validates that bin/, obj/, node_modules/, .git, .gitignore matches and --exclude globs are skipped.
+    """
+
+    _touch(tmp_path, "svc/appsettings.json", "svc/bin/Debug/appsettings.json", "svc/obj/appsettings.json",
+                     "node_modules/pkg/appsettings.json", ".git/appsettings.json",
+                     "svc/appsettings.Local.json", "generated/appsettings.json",
+                     "svc/tests/appsettings.json", "keep/appsettings.json")
+
+    with open(tmp_path / ".gitignore", "w") as gitignore:
+        gitignore.write("# build output\ngenerated/\n")
+    with open(tmp_path / "svc" / ".gitignore", "w") as gitignore:
+        gitignore.write("appsettings.*.json\n!appsettings.Production.json\n")
+
+    projects = discover(str(tmp_path), recursive=True, excludes=["svc/tests"])
+    assert _relative(tmp_path, projects) == [
+        ("keep", "keep/appsettings.json", []),
+        ("svc", "svc/appsettings.json", []),
+    ]
+
+    projects = discover(str(tmp_path), recursive=True, use_gitignore=False, excludes=["tests"])
+    assert [directory for directory, _, _ in _relative(tmp_path, projects)] == ["generated", "keep", "svc"]
+
+def test_gitignore_rules():
+    """
+    Validates the supported subset of the .gitignore syntax.
+    """
+
+    gitignore = GitIgnore(["*.Local.json", "/config/**/appsettings.*.json", "build/", "!keep.Local.json"])
+
+    assert gitignore.match("appsettings.Local.json", False)
+    assert gitignore.match("deep/appsettings.Local.json", False)
+    assert gitignore.match("keep.Local.json", False) is False
+    assert gitignore.match("config/a/b/appsettings.Dev.json", False)
+    assert gitignore.match("other/config/appsettings.Dev.json", False) is None
+    assert gitignore.match("build", True)
+    assert gitignore.match("build", False) is None
+
+def test_background_discovery_matches_discovery(tmp_path):
+    """
+    Validates that the producer/consumer discovery yields the same projects, and can be stopped early.
+    """
+
+    _touch(tmp_path, *[f"svc{index:02}/appsettings.json" for index in range(20)])
+
+    expected = list(discover(str(tmp_path), recursive=True))
+    assert list(discover_in_background(str(tmp_path), recursive=True, maxsize=2)) == expected
+
+    projects = discover_in_background(str(tmp_path), recursive=True, maxsize=1)
+    assert next(projects) == expected[0]
+    projects.close()
@@ -0,0 +1,108 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import json
+import os
+
+from src.discovery.discovery import ProjectAppsettings
+from src.drift.drift import NO_AUTH_METHOD, EnvironmentDrift, EnvironmentProfile, service_drift
+from src.utils import configuration
+
+def _project(root, files):
+    """
+    Writes the appsettings files of a project and returns it.
+    """
+    os.makedirs(root, exist_ok=True)
+    for name, data in files.items():
+        with open(os.path.join(root, name), "w") as file:
+            json.dump(data, file)
+
+    environments = sorted(os.path.join(root, name) for name in files if name != "appsettings.json")
+    base = os.path.join(root, "appsettings.json") if "appsettings.json" in files else None
+    return ProjectAppsettings(str(root), base, environments)
+
+def test_profile_follows_the_provider_settings():
+    """
+    Validates the mount point, the authentication method order and the case insensitive placeholder keys.
+    """
+
+    profile = EnvironmentProfile.from_index(configuration.flatten({
+        "vault": {"MountPoint": "env/uat", "roleIdPath": "/r", "secretIdPath": "/s", "kubernetesSaRoleName": "sa"},
+        "Db": {"Password": "{% vault_secret db:password %}", "Host": "db.local"},
+        "Broken": "{%vault_secret db:password%}",
+    }))
+
+    assert profile.mount_point == "env/uat"
+    assert profile.auth_method == "kubernetes"
+    assert list(profile.placeholder_keys.values()) == ["Db:Password", "Broken"]
+
+    assert EnvironmentProfile.from_index({"Vault:roleIdPath": "/r"}).auth_method == NO_AUTH_METHOD
+
+    # The same keys written with another case are the same profile, and don't drift
+    other_case = EnvironmentProfile.from_index({"vault:mountPoint": "env/uat", "vault:kubernetesSaRoleName": "sa",
+                                                "db:password": "{% vault_secret db:password %}",
+                                                "BROKEN": "{%vault_secret db:password%}"})
+    assert other_case == profile
+    assert EnvironmentDrift(profile, other_case).aspects == []
+
+def test_service_drift_between_environments(tmp_path):
+    """
+    Validates that each environment is overlaid on the base file, and the pairwise differences.
+    """
+
+    base = {"Vault": {"mountPoint": "env/uat", "roleIdPath": "/r", "secretIdPath": "/s"},
+            "Db": {"Password": "{% vault_secret db:password %}"}}
+
+    drift = service_drift("svc", _project(tmp_path, {
+        "appsettings.json": base,
+        "appsettings.Development.json": {"Logging": {"Level": "Debug"}},
+        "appsettings.Staging.json": {"db": {"password": "plain"}, "Cache": "{% vault_dict cache %}"},
+        "appsettings.Production.json": {"Vault": {"mountPoint": "env/prod", "kubernetesSaRoleName": "sa"}},
+        "appsettings.Broken.json": "not an object",
+    }))
+
+    assert drift.environments == ["Broken", "Development", "Production", "Staging"]
+    assert drift.drift("Development", "Broken") is None
+
+    production = drift.drift("Development", "Production")
+    assert production.aspects == ["mount_point", "auth_method"]
+
+    staging = drift.drift("Development", "Staging")
+    assert staging.aspects == ["placeholder_keys"]
+    assert staging.only_left == ["Db:Password"]
+    assert staging.only_right == ["Cache"]
+
+    assert drift.drift("Staging", "Development").only_left == ["Cache"]
+
+def test_service_drift_skips_unreadable_files(tmp_path):
+    """
+    Validates that files that can't be parsed are left out, and that a lone base file is its own environment.
+    """
+
+    project = _project(tmp_path / "svc", {"appsettings.json": {}})
+    with open(os.path.join(project.directory, "appsettings.Local.json"), "w") as file:
+        file.write("{ broken")
+    project.environments.append(os.path.join(project.directory, "appsettings.Local.json"))
+
+    drift = service_drift("svc", project)
+    assert drift.environments == []
+    assert drift.unreadable == project.environments
+    assert not drift.has_drift
+
+    drift = service_drift("svc", _project(tmp_path / "other", {"appsettings.json": {}}))
+    assert drift.environments == ["(base)"]
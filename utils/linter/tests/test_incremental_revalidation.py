@@ -0,0 +1,176 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from src.metrics import metrics
+from src.validator import rules
+from src.validator.subtree_cache import SubtreeCache
+from src.validator.validator import Validator
+from src.validator.validator_report import ValidatorReport
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def _validate(appsettings_file, cache_file=None, enabled_rules=None, environment=False):
+    """
+    Validates an appsettings file like the linter does, optionally through a subtree cache.
+
+    Returns:
+        tuple: The report data of the file, and how many subtrees were reused and revalidated.
+    """
+    metrics.registry.clear()
+    subtree_cache = SubtreeCache.load(cache_file, enabled_rules) if cache_file else None
+
+    validator_report = ValidatorReport()
+    validator = Validator(appsettings_file, validator_report, enabled_rules, subtree_cache=subtree_cache)
+    if environment:
+        validator.validate_environment_appsettings_placeholders()
+    else:
+        validator.validate_base_appsettings_placeholders()
+    validator.validate_vault_object()
+
+    if subtree_cache is not None:
+        subtree_cache.save(cache_file)
+
+    return dict(validator_report.iter_files()).get(appsettings_file), \
+        metrics.registry.value(metrics.SUBTREES, outcome="reused"), \
+        metrics.registry.value(metrics.SUBTREES, outcome="revalidated")
+
+def _write(appsettings_file, data):
+    """
+    Writes an appsettings file.
+    """
+    with open(appsettings_file, "w") as file:
+        json.dump(data, file, indent=2)
+
+def test_only_changed_subtrees_are_revalidated(tmp_path):
+    """
+    Validates that an edit only revalidates the sections and nested objects on its way,
+    and that the report is the same as the one of a full validation.
+    """
+
+    with open(resources_folder + "appsettings.ProviderEdgeCases.json", "r") as file:
+        data = json.load(file)
+    data["Services"] = {"Billing": {"Token": "{% vault_secret billing/api:token %}", "Retries": 3},
+                        "Search": {"Clients": "{% vault_dict search/clients %}"}}
+
+    appsettings_file = str(tmp_path / "appsettings.json")
+    cache_file = str(tmp_path / "subtrees.json")
+    _write(appsettings_file, data)
+
+    findings, reused, _ = _validate(appsettings_file, cache_file)
+    assert findings == _validate(appsettings_file)[0]
+    assert reused == 0
+
+    # Nothing changed, every top level section and the Vault object are reused, only the document is looked at,
+    # and the cache isn't written again
+    sections = len([key for key, value in data.items() if isinstance(value, (dict, list)) and key != "Vault"])
+    os.utime(cache_file, ns=(0, 0))
+    assert _validate(appsettings_file, cache_file) == (findings, sections + 1, 1)
+    assert os.stat(cache_file).st_mtime_ns == 0
+
+    # A broken placeholder in a nested object, its siblings and the other sections are reused
+    data["Services"]["Billing"]["Token"] = "{% vault_secret billing/api %}"
+    _write(appsettings_file, data)
+
+    findings, reused, revalidated = _validate(appsettings_file, cache_file)
+    assert findings == _validate(appsettings_file)[0]
+    assert "'{% vault_secret billing/api %}'" in [item for item, _ in findings["failures"]]
+
+    # The document, Services and Billing are revalidated, the other sections, Search and the Vault object reused
+    assert (reused, revalidated) == (sections + 1, 3)
+
+def test_vault_object_revalidated_only_when_changed(tmp_path):
+    """
+    Validates that the Vault object findings are reused until the object itself changes.
+    """
+
+    with open(resources_folder + "appsettings.Kubernetes.json", "r") as file:
+        data = json.load(file)
+
+    appsettings_file = str(tmp_path / "appsettings.Production.json")
+    cache_file = str(tmp_path / "subtrees.json")
+    _write(appsettings_file, data)
+    _validate(appsettings_file, cache_file, environment=True)
+
+    data["Extra"] = "{% vault_dict extra %}"
+    _write(appsettings_file, data)
+    findings, reused, _ = _validate(appsettings_file, cache_file, environment=True)
+    assert findings == _validate(appsettings_file, environment=True)[0]
+    assert reused >= 1
+
+    data["Vault"]["mountPoint"] = "/env/prod"
+    _write(appsettings_file, data)
+    findings, _, _ = _validate(appsettings_file, cache_file, environment=True)
+    assert findings == _validate(appsettings_file, environment=True)[0]
+    assert ["/env/prod", "is NOT a valid Vault mountpoint."] in findings["failures"]
+
+def test_reused_subtrees_count_their_placeholders(tmp_path):
+    """
+    Validates that the placeholder statistics of a warm run are the ones of a full validation.
+    """
+
+    appsettings_file = str(tmp_path / "appsettings.json")
+    cache_file = str(tmp_path / "subtrees.json")
+    with open(resources_folder + "appsettings.ProviderEdgeCases.json", "r") as file:
+        data = json.load(file)
+    data["Services"] = {"Billing": {"Token": "{% vault_secret billing/api:token %}"}, "Home": "{% user_home %}"}
+    _write(appsettings_file, data)
+
+    def placeholders(*args):
+        _validate(appsettings_file, *args)
+        return {kind: metrics.registry.value(metrics.PLACEHOLDERS, type=kind)
+                for kind in ["vault_secret", "vault_dict", "user_home", "unparseable", "unknown", "unrecognised"]}
+
+    expected = placeholders()
+    assert placeholders(cache_file) == expected
+    assert placeholders(cache_file) == expected
+
+def test_cache_starts_over_with_other_rules(tmp_path):
+    """
+    Validates that the findings of a run aren't reused by a run with other rules.
+    """
+
+    appsettings_file = resources_folder + "appsettings.BaseBrokenSecrets.json"
+    cache_file = str(tmp_path / "subtrees.json")
+    _validate(appsettings_file, cache_file)
+
+    enabled_rules = rules.select_rules([rules.VAULT_DICT_SYNTAX], [])
+    findings, reused, _ = _validate(appsettings_file, cache_file, enabled_rules)
+
+    assert reused == 0
+    assert findings == _validate(appsettings_file, enabled_rules=enabled_rules)[0]
+
+def test_incremental_cache_output_matches(tmp_path):
+    """
+    Validates that runs with --incremental-cache, cold and warm, print the same report as a plain run.
+    """
+
+    def lint(*args):
+        result = subprocess.run([sys.executable, "-m", "src.main", "--no-daemon", "--work-dir", resources_folder,
+                                 "--stream", *args], capture_output=True, text=True)
+        return result.returncode, result.stdout
+
+    cache_file = str(tmp_path / "subtrees.json")
+    expected = lint()
+    assert lint("--incremental-cache", cache_file) == expected
+    assert lint("--incremental-cache", cache_file) == expected
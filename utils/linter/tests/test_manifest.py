@@ -0,0 +1,106 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import json
+import os
+import shutil
+
+from src.discovery.discovery import discover
+from src.manifest.manifest import BASE_ENVIRONMENT, Manifest, project_digest, vault_reads
+from src.utils import configuration
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def _load(appsettings_file):
+    """
+    Loads an appsettings file.
+    """
+    with open(appsettings_file, "r") as file:
+        return json.load(file)
+
+def _build_manifest(work_dir, manifest):
+    """
+    Updates the manifest with every project found below the work dir, like the linter does.
+    """
+    recomputed = []
+    for project in discover(work_dir, recursive=True):
+        digest = project_digest(project)
+        if manifest.is_up_to_date(project, digest):
+            continue
+        recomputed.append(manifest.service_name(project))
+        manifest.update(project, digest, project.base and _load(project.base),
+                        {env: _load(env) for env in project.environments})
+    manifest.prune()
+    return recomputed
+
+def test_flatten_uses_the_configuration_path_scheme():
+    """
+    Validates that the appsettings documents are flattened like the .NET configuration system does.
+    """
+
+    index = configuration.flatten({"Vault": {"mountPoint": "env/uat"}, "Hosts": ["a", {"Name": "b"}], "Empty": {}})
+
+    assert index == {"Vault:mountPoint": "env/uat", "Hosts:0": "a", "Hosts:1:Name": "b", "Empty": None}
+
+    merged = configuration.overlay(index, {"vault:MountPoint": "env/prod"})
+    assert configuration.get_value(merged, "Vault:mountPoint") == "env/prod"
+    assert len(merged) == len(index)
+
+def test_vault_reads_are_deduplicated():
+    """
+    Validates that the placeholders are turned into one read per mount point, path and kind.
+    """
+
+    index = configuration.flatten(_load(resources_folder + "appsettings.WithVault.json"))
+    reads = vault_reads(index)
+
+    assert {"mountPoint": "env/uat", "path": "my-tools/elastic", "kind": "secret",
+            "fields": ["host", "password", "port", "username"]} in reads
+    assert {"mountPoint": "env/uat", "path": "my-tools/events/clients", "kind": "dict", "fields": []} in reads
+    assert len(reads) == 7
+
+def test_manifest_is_deterministic_and_incremental(tmp_path):
+    """
+    Validates that the manifest is stable across runs and only recomputes the services that changed.
+    """
+
+    for service in ["svc-a", "svc-b"]:
+        os.makedirs(tmp_path / service)
+        shutil.copy(resources_folder + "appsettings.json", tmp_path / service / "appsettings.json")
+        shutil.copy(resources_folder + "appsettings.Kubernetes.json", tmp_path / service / "appsettings.Production.json")
+
+    manifest = Manifest(str(tmp_path))
+    assert _build_manifest(str(tmp_path), manifest) == ["svc-a", "svc-b"]
+    manifest.save(str(tmp_path / "manifest.json"))
+
+    environments = manifest.services["svc-a"]["environments"]
+    assert all(read["mountPoint"] is None for read in environments[BASE_ENVIRONMENT])
+    assert all(read["mountPoint"] == "env/prod" for read in environments["Production"])
+
+    # Nothing changed, nothing is recomputed and the bytes stay the same
+    reloaded = Manifest.load(str(tmp_path), str(tmp_path / "manifest.json"))
+    assert _build_manifest(str(tmp_path), reloaded) == []
+    assert reloaded.dumps() == manifest.dumps()
+
+    # Only the changed service is recomputed, a deleted service is dropped
+    shutil.copy(resources_folder + "appsettings.WithVault.json", tmp_path / "svc-b" / "appsettings.json")
+    shutil.rmtree(tmp_path / "svc-a")
+    assert _build_manifest(str(tmp_path), reloaded) == ["svc-b"]
+    assert list(reloaded.services) == ["svc-b"]
+    assert reloaded.services["svc-b"]["environments"][BASE_ENVIRONMENT][0]["mountPoint"] == "env/uat"
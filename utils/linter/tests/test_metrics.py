@@ -0,0 +1,85 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import re
+import subprocess
+import sys
+
+from src.metrics.metrics import MetricsRegistry
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def test_registry_renders_openmetrics():
+    """
+    Validates the counters, the cumulative histogram buckets, the label escaping and the closing EOF.
+    """
+
+    registry = MetricsRegistry()
+    registry.counter("lint_files", "Files.")
+    registry.histogram("lint_duration_seconds", "Durations.", [0.1, 1.0], unit="seconds")
+
+    registry.inc("lint_files", kind="base")
+    registry.inc("lint_files", 2, kind='env "prod"')
+    for value in [0.05, 0.5, 5.0]:
+        registry.observe("lint_duration_seconds", value, phase="validation")
+
+    assert registry.render().splitlines() == [
+        "# TYPE lint_duration_seconds histogram",
+        "# UNIT lint_duration_seconds seconds",
+        "# HELP lint_duration_seconds Durations.",
+        'lint_duration_seconds_bucket{phase="validation",le="0.1"} 1',
+        'lint_duration_seconds_bucket{phase="validation",le="1.0"} 2',
+        'lint_duration_seconds_bucket{phase="validation",le="+Inf"} 3',
+        'lint_duration_seconds_sum{phase="validation"} 5.55',
+        'lint_duration_seconds_count{phase="validation"} 3',
+        "# TYPE lint_files counter",
+        "# HELP lint_files Files.",
+        'lint_files_total{kind="base"} 1',
+        'lint_files_total{kind="env \\"prod\\""} 2',
+        "# EOF",
+    ]
+
+def test_metrics_out_counts_the_run(tmp_path):
+    """
+    Validates that the metrics written by a run agree with its report.
+    """
+
+    metrics_file = tmp_path / "linter.prom"
+    result = subprocess.run([sys.executable, "-m", "src.main", "--no-daemon", "--work-dir", resources_folder, "--summary-only",
+                             "--metrics-out", str(metrics_file)], capture_output=True, text=True)
+
+    samples = {}
+    for line in metrics_file.read_text().splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+
+    totals = re.search(r"^Files: \d+, Successes: (\d+), Warnings: (\d+), Failures: (\d+)$", result.stdout, re.M)
+
+    def total(severity):
+        return sum(value for name, value in samples.items()
+                   if name.startswith("appsettings_linter_findings_total") and f'severity="{severity}"' in name)
+
+    assert [total("success"), total("warning"), total("failure")] == [float(count) for count in totals.groups()]
+    assert samples['appsettings_linter_files_scanned_total{kind="base"}'] == 1
+    assert samples['appsettings_linter_findings_total{rule="invalid-json",severity="failure"}'] == 1
+    assert samples['appsettings_linter_phase_duration_seconds_count{phase="validation"}'] == \
+        samples['appsettings_linter_files_scanned_total{kind="base"}'] + \
+        samples['appsettings_linter_files_scanned_total{kind="environment"}']
+    assert metrics_file.read_text().endswith("# EOF\n")
@@ -0,0 +1,193 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import asyncio
+import json
+import shutil
+
+import pytest
+
+from src.mockvault.loadgen import extract_load_sets, replay
+from src.mockvault.server import MockVaultServer
+from src.utils.vault_http import VaultHttpClient, VaultHttpError
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+# The secrets served by the mock
+secrets = {
+    "env/uat": {
+        "my-tools/kafka": {"brokers": "kafka:9092", "topic": "events"},
+        "my-tools/elastic": {"host": "elastic", "port": "9200", "username": "user", "password": "pass"},
+        "my-tools/mysql/clients": {"client-a": "Server=a", "client-b": "Server=b"}
+    }
+}
+
+async def _with_server(server, test):
+    """
+    Runs a test coroutine against a started mock server.
+    """
+    port = await server.start()
+    client = VaultHttpClient(f"http://127.0.0.1:{port}", "token")
+    try:
+        return await test(client)
+    finally:
+        await client.close()
+        await server.stop()
+
+def test_mock_serves_kv2_secrets_and_counts_requests():
+    """
+    Validates that the KV v2 endpoints are served from the fixture and counted per path.
+    """
+
+    server = MockVaultServer(secrets)
+
+    async def test(client):
+        assert await client.read_kv2("env/uat", "my-tools/kafka") == {"brokers": "kafka:9092", "topic": "events"}
+        assert (await client.read_kv2("env/uat", "my-tools/kafka"))["topic"] == "events"
+
+        with pytest.raises(VaultHttpError) as error:
+            await client.read_kv2("env/uat", "my-tools/missing")
+        assert error.value.status == 404
+
+        with pytest.raises(VaultHttpError):
+            await client.read_kv2("env/prod", "my-tools/kafka")
+
+    asyncio.run(_with_server(server, test))
+
+    assert server.requests["/v1/env/uat/data/my-tools/kafka"] == 2
+    assert server.requests["/v1/env/uat/data/my-tools/missing"] == 1
+
+def test_mock_injects_faults():
+    """
+    Validates the permission denied, error rate and latency injection.
+    """
+
+    server = MockVaultServer(secrets, latency=0.01, error_rate=0.5, denied=["env/uat/my-tools/mysql/*"], seed=7)
+
+    async def test(client):
+        with pytest.raises(VaultHttpError) as error:
+            await client.read_kv2("env/uat", "my-tools/mysql/clients")
+        assert error.value.permission_denied
+
+        statuses = []
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(20):
+            try:
+                await client.read_kv2("env/uat", "my-tools/elastic")
+                statuses.append(200)
+            except VaultHttpError as ex:
+                statuses.append(ex.status)
+        assert loop.time() - started >= 0.2
+        return statuses
+
+    statuses = asyncio.run(_with_server(server, test))
+
+    assert 200 in statuses
+    assert 500 in statuses
+
+def test_load_generator_measures_request_amplification(tmp_path):
+    """
+    Validates that the load generator replays the placeholders like the provider, one read per placeholder.
+    """
+
+    shutil.copy(resources_folder + "appsettings.WithVault.json", tmp_path / "appsettings.json")
+    load_sets = extract_load_sets(str(tmp_path))
+
+    assert len(load_sets) == 1
+    assert len(load_sets[0].reads) == 14
+    assert load_sets[0].unique_reads == 7
+
+    server = MockVaultServer(secrets)
+
+    async def test(client):
+        return await replay(client, load_sets, iterations=3, concurrency=2)
+
+    result = asyncio.run(_with_server(server, test))
+
+    assert result.loads == 3
+    assert result.requests == 42
+    assert result.amplification == 2.0
+    assert sum(server.requests.values()) == 42
+    assert server.requests["/v1/env/uat/data/my-tools/elastic"] == 12
+    assert result.errors[404] == 3 * 7
+
+def test_load_generator_replays_reads_in_provider_order(tmp_path):
+    """
+    Validates that the reads are replayed in GetChildren order, numbers first and then case insensitively,
+    whatever the order of the keys in the document.
+    """
+
+    appsettings = {
+        "Vault": {"mountPoint": "env/uat"},
+        "beta": "{% vault_secret my-tools/beta:key %}",
+        "Alpha": "{% vault_secret my-tools/alpha:key %}",
+        "Clients": [f"{{% vault_dict my-tools/clients/{index} %}}" for index in range(11)],
+        "10": "{% vault_dict my-tools/ten %}",
+        "9": "{% vault_dict my-tools/nine %}"
+    }
+    (tmp_path / "appsettings.json").write_text(json.dumps(appsettings))
+
+    load_sets = extract_load_sets(str(tmp_path))
+
+    assert len(load_sets) == 1
+    assert load_sets[0].reads == ["my-tools/nine", "my-tools/ten", "my-tools/alpha", "my-tools/beta"] + \
+        [f"my-tools/clients/{index}" for index in range(11)]
+
+def test_client_closes_connections_on_errors():
+    """
+    Validates that a request cut by a timeout closes its connection, and that a body that isn't JSON
+    is reported as a VaultHttpError.
+    """
+
+    closed = None
+
+    async def silent(reader, writer):
+        # Never answers, and tells when the client closed the connection
+        await reader.read()
+        closed.set()
+        writer.close()
+
+    async def not_json(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 13\r\n\r\n<html></html>")
+        await writer.drain()
+        writer.close()
+
+    async def test():
+        nonlocal closed
+        closed = asyncio.Event()
+        for handler in (silent, not_json):
+            server = await asyncio.start_server(handler, "127.0.0.1", 0)
+            client = VaultHttpClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", "token")
+            try:
+                if handler is silent:
+                    with pytest.raises(asyncio.TimeoutError):
+                        await asyncio.wait_for(client.request("GET", "/v1/sys/health"), 0.1)
+                    await asyncio.wait_for(closed.wait(), 5)
+                else:
+                    with pytest.raises(VaultHttpError) as error:
+                        await client.request("GET", "/v1/sys/health")
+                    assert error.value.status == 502
+            finally:
+                await client.close()
+                server.close()
+                await server.wait_closed()
+
+    asyncio.run(test())
@@ -0,0 +1,175 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import random
+import re
+import sys
+import unicodedata
+
+from src.validator import grammar
+from src.validator.validator import Validator
+from src.validator.validator_report import ValidatorReport
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+#
+# Python port of the placeholder handling of VaultConfigurationProvider.cs
+#
+
+# \s in .NET is [\f\n\r\t\v\x85\p{Z}]
+_DOTNET_WHITESPACE = "\f\n\r\t\v\x85" + "".join(
+    chr(code) for code in range(sys.maxunicode + 1) if unicodedata.category(chr(code)).startswith("Z"))
+
+_PROVIDER_PLACEHOLDER = re.compile(r'{%[^(%})]*%}')
+_PROVIDER_FIELDS = re.compile("[^" + re.escape(_DOTNET_WHITESPACE) + "{%}]+")
+
+def provider_placeholders(value):
+    """
+    Port of GetPlaceholdersInString.
+    """
+    return [match.group(0) for match in _PROVIDER_PLACEHOLDER.finditer(value)]
+
+def provider_outcome(placeholder):
+    """
+    Port of the per placeholder logic of MaterializePlaceholdersInSection and TryGetPlaceholderTypeAndKey.
+    """
+    if placeholder.upper().find("USER_HOME") != -1:
+        return (grammar.OUTCOME_SKIPPED,)
+
+    matches = _PROVIDER_FIELDS.findall(placeholder)
+    if len(matches) != 2:
+        return (grammar.OUTCOME_UNPARSEABLE,)
+
+    secret_type, secret_key = matches
+    if secret_type == "vault_secret":
+        path_and_field = secret_key.split(":")
+        if len(path_and_field) != 2:
+            return (grammar.OUTCOME_BAD_SECRET_KEY,)
+        return (grammar.OUTCOME_SECRET, path_and_field[0], path_and_field[1])
+    if secret_type == "vault_dict":
+        return (grammar.OUTCOME_DICT, secret_key, None)
+    return (grammar.OUTCOME_UNKNOWN_TYPE,)
+
+def grammar_outcome(placeholder):
+    """
+    The same information as provider_outcome, taken from the grammar module.
+    """
+    parsed = grammar.Placeholder(placeholder)
+    if parsed.outcome in (grammar.OUTCOME_SECRET, grammar.OUTCOME_DICT):
+        return (parsed.outcome, parsed.path, parsed.field)
+    return (parsed.outcome,)
+
+# Edge cases where the old '{% (.+?) %}' pass and the provider disagree
+edge_cases = [
+    "{% vault_secret a/b:c %}",
+    "{%vault_secret a/b:c%}",
+    "{%  vault_secret\ta/b:c \n%}",
+    "{% vault_secret a/b:c extra %}",
+    "{% vault_secret a(b):c %}",
+    "{% vault_secret a/b:c:d %}",
+    "{% vault_secret a/b %}",
+    "{% vault_dict a/b %}{% vault_dict c %}",
+    "{% vault_dict a}b %}",
+    "{% user_home %}/x",
+    "{% USER_Home %}",
+    "{% vault_secret user_home/a:b %}",
+    "{%%}",
+    "{%}",
+    "{% {% vault_dict a %}",
+    "{{% vault_dict a %}}",
+    "{% vault_dict a %",
+    "{% vault_secret a:b %}",
+    "{% vault_secret\x1ca:b %}",
+    "{% vault_secret a:b %}",
+    "100% {% vault_dict a %} 50%}",
+    "",
+]
+
+def _random_values(count, seed=2024):
+    """
+    Generates random strings biased towards the characters that matter to the grammar.
+    """
+    alphabet = ["{%", "%}", "{", "}", "%", "(", ")", " ", "\t", " ", "\x1c", "　", ":", "/",
+                "vault_secret", "vault_dict", "user_home", "USER_HOME", "a", "b"]
+    generator = random.Random(seed)
+    return ["".join(generator.choice(alphabet) for _ in range(generator.randint(0, 24))) for _ in range(count)]
+
+def test_scanner_matches_provider_on_edge_cases():
+    """
+    Validates the scanner and the tokenisation against the port of the C# logic on known edge cases.
+    """
+
+    for value in edge_cases:
+        assert grammar.find_placeholders(value) == provider_placeholders(value), value
+        for placeholder in provider_placeholders(value):
+            assert grammar_outcome(placeholder) == provider_outcome(placeholder), placeholder
+
+def test_scanner_matches_provider_on_random_values():
+    """
+    Differential test of the scanner and the tokenisation against the port of the C# logic.
+    """
+
+    for value in _random_values(5000):
+        assert grammar.find_placeholders(value) == provider_placeholders(value), repr(value)
+        for placeholder in provider_placeholders(value):
+            assert grammar_outcome(placeholder) == provider_outcome(placeholder), repr(placeholder)
+
+def test_scanner_reports_unrecognised_fragments():
+    """
+    Validates that the '{%' the provider silently leaves as they are are reported.
+    """
+
+    placeholders = grammar.scan("{% vault_secret a(b):c %} and {% vault_dict a %}")
+
+    assert [placeholder.recognised for placeholder in placeholders] == [False, True]
+    assert placeholders[0].text == "{% vault_secret a(b):c %}"
+
+def test_scanner_is_linear():
+    """
+    Validates that adversarial inputs don't make the scanner quadratic.
+    """
+
+    value = "{%" + " a" * 200000
+    assert grammar.scan(value)[0].recognised is False
+    assert grammar.find_placeholders("{% (" * 50000) == []
+
+def test_validator_follows_provider_tokenisation():
+    """
+    Validates a base appsettings file with the edge cases the old regular expression missed.
+    """
+
+    appsettings_file = resources_folder + "appsettings.ProviderEdgeCases.json"
+
+    validator_report = ValidatorReport()
+    linter = Validator(appsettings_file, validator_report)
+    linter.validate_base_appsettings_placeholders()
+
+    report = validator_report._ValidatorReport__files[appsettings_file]
+
+    assert ["'{%vault_secret my-tools/kafka:brokers%}'", "Meets the placeholder syntax requirements."] in report["successes"]
+    assert any("'{% vault_dict my-tools/events/clients %}'" in item for item in report["successes"])
+    assert any("'{% user_home %}'" in item for item in report["successes"])
+    assert len(report["successes"]) == 3
+
+    assert any("'{% vault_secret my-tools/kafka:brokers extra %}'" in item for item in report["failures"])
+    assert any("'{% vault_secret my-tools/kafka(old):brokers %}'" in item for item in report["failures"])
+    assert len(report["failures"]) == 2
+
+    assert any("'{% vault_secret my-tools/user_home:path %}'" in item for item in report["warnings"])
+    assert len(report["warnings"]) == 1
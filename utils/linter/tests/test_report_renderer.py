@@ -0,0 +1,116 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import io
+from contextlib import redirect_stderr, redirect_stdout
+
+from src import cli
+from src.validator.report_renderer import StreamingReportRenderer
+from src.validator.validator_report import ValidatorReport
+
+def _big_report(files=10, findings_per_file=10000):
+    """
+    Builds a report with many findings per file, a tenth of them being failures.
+    """
+    validator_report = ValidatorReport()
+    for file_index in range(files):
+        filename = f"appsettings.Env{file_index}.json"
+        for index in range(findings_per_file):
+            if index % 10 == 0:
+                validator_report.add_failure(filename, f"item-{index}", "is NOT valid.")
+            else:
+                validator_report.add_success(filename, f"item-{index}", "is valid.")
+    return validator_report
+
+def test_streaming_renderer_caps_findings_per_file():
+    """
+    Validates that at most the requested findings are rendered for each file, failures first.
+    """
+
+    output = io.StringIO()
+    rendered = StreamingReportRenderer(output, max_findings_per_file=3).render(_big_report(files=2, findings_per_file=50))
+    lines = output.getvalue().splitlines()
+
+    assert rendered == 6
+    assert sum("Failure - item-0: is NOT valid." in line for line in lines) == 2
+    assert sum("... 47 more findings not shown" in line for line in lines) == 2
+
+def test_streaming_renderer_paginates_across_files():
+    """
+    Validates that the pages are numbered across all files.
+    """
+
+    validator_report = _big_report(files=3, findings_per_file=4)
+
+    output = io.StringIO()
+    rendered = StreamingReportRenderer(output, page_size=5, page=2).render(validator_report)
+    text = output.getvalue()
+
+    assert rendered == 5
+    assert "appsettings.Env0.json" not in text
+    assert "appsettings.Env1.json" in text
+    assert "appsettings.Env2.json" in text
+    assert "Page 2 of 3 (12 findings)" in text
+
+def test_streaming_renderer_summary_only():
+    """
+    Validates the summary only mode.
+    """
+
+    output = io.StringIO()
+    StreamingReportRenderer(output, summary_only=True).render(_big_report(files=2, findings_per_file=20))
+    lines = output.getvalue().splitlines()
+
+    assert len(lines) == 4
+    assert "appsettings.Env0.json: Successes: 18, Warnings: 0, Failures: 2" in lines[0]
+    assert lines[-1] == "Files: 2, Successes: 36, Warnings: 0, Failures: 4"
+
+def test_streaming_renderer_huge_report_is_bounded():
+    """
+    Validates that rendering a page of a report with 100k findings only prints that page.
+    """
+
+    validator_report = _big_report()
+
+    output = io.StringIO()
+    rendered = StreamingReportRenderer(output, page_size=100, page=900).render(validator_report)
+
+    assert rendered == 100
+    assert len(output.getvalue().splitlines()) < 110
+
+def test_paged_exit_summary_only_counts():
+    """
+    Validates that a paged run doesn't print every finding again in the exit summary.
+    """
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        assert cli.run(["--work-dir", "tests/resources/", "--page-size", "2"]) == 1
+
+    summary = output.getvalue().split("=== SUMMARY ===")[1]
+    assert "more not shown" in summary
+    assert "  - " not in summary
+
+def test_render_arguments_are_bounded():
+    """
+    Validates that pages, page sizes and caps below their minimum are rejected as usage errors.
+    """
+
+    for arguments in [["--page", "0"], ["--page-size", "0"], ["--max-findings-per-file", "-1"], ["--page", "a"]]:
+        with redirect_stderr(io.StringIO()), redirect_stdout(io.StringIO()):
+            assert cli.run(["--work-dir", "tests/resources/", *arguments]) == 2
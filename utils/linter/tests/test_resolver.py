@@ -0,0 +1,187 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.mockvault.server import MockVaultServer
+from src.resolver.resolver import ConfigurationLoader, Resolver, ResolverError, SecretCache
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+# The secrets served by the mock, for the paths of appsettings.WithVault.json
+secrets = {
+    "env/uat": {
+        "my-tools/events/clients": {"client-a": "queue-a", "client-b": "queue-b"},
+        "my-tools/kafka": {"brokers": "kafka:9092", "topic": "events"},
+        "my-tools/redis/client-events": {"connectionString": "redis:6379"},
+        "my-tools/mysql/backoffice/generic": {"host": "mysql", "port": 3306, "catalog": "backoffice"},
+        "my-tools/mysql/backoffice/services": {"username": "user", "password": "pass"},
+        "my-tools/mysql/clients": {"client-a": "Server=a"},
+        "my-tools/elastic": {"host": "elastic", "port": "9200", "username": "elastic", "password": "secret"},
+    }
+}
+
+class _Clock:
+    """
+    A clock that only moves when told to.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+async def _with_server(server, test):
+    """
+    Runs a test coroutine against a started mock server.
+    """
+    port = await server.start()
+    try:
+        return await test(f"http://127.0.0.1:{port}")
+    finally:
+        await server.stop()
+
+def _appsettings(tmp_path, name, data):
+    """
+    Writes an appsettings file.
+    """
+    appsettings_file = tmp_path / name
+    with open(appsettings_file, "w") as file:
+        json.dump(data, file)
+    return str(appsettings_file)
+
+def test_resolver_materialises_like_the_provider(tmp_path):
+    """
+    Validates the secret replacement, the vault_dict expansion and that user_home is left as it is,
+    reading each path once per load and from the cache on reloads.
+    """
+
+    clock = _Clock()
+    server = MockVaultServer(secrets)
+    (tmp_path / "token").write_text("service-account-jwt")
+    files = [resources_folder + "appsettings.WithVault.json",
+             _appsettings(tmp_path, "appsettings.Test.json", {"Vault": {"vaultAddress": "http://ignored"}})]
+
+    async def test(address):
+        loader = ConfigurationLoader(files, environ={"VAULT_ADDR": address, "SA_TOKEN_PATH": str(tmp_path / "token")},
+                                     cache=SecretCache(60, clock))
+        try:
+            first = await loader.load()
+            reads = sum(server.requests.values())
+            second = await loader.load()
+            cached_reads = sum(server.requests.values()) - reads
+            clock.now = 61
+            await loader.load()
+            return first, second, reads, cached_reads, sum(server.requests.values())
+        finally:
+            await loader.close()
+
+    first, second, reads, cached_reads, total_reads = asyncio.run(_with_server(server, test))
+
+    assert first["Kafka:Brokers"] == "kafka:9092"
+    assert first["Elasticsearch:Host"] == "elastic:9200"
+    assert first["ConnectionStrings:ServerContext"].startswith("Data Source=mysql,3306;initial catalog=backoffice;")
+    assert first["Events:ClientsQueue"] == "{% vault_dict my-tools/events/clients %}"
+    assert first["Events:ClientsQueue:client-b"] == "queue-b"
+    assert first["RawData:BasePath"] == "{% user_home %}"
+    assert first["Kafka:DeferredMeasures:Consumer:WorkersCount"] == 1
+    assert second == first
+
+    # One login and one read per distinct path, nothing on the reload, everything again once expired
+    assert server.requests["/v1/auth/kubernetes/login"] == 1
+    assert reads == 1 + 7
+    assert cached_reads == 0
+    assert total_reads == 1 + 7 + 7
+
+def test_resolver_logs_in_and_expands_user_home(tmp_path):
+    """
+    Validates the AppRole login with the user home in the credentials paths, and the opt-in user home expansion.
+    """
+
+    (tmp_path / "role-id").write_text("my-role\n")
+    (tmp_path / "secret-id").write_text("my-secret\n")
+    files = [_appsettings(tmp_path, "appsettings.json", {
+        "Vault": {"mountPoint": "env/uat", "approleAuthName": "services",
+                  "roleIdPath": "{% user_home %}/role-id", "secretIdPath": "{% user_home %}secret-id"},
+        "Kafka": {"Brokers": "{% vault_secret my-tools/kafka:brokers %}"},
+        "Data": {"Path": "{% user_home %}/data"},
+    })]
+    server = MockVaultServer(secrets)
+
+    async def test(address):
+        loader = ConfigurationLoader(files, expand_user_home=True, environ={"VAULT_ADDR": address, "HOME": str(tmp_path)})
+        try:
+            return await loader.load()
+        finally:
+            await loader.close()
+
+    resolved = asyncio.run(_with_server(server, test))
+
+    assert server.requests["/v1/auth/services/login"] == 1
+    assert resolved["Kafka:Brokers"] == "kafka:9092"
+    assert resolved["Data:Path"] == str(tmp_path) + "/data"
+
+@pytest.mark.parametrize("value, denied, message", [
+    ("{% vault_secret my-tools/kafka:missing %}", [], "Didn't find the required field missing"),
+    ("{% vault_secret my-tools/kafka %}", [], "Could not parse placeholder secret key 'my-tools/kafka'"),
+    ("{% vault_dict my-tools/kafka extra %}", [], "Could not parse the content of placeholder"),
+    ("{% vault_secret my-tools/kafka:topic %}", ["env/uat/my-tools/*"], "Access to vault was denied"),
+])
+def test_resolver_fails_like_the_provider(tmp_path, value, denied, message):
+    """
+    Validates that the configurations the library refuses to load are refused with the same message.
+    """
+
+    files = [_appsettings(tmp_path, "appsettings.json", {"Vault": {"mountPoint": "env/uat"}, "Value": value})]
+    server = MockVaultServer(secrets, denied=denied)
+
+    async def test(address):
+        loader = ConfigurationLoader(files, token="token", environ={"VAULT_ADDR": address})
+        try:
+            with pytest.raises(ResolverError) as error:
+                await loader.load()
+            return str(error.value)
+        finally:
+            await loader.close()
+
+    assert message in asyncio.run(_with_server(server, test))
+
+def test_resolver_follows_the_provider_order():
+    """
+    Validates that the placeholders are resolved in the order GetChildren sorts the keys, so that the
+    first error is the one the library would throw, and that the cache doesn't mix up Vault servers.
+    """
+
+    index = {
+        "zeta": "{% vault_secret a:b %}",
+        "Alpha:10": "{% vault_dict ten %}",
+        "Alpha:9": "{% vault_dict nine %}",
+        "alpha:Name": "{% vault_dict name %}",
+        "Beta": "{% vault_secret c:d %}",
+    }
+    assert [path for path, _ in Resolver.plan(index)] == ["Alpha:9", "Alpha:10", "alpha:Name", "Beta", "zeta"]
+
+    cache = SecretCache(60)
+    cache.put("https://vault-a:8200", "env/uat", "my-tools/kafka", {"brokers": "a"})
+    assert cache.get("https://vault-b:8200", "env/uat", "my-tools/kafka") is None
+    assert cache.get("https://vault-a:8200", "env/uat", "my-tools/kafka") == {"brokers": "a"}
@@ -0,0 +1,92 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from src.validator import rules
+from src.validator.validator import StopValidation, Validator
+from src.validator.validator_report import ValidatorReport
+from src.validator.verdict_cache import verdict_cache
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def test_rule_selection():
+    """
+    Validates the rule IDs and globs of --select and --ignore.
+    """
+
+    assert rules.select_rules() is None
+    assert rules.select_rules(["kubernetes-*"], ["kubernetes-sa-token-path"]) == \
+        {rules.KUBERNETES_AUTH_NAME, rules.KUBERNETES_SA_ROLE_NAME}
+    assert rules.select_rules(ignore=["*"]) == frozenset()
+
+    with pytest.raises(ValueError):
+        rules.select_rules(["vault-secrets-syntax"])
+
+def test_unselected_rules_do_not_run(monkeypatch):
+    """
+    Validates that only the selected rules are evaluated and reported.
+    """
+
+    verdict_cache.clear()
+    evaluated = []
+    evaluate = rules.evaluate
+    monkeypatch.setattr(rules, "evaluate", lambda rule, value: evaluated.append(rule) or evaluate(rule, value))
+
+    validator_report = ValidatorReport()
+    validator = Validator(resources_folder + "appsettings.KubernetesBroken.json", validator_report,
+                          enabled_rules=rules.select_rules(["mount-point"]))
+    validator.validate_base_appsettings_placeholders()
+    validator.validate_vault_object()
+
+    report = validator_report._ValidatorReport__files[resources_folder + "appsettings.KubernetesBroken.json"]
+    assert evaluated == [rules.MOUNT_POINT]
+    assert [item for item, _ in report["failures"] + report["successes"]] == ["env/-uat"]
+    assert report["warnings"] == []
+
+def test_fail_fast_stops_at_the_first_failure():
+    """
+    Validates that a fail fast validator stops at the first failure without recording the successes.
+    """
+
+    validator_report = ValidatorReport()
+    validator = Validator(resources_folder + "appsettings.KubernetesBroken.json", validator_report, fail_fast=True)
+
+    validator.validate_base_appsettings_placeholders()
+    with pytest.raises(StopValidation):
+        validator.validate_vault_object()
+
+    report = validator_report._ValidatorReport__files[resources_folder + "appsettings.KubernetesBroken.json"]
+    assert len(report["failures"]) == 1
+    assert report["successes"] == []
+
+def test_time_budget_reports_the_coverage():
+    """
+    Validates that a spent time budget stops the run cleanly, tells what was covered and
+    exits with the code of an incomplete run.
+    """
+
+    result = subprocess.run([sys.executable, "-m", "src.main", "--no-daemon", "--work-dir", resources_folder, "--time-budget", "0"],
+                            capture_output=True, text=True)
+
+    assert result.returncode == 3
+    assert "The time budget of 0.0s was spent: 0 files were validated" in result.stdout
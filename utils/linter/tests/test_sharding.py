@@ -0,0 +1,177 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from src.sharding.sharding import PartialReport, ShardError, merge, parse_shard, shard_of
+from src.validator.validator_report import ValidatorReport
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def _fleet(root):
+    """
+    Builds a monorepo with several projects, some of them broken or without a base file.
+    """
+    files = {
+        "svc-approle/appsettings.json": "appsettings.AppRole.json",
+        "svc-approle/appsettings.Production.json": "appsettings.EnvWithPlaceholders.json",
+        "svc-broken/appsettings.json": "appsettings.BaseBrokenSecrets.json",
+        "svc-broken/appsettings.Staging.json": "appsettings.BrokenJSON.json",
+        "svc-kubernetes/appsettings.json": "appsettings.Kubernetes.json",
+        "svc-kubernetes/nested/appsettings.json": "appsettings.KubernetesBroken.json",
+        "svc-orphan/appsettings.Development.json": "appsettings.Empty.json",
+        "svc-plain/appsettings.json": "appsettings.NoVault.json",
+        "svc-vault/appsettings.json": "appsettings.WithVault.json",
+        "svc-vault/appsettings.Edge.json": "appsettings.ProviderEdgeCases.json",
+    }
+    for target, source in files.items():
+        os.makedirs(os.path.join(root, os.path.dirname(target)), exist_ok=True)
+        shutil.copy(resources_folder + source, os.path.join(root, target))
+
+def _lint(*args):
+    """
+    Runs the linter in a new process, as the report is a singleton.
+    """
+    result = subprocess.run([sys.executable, "-m", "src.main", "--no-daemon", *args], capture_output=True, text=True)
+    return result.returncode, result.stdout
+
+def test_parse_shard_and_stable_partition():
+    """
+    Validates the shard specification, and that the partition only depends on the project and the shard count.
+    """
+
+    assert parse_shard("2/4") == (2, 4)
+    for value in ["0/4", "5/4", "1-4", "a/b"]:
+        with pytest.raises(ShardError):
+            parse_shard(value)
+
+    keys = [f"services/svc{index}" for index in range(200)]
+    shards = [shard_of(key, 4) for key in keys]
+    assert shards == [shard_of(key, 4) for key in keys]
+    assert set(shards) == {1, 2, 3, 4}
+
+def test_merge_rejects_incomplete_sets():
+    """
+    Validates that the partial reports of a merge must cover every shard of the same run exactly once.
+    """
+
+    with pytest.raises(ShardError):
+        merge([PartialReport("work", 1, 2), PartialReport("work", 1, 2)], ValidatorReport())
+
+    with pytest.raises(ShardError):
+        merge([PartialReport("work", 1, 2), PartialReport("other", 2, 2)], ValidatorReport())
+
+@pytest.mark.parametrize("content", [
+    '{"version":2,"workDir":"work","shard":[1,2],"complete":true,"skipped":[],"projects":[[0,[["a.json",[]]]]]}',
+    '{"version":2,"workDir":"work","shard":[1],"complete":true,"skipped":[],"projects":[]}',
+    '{"version":2,"workDir":"work","shard":[1,2],"projects":[]}',
+    '{"version":2,"workDir":"work","shard":[1,2],"complete":true,"skipped":[],"projects":[[0,[["a.json",[],[],[[1]]]]]]}',
+    '{"version":2,"workDir":"work","shard":[1,2],"complete":true,"skipped":[],"projects":[[0,[["a.json"',
+])
+def test_load_rejects_malformed_reports(tmp_path, content):
+    """
+    Validates that a malformed or truncated partial report raises a ShardError naming the file.
+    """
+
+    partial_report = tmp_path / "shard-1.json"
+    partial_report.write_text(content)
+
+    with pytest.raises(ShardError, match="shard-1.json"):
+        PartialReport.load(str(partial_report))
+
+@pytest.mark.parametrize("render_args", [[], ["--stream"]])
+def test_merged_shards_match_unsharded_run(tmp_path, render_args):
+    """
+    Validates that merging the partial reports of every shard gives exactly the output and exit code of
+    an unsharded run.
+    """
+
+    work_dir = str(tmp_path / "fleet")
+    _fleet(work_dir)
+
+    expected = _lint("--work-dir", work_dir, "--recursive", *render_args)
+    assert expected[0] == 1
+
+    partial_reports = []
+    for shard in range(1, 4):
+        partial_report = str(tmp_path / f"shard-{shard}.json")
+        _lint("--work-dir", work_dir, "--recursive", "--shard", f"{shard}/3", "--partial-report", partial_report)
+        partial_reports.append(partial_report)
+
+    assert _lint("merge", *reversed(partial_reports), *render_args) == expected
+
+def test_merge_of_stopped_shard_is_incomplete(tmp_path):
+    """
+    Validates that a shard stopped by its time budget records the projects it skipped, and that
+    the merge then warns about them and doesn't exit with 0.
+    """
+
+    work_dir = str(tmp_path / "fleet")
+    _fleet(work_dir)
+
+    partial_reports = [str(tmp_path / "shard-1.json"), str(tmp_path / "shard-2.json")]
+    _lint("--work-dir", work_dir, "--recursive", "--shard", "1/2", "--partial-report", partial_reports[0])
+    exit_code, _ = _lint("--work-dir", work_dir, "--recursive", "--shard", "2/2", "--partial-report",
+                         partial_reports[1], "--select", "vault-dict-syntax", "--time-budget", "0")
+    assert exit_code == 3
+
+    stopped = PartialReport.load(partial_reports[1])
+    assert not stopped.complete
+    assert stopped.projects == []
+    assert stopped.skipped and all(shard_of(key, 2) == 2 for key in stopped.skipped)
+    assert PartialReport.load(partial_reports[0]).complete
+
+    exit_code, output = _lint("merge", *partial_reports)
+    assert exit_code != 0
+    assert "The shard 2/2 stopped early, these projects weren't validated: " + ", ".join(stopped.skipped) in output
+
+def test_fail_fast_merge_matches_unsharded_run(tmp_path):
+    """
+    Validates that the failure a fail fast shard stopped at reaches the merge, which then exits with 1
+    and prints the same report as the unsharded run.
+    """
+
+    work_dir = str(tmp_path / "fleet")
+    _fleet(work_dir)
+
+    expected_code, expected = _lint("--work-dir", work_dir, "--recursive", "--fail-fast")
+    assert expected_code == 1
+
+    partial_report = str(tmp_path / "shard-1.json")
+    _lint("--work-dir", work_dir, "--recursive", "--fail-fast", "--shard", "1/1", "--partial-report", partial_report)
+    assert not PartialReport.load(partial_report).complete
+
+    exit_code, output = _lint("merge", partial_report)
+    assert exit_code == 1
+
+    # Only the closing line differs, the shard tells which projects it skipped instead of the files covered
+    assert output.split("\nThe shard 1/1 stopped early")[0] == expected.split("\nStopped at the first failure")[0]
+
+    # Every shard stops at its own first failure, which the merge still counts
+    partial_reports = []
+    for shard in range(1, 4):
+        partial_reports.append(str(tmp_path / f"shard-{shard}-of-3.json"))
+        _lint("--work-dir", work_dir, "--recursive", "--fail-fast", "--shard", f"{shard}/3",
+              "--partial-report", partial_reports[-1])
+    assert _lint("merge", *partial_reports)[0] == 1
@@ -0,0 +1,100 @@
+"""
+.NET Projects appsettings Configuration Linter for Stratio Vault Library
+
+Description:
+This Python script is a linter that validates the contents of the appsettings.json file(s)
+which are used by the Stratio Vault Library.
+It ensures that all occurrences of:
+ - `{% vault_secret path/to/secret:key %}`
+ - `{% vault_dict path/to/secret %}`
+ - `{% user_home %}`
+ - the Vault JSON object
+are consistent with the requirements of the Stratio Vault Library.
+
+Authors:
+Rafael Couto (rafaelcouto@stratioautomotive.com)
+Bernardo Marques (bernardomarques@stratioautomotive.com)
+"""
+
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from src.validator import rules
+from src.validator.validator import Validator
+from src.validator.validator_report import ValidatorReport
+from src.validator.verdict_cache import VerdictCache, initialize_worker, verdict_cache
+
+# Sets the base folder where the test resources are located at
+resources_folder = "tests/resources/"
+
+def _cached_verdicts(_):
+    """
+    Process pool task that reports how many verdicts the worker memo was seeded with.
+    """
+    return len(verdict_cache), verdict_cache.verdict(rules.MOUNT_POINT, "env/prod"), verdict_cache.misses
+
+def test_verdict_cache_memoises_repeated_values():
+    """
+    Validates that the same (rule, value) pair is only evaluated once.
+    """
+
+    cache = VerdictCache()
+
+    assert cache.verdict(rules.MOUNT_POINT, "env/prod")
+    assert cache.verdict(rules.MOUNT_POINT, "env/prod")
+    assert not cache.verdict(rules.MOUNT_POINT, "/env/prod")
+
+    assert cache.misses == 2
+    assert cache.hits == 1
+
+def test_verdict_cache_is_bounded():
+    """
+    Validates that the least recently used verdicts are evicted once the memo is full.
+    """
+
+    cache = VerdictCache(maxsize=2)
+    cache.verdict(rules.KUBERNETES_AUTH_NAME, "kubernetes")
+    cache.verdict(rules.KUBERNETES_AUTH_NAME, "kubernetes-2")
+    cache.verdict(rules.KUBERNETES_AUTH_NAME, "kubernetes")
+    cache.verdict(rules.KUBERNETES_AUTH_NAME, "kubernetes-3")
+
+    assert len(cache) == 2
+    assert (rules.KUBERNETES_AUTH_NAME, "kubernetes") in cache.snapshot()
+    assert (rules.KUBERNETES_AUTH_NAME, "kubernetes-2") not in cache.snapshot()
+
+def test_verdict_cache_shared_across_validators():
+    """
+    Validates that a second Validator over the same values is answered from the memo.
+    """
+
+    appsettings_file = resources_folder + "appsettings.Kubernetes.json"
+    verdict_cache.clear()
+
+    Validator(appsettings_file, ValidatorReport()).validate_vault_object()
+    misses = verdict_cache.misses
+
+    validator_report = ValidatorReport()
+    Validator(appsettings_file, validator_report).validate_vault_object()
+
+    assert verdict_cache.misses == misses
+    assert verdict_cache.hits == misses
+    assert len(validator_report._ValidatorReport__files[appsettings_file]["successes"]) == 5
+
+def test_verdict_cache_seeds_process_pool_workers():
+    """
+    Validates that a precomputed table survives pickling and seeds the process pool workers.
+    """
+
+    table = {(rules.MOUNT_POINT, "env/prod"): True, (rules.MOUNT_POINT, "env//prod"): False}
+    assert pickle.loads(pickle.dumps(table)) == table
+
+    # Spawned workers start with an empty memo, like they would on a fresh interpreter
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context,
+                             initializer=initialize_worker, initargs=(table,)) as pool:
+        size, result, misses = pool.submit(_cached_verdicts, None).result()
+
+    assert size == 2
+    assert result
+    assert misses == 0